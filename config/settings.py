@@ -39,6 +39,7 @@ class Settings:
     # Model Configuration
     MODEL_SAVE_PATH: str = os.getenv("MODEL_SAVE_PATH", str(MODELS_DIR))
     FEATURE_CACHE_PATH: str = os.getenv("FEATURE_CACHE_PATH", str(PROCESSED_DATA_DIR / "features"))
+    NBA_API_CACHE_PATH: str = os.getenv("NBA_API_CACHE_PATH", str(RAW_DATA_DIR / "nba_api"))
     
     # Active Model Names (can be overridden via environment variables)
     CLASSIFIER_MODEL_NAME: str = os.getenv("CLASSIFIER_MODEL_NAME", "nba_v2_classifier")
@@ -59,6 +60,7 @@ class Settings:
     RATE_LIMIT_DELAY: float = float(os.getenv("RATE_LIMIT_DELAY", "1.0"))
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
     RETRY_DELAY: float = float(os.getenv("RETRY_DELAY", "5.0"))
+    NBA_API_CACHE_ENABLED: bool = os.getenv("NBA_API_CACHE_ENABLED", "False").lower() == "true"  # Re-use finished box scores
     
     # Basketball Reference Scraping
     BBALL_REF_BASE_URL: str = os.getenv("BBALL_REF_BASE_URL", "https://www.basketball-reference.com")
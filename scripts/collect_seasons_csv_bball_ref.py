@@ -147,7 +147,8 @@ def init_selenium_driver(download_dir: Path):
     
     driver = webdriver.Chrome(options=chrome_options)
     driver.set_page_load_timeout(120)  # Increased from 60 to 120 seconds
-    driver.implicitly_wait(15)  # Increased from 10 to 15 seconds
+    # No implicit wait: lookups use explicit WebDriverWait so fallback
+    # find_elements calls on missing elements return immediately
     
     # Hide webdriver property
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
@@ -179,14 +180,12 @@ def extract_table_to_csv(driver: webdriver.Chrome, url: str, expected_filename:
         logger.info(f"Extracting table data directly from: {url}")
         driver.get(url)
         
-        # Wait for table
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.TAG_NAME, "table"))
+        # Wait for the schedule table itself
+        table = WebDriverWait(driver, 20).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "table.stats_table"))
         )
         time.sleep(2)
         
-        # Find the schedule table
-        table = driver.find_element(By.CSS_SELECTOR, "table.stats_table")
         if not table:
             logger.warning("Could not find stats_table on page")
             return None
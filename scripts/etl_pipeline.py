@@ -50,6 +50,7 @@ logging.getLogger('src.data_collectors').setLevel(logging.WARNING)
 logging.getLogger('urllib3').setLevel(logging.WARNING)
 
 from tqdm import tqdm
+from sqlalchemy import select
 from nba_api.stats.endpoints import TeamGameLog, BoxScoreTraditionalV3, BoxScoreSummaryV3
 from nba_api.stats.static import teams as nba_teams_static
 
@@ -420,17 +421,19 @@ class ETLPipeline:
         
         # Get games that need stats
         with self.db_manager.get_session() as session:
-            games = session.query(Game).filter(
+            # Whether each game has team stats comes back with the game (EXISTS
+            # subquery) instead of one lookup per game
+            has_stats = select(TeamStats.id).where(TeamStats.game_id == Game.game_id).exists()
+            games = session.query(Game, has_stats).filter(
                 Game.season == self.season
             ).order_by(Game.game_date).all()
             
             # Convert to list of dicts to avoid detached instance issues
             games_to_process = []
-            for game in games:
+            for game, game_has_stats in games:
                 # Check if game needs stats
                 if not full_refresh:
-                    has_stats = session.query(TeamStats).filter_by(game_id=game.game_id).first() is not None
-                    if has_stats and game.game_status == 'finished':
+                    if game_has_stats and game.game_status == 'finished':
                         continue
                 
                 games_to_process.append({
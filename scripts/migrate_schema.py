@@ -1,4 +1,4 @@
-"""Migration script to add new columns to TeamRollingFeatures table."""
+"""Migration script to add new columns to TeamRollingFeatures table and new indexes."""
 
 import sys
 from pathlib import Path
@@ -35,6 +35,11 @@ def main():
         ('injury_severity_score', 'REAL'),
     ]
     
+    # New indexes: (name, table, columns)
+    new_indexes = [
+        ('idx_season_status', 'games', 'season, game_status'),
+    ]
+    
     with db.get_session() as session:
         # Check which columns already exist
         result = session.execute(text("PRAGMA table_info(team_rolling_features)"))
@@ -57,6 +62,16 @@ def main():
         
         session.commit()
         
+        # Add missing indexes (create_tables() only indexes new tables)
+        for index_name, table_name, columns in new_indexes:
+            try:
+                session.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}({columns})"))
+                print(f"  [INDEX] {index_name} on {table_name}({columns})")
+            except Exception as e:
+                print(f"  [ERROR] {index_name}: {e}")
+        
+        session.commit()
+        
         # Check if game_matchup_features table exists
         result = session.execute(text("""
             SELECT name FROM sqlite_master 
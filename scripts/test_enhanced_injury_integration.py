@@ -24,6 +24,9 @@ from src.data_collectors.rapidapi_injury_collector import RapidAPIInjuryCollecto
 from config.settings import get_settings
 
 
+_shared = {}
+
+
 def print_section(title):
     """Print a section header."""
     print("\n" + "=" * 70)
@@ -31,12 +34,31 @@ def print_section(title):
     print("=" * 70)
 
 
+def get_shared():
+    """
+    Get the database manager and calculators shared by all phases.
+    
+    They are created on first use so each phase doesn't set up its own
+    engine and calculator instances.
+    """
+    if not _shared:
+        db = DatabaseManager()
+        _shared.update(
+            db=db,
+            player_importance=PlayerImportanceCalculator(db),
+            team=TeamFeatureCalculator(db),
+            aggregator=FeatureAggregator(db)
+        )
+    return _shared
+
+
 def test_player_importance_calculator():
     """Test Phase 1: Player Importance Calculator with real data."""
     print_section("PHASE 1: Player Importance Calculator")
     
-    db = DatabaseManager()
-    calc = PlayerImportanceCalculator(db)
+    shared = get_shared()
+    db = shared['db']
+    calc = shared['player_importance']
     
     # Get a sample team
     with db.get_session() as session:
@@ -110,8 +132,9 @@ def test_enhanced_injury_impact():
     """Test Phase 2: Enhanced Injury Impact Calculation."""
     print_section("PHASE 2: Enhanced Injury Impact Calculation")
     
-    db = DatabaseManager()
-    team_calc = TeamFeatureCalculator(db)
+    shared = get_shared()
+    db = shared['db']
+    team_calc = shared['team']
     
     # Get a team with recent games
     with db.get_session() as session:
@@ -173,8 +196,9 @@ def test_historical_injury_impact():
     """Test Phase 3: Historical Injury Impact Analysis."""
     print_section("PHASE 3: Historical Injury Impact Analysis")
     
-    db = DatabaseManager()
-    team_calc = TeamFeatureCalculator(db)
+    shared = get_shared()
+    db = shared['db']
+    team_calc = shared['team']
     
     # Get a team with many games
     with db.get_session() as session:
@@ -227,8 +251,9 @@ def test_feature_aggregator_integration():
     """Test Phase 4: Feature Aggregator Integration."""
     print_section("PHASE 4: Feature Aggregator Integration")
     
-    db = DatabaseManager()
-    aggregator = FeatureAggregator(db)
+    shared = get_shared()
+    db = shared['db']
+    aggregator = shared['aggregator']
     
     # Get a recent game
     with db.get_session() as session:
@@ -340,8 +365,7 @@ def test_rapidapi_collector():
         return all_passed
     
     # Live API test
-    db = DatabaseManager()
-    collector = RapidAPIInjuryCollector(db)
+    collector = RapidAPIInjuryCollector(get_shared()['db'])
     
     print("Testing live API connection...")
     
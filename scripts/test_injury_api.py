@@ -14,50 +14,12 @@ os.environ['DATABASE_TYPE'] = 'sqlite'
 
 from config.settings import get_settings
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
-def test_nba_api_injuries():
-    """Test if NBA API has injury endpoints."""
-    settings = get_settings()
-    api_key = settings.NBA_API_KEY
-    
-    print("=" * 70)
-    print("TESTING NBA INJURY API ENDPOINTS")
-    print("=" * 70)
-    print(f"NBA API Key configured: {'Yes' if api_key else 'No'}")
-    if api_key:
-        print(f"API Key (first 10 chars): {api_key[:10]}...")
-    print()
-    
-    # Test 1: Official NBA Stats API (stats.nba.com)
-    print("[TEST 1] Official NBA Stats API (stats.nba.com)")
-    print("-" * 70)
-    
-    base_url = "https://stats.nba.com/stats"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Referer': 'https://www.nba.com/',
-        'Accept': 'application/json'
-    }
-    
-    # Common NBA API endpoints to test
-    endpoints_to_test = [
-        "/playerdashboardbygeneralsplits",
-        "/teamdashboardbygeneralsplits",
-        "/commonallplayers",
-        "/scoreboard",
-    ]
-    
-    # Note: Official NBA API doesn't have a dedicated injury endpoint
-    # Injuries are typically inferred from game participation
-    print("Note: Official NBA Stats API (stats.nba.com) does not have")
-    print("      a dedicated injury endpoint. Injuries are inferred from")
-    print("      game participation (minutes played = 0).")
-    print()
-    
-    # Test 2: nba_api Python library
-    print("[TEST 2] nba_api Python Library")
-    print("-" * 70)
+def _probe_nba_api():
+    """Check the nba_api library and fetch a player sample (returns output lines)."""
+    out = []
     try:
         from nba_api.stats.endpoints import (
             TeamGameLog, BoxScoreTraditionalV3, 
@@ -65,42 +27,39 @@ def test_nba_api_injuries():
         )
         from nba_api.stats.static import teams
         
-        print("[OK] nba_api library is installed")
-        print("Available endpoints:")
-        print("  - TeamGameLog")
-        print("  - BoxScoreTraditionalV3")
-        print("  - BoxScoreSummaryV3")
-        print("  - CommonAllPlayers")
-        print()
-        print("Note: nba_api library does NOT have injury-specific endpoints.")
-        print("      It uses the same stats.nba.com API which doesn't expose injuries.")
-        print()
+        out.append("[OK] nba_api library is installed")
+        out.append("Available endpoints:")
+        out.append("  - TeamGameLog")
+        out.append("  - BoxScoreTraditionalV3")
+        out.append("  - BoxScoreSummaryV3")
+        out.append("  - CommonAllPlayers")
+        out.append("")
+        out.append("Note: nba_api library does NOT have injury-specific endpoints.")
+        out.append("      It uses the same stats.nba.com API which doesn't expose injuries.")
+        out.append("")
         
         # Try to get a sample of player data to see what's available
         try:
-            print("Testing: CommonAllPlayers endpoint...")
+            out.append("Testing: CommonAllPlayers endpoint...")
             players = CommonAllPlayers()
             if hasattr(players, 'get_data_frames'):
                 df = players.get_data_frames()[0]
-                print(f"  [OK] Successfully fetched {len(df)} players")
-                print(f"  Columns available: {list(df.columns)[:10]}...")
-                print("  Note: No injury status in player data")
+                out.append(f"  [OK] Successfully fetched {len(df)} players")
+                out.append(f"  Columns available: {list(df.columns)[:10]}...")
+                out.append("  Note: No injury status in player data")
         except Exception as e:
-            print(f"  [ERROR] {e}")
+            out.append(f"  [ERROR] {e}")
         
     except ImportError:
-        print("[ERROR] nba_api library not installed")
-        print("  Install with: pip install nba-api")
-    print()
-    
-    # Test 3: BALLDONTLIE API (third-party, has injury endpoints)
-    print("[TEST 3] BALLDONTLIE API (Third-party)")
-    print("-" * 70)
-    print("BALLDONTLIE API (api.balldontlie.io) has injury endpoints:")
-    print("  - GET /v1/injuries")
-    print("  - GET /v1/player_injuries")
-    print()
-    print("Testing BALLDONTLIE API (no key required for basic access)...")
+        out.append("[ERROR] nba_api library not installed")
+        out.append("  Install with: pip install nba-api")
+    out.append("")
+    return out
+
+
+def _probe_balldontlie(api_key):
+    """Query the BALLDONTLIE injury endpoints (returns output lines)."""
+    out = []
     
     try:
         # BALLDONTLIE API - try with API key if available
@@ -123,26 +82,26 @@ def test_nba_api_injuries():
         
         if response.status_code == 200:
             data = response.json()
-            print(f"  [OK] Successfully connected to BALLDONTLIE API")
-            print(f"  Response status: {response.status_code}")
+            out.append(f"  [OK] Successfully connected to BALLDONTLIE API")
+            out.append(f"  Response status: {response.status_code}")
             if 'data' in data:
-                print(f"  Found {len(data.get('data', []))} injury records")
+                out.append(f"  Found {len(data.get('data', []))} injury records")
                 if data.get('data'):
                     sample = data['data'][0]
-                    print(f"  Sample injury:")
-                    print(f"    Player: {sample.get('player', {}).get('first_name', 'N/A')} {sample.get('player', {}).get('last_name', 'N/A')}")
-                    print(f"    Status: {sample.get('status', 'N/A')}")
-                    print(f"    Description: {sample.get('description', 'N/A')[:60]}...")
+                    out.append(f"  Sample injury:")
+                    out.append(f"    Player: {sample.get('player', {}).get('first_name', 'N/A')} {sample.get('player', {}).get('last_name', 'N/A')}")
+                    out.append(f"    Status: {sample.get('status', 'N/A')}")
+                    out.append(f"    Description: {sample.get('description', 'N/A')[:60]}...")
             else:
-                print(f"  Response: {data}")
+                out.append(f"  Response: {data}")
         else:
-            print(f"  [ERROR] API returned status {response.status_code}")
-            print(f"  Response: {response.text[:200]}")
-            print(f"  Note: BALLDONTLIE API may require authentication")
-            print(f"        Try: https://www.balldontlie.io/#get-started")
+            out.append(f"  [ERROR] API returned status {response.status_code}")
+            out.append(f"  Response: {response.text[:200]}")
+            out.append(f"  Note: BALLDONTLIE API may require authentication")
+            out.append(f"        Try: https://www.balldontlie.io/#get-started")
             
             # Try alternative endpoint
-            print(f"\n  Trying alternative endpoint: /v1/player_injuries...")
+            out.append(f"\n  Trying alternative endpoint: /v1/player_injuries...")
             try:
                 alt_response = requests.get(
                     "https://api.balldontlie.io/v1/player_injuries",
@@ -151,18 +110,82 @@ def test_nba_api_injuries():
                     timeout=10
                 )
                 if alt_response.status_code == 200:
-                    print(f"  [OK] Alternative endpoint works!")
+                    out.append(f"  [OK] Alternative endpoint works!")
                     data = alt_response.json()
                     if 'data' in data:
-                        print(f"  Found {len(data.get('data', []))} injury records")
+                        out.append(f"  Found {len(data.get('data', []))} injury records")
                 else:
-                    print(f"  [ERROR] Alternative endpoint also returned {alt_response.status_code}")
+                    out.append(f"  [ERROR] Alternative endpoint also returned {alt_response.status_code}")
             except Exception as e2:
-                print(f"  [ERROR] Alternative endpoint failed: {e2}")
+                out.append(f"  [ERROR] Alternative endpoint failed: {e2}")
     except Exception as e:
-        print(f"  [ERROR] Error connecting to BALLDONTLIE API: {e}")
+        out.append(f"  [ERROR] Error connecting to BALLDONTLIE API: {e}")
+    out.append("")
+    return out
+
+
+def test_nba_api_injuries():
+    """Test if NBA API has injury endpoints."""
+    settings = get_settings()
+    api_key = settings.NBA_API_KEY
+    
+    print("=" * 70)
+    print("TESTING NBA INJURY API ENDPOINTS")
+    print("=" * 70)
+    print(f"NBA API Key configured: {'Yes' if api_key else 'No'}")
+    if api_key:
+        print(f"API Key (first 10 chars): {api_key[:10]}...")
     print()
     
+    # Test 1: Official NBA Stats API (stats.nba.com)
+    print("[TEST 1] Official NBA Stats API (stats.nba.com)")
+    print("-" * 70)
+    
+    base_url = "https://stats.nba.com/stats"
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'Referer': 'https://www.nba.com/',
+        'Accept': 'application/json'
+    }
+    
+    # Common NBA API endpoints to test
+    endpoints_to_test = [
+        "/playerdashboardbygeneralsplits",
+        "/teamdashboardbygeneralsplits",
+        "/commonallplayers",
+        "/scoreboard",
+    ]
+    
+    # Note: Official NBA API doesn't have a dedicated injury endpoint
+    # Injuries are typically inferred from game participation
+    print("Note: Official NBA Stats API (stats.nba.com) does not have")
+    print("      a dedicated injury endpoint. Injuries are inferred from")
+    print("      game participation (minutes played = 0).")
+    print()
+    
+    # Tests 2 and 3 are independent network calls: run them concurrently and
+    # print their output in order
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        nba_api_probe = executor.submit(_probe_nba_api)
+        balldontlie_probe = executor.submit(_probe_balldontlie, api_key)
+        
+        # Test 2: nba_api Python library
+        print("[TEST 2] nba_api Python Library")
+        print("-" * 70)
+        for line in nba_api_probe.result():
+            print(line)
+        
+        # Test 3: BALLDONTLIE API (third-party, has injury endpoints)
+        print("[TEST 3] BALLDONTLIE API (Third-party)")
+        print("-" * 70)
+        print("BALLDONTLIE API (api.balldontlie.io) has injury endpoints:")
+        print("  - GET /v1/injuries")
+        print("  - GET /v1/player_injuries")
+        print()
+        print("Testing BALLDONTLIE API (no key required for basic access)...")
+        for line in balldontlie_probe.result():
+            print(line)
+    
     # Test 4: Check if we can infer injuries from game data
     print("[TEST 4] Current Injury Detection Method")
     print("-" * 70)
@@ -12,13 +12,7 @@ import argparse
 import logging
 from datetime import date
 from src.database.db_manager import DatabaseManager
-from src.prediction.prediction_service import PredictionService
 from src.backtesting.forward_tester import ForwardTester
-from src.backtesting.strategies import (
-    ConfidenceThresholdStrategy,
-    ExpectedValueStrategy,
-    KellyCriterionStrategy
-)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -45,29 +39,53 @@ def print_betting_decisions(setup_result: dict, db_manager: DatabaseManager):
         print("\n[INFO] No bets placed (strategy did not recommend any)")
         return
     
+    from sqlalchemy import select
+    from sqlalchemy.orm import aliased
     from src.database.models import Game, Team
     
+    HomeTeam = aliased(Team)
+    AwayTeam = aliased(Team)
+    
     print(f"\nBets:")
     with db_manager.get_session() as session:
+        # One JOIN for all bet games and both team names
+        game_ids = [bet_info['game_id'] for bet_info in setup_result['bets']]
+        rows = session.execute(
+            select(
+                Game.game_id,
+                Game.home_team_id,
+                Game.away_team_id,
+                HomeTeam.team_name.label('home_name'),
+                AwayTeam.team_name.label('away_name')
+            )
+            .select_from(Game)
+            .outerjoin(HomeTeam, Game.home_team_id == HomeTeam.team_id)
+            .outerjoin(AwayTeam, Game.away_team_id == AwayTeam.team_id)
+            .where(Game.game_id.in_(game_ids))
+        )
+        games_by_id = {row.game_id: row for row in rows}
+        
         for i, bet_info in enumerate(setup_result['bets'], 1):
             bet = bet_info['bet_decision']
             game_id = bet_info['game_id']
             
             # Get game info
-            game = session.query(Game).filter_by(game_id=game_id).first()
+            game = games_by_id.get(game_id)
+            team_names = {}
             if game:
-                home_team = session.query(Team).filter_by(team_id=game.home_team_id).first()
-                away_team = session.query(Team).filter_by(team_id=game.away_team_id).first()
-                home_name = home_team.team_name if home_team else game.home_team_id
-                away_name = away_team.team_name if away_team else game.away_team_id
+                home_name = game.home_name or game.home_team_id
+                away_name = game.away_name or game.away_team_id
+                team_names = {game.home_team_id: home_name, game.away_team_id: away_name}
                 matchup = f"{away_name} @ {home_name}"
             else:
                 matchup = f"Game {game_id}"
             
             # Get team name for bet
             bet_team_id = bet['bet_team']
-            bet_team = session.query(Team).filter_by(team_id=bet_team_id).first()
-            bet_team_name = bet_team.team_name if bet_team else bet_team_id
+            bet_team_name = team_names.get(bet_team_id)
+            if bet_team_name is None:
+                bet_team = session.query(Team).filter_by(team_id=bet_team_id).first()
+                bet_team_name = bet_team.team_name if bet_team else bet_team_id
             
             print(f"\n  {i}. {matchup}")
             print(f"     Game ID: {game_id}")
@@ -201,15 +219,18 @@ def main():
     # Setup test
     print(f"\n[STEP 1] Setting up forward test...")
     
-    # Choose strategy
+    # Choose strategy (imported here so --resolve/--summary skip these imports)
     if args.strategy == 'confidence':
+        from src.backtesting.strategies import ConfidenceThresholdStrategy
         strategy = ConfidenceThresholdStrategy(
             confidence_threshold=args.confidence_threshold,
             bet_amount=args.bet_amount
         )
     elif args.strategy == 'ev':
+        from src.backtesting.strategies import ExpectedValueStrategy
         strategy = ExpectedValueStrategy()
     elif args.strategy == 'kelly':
+        from src.backtesting.strategies import KellyCriterionStrategy
         strategy = KellyCriterionStrategy()
     else:
         print(f"[ERROR] Unknown strategy: {args.strategy}")
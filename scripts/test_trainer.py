@@ -8,6 +8,8 @@ sys.path.insert(0, str(project_root))
 import os
 os.environ['DATABASE_TYPE'] = 'sqlite'
 
+import tempfile
+
 import numpy as np
 import pandas as pd
 from src.training.trainer import ModelTrainer
@@ -23,19 +25,24 @@ def test_trainer():
     # Test 1: Initialize trainer
     print("\n1. Initializing trainer...")
     trainer = ModelTrainer(random_state=42)
+    # Opt in to training records, written outside the repo's data/models
+    records_dir = tempfile.TemporaryDirectory()
+    trainer.records_path = Path(records_dir.name) / "training_records.jsonl"
     print(f"   [OK] Trainer created: {trainer}")
     
     # Test 2: Create sample data
     print("\n2. Creating sample data...")
-    X_train = pd.DataFrame(np.random.rand(100, 10), columns=[f'feature_{i}' for i in range(10)])
-    y_train_clf = pd.Series(np.random.randint(0, 2, 100))
-    y_train_reg = pd.Series(np.random.randn(100) * 10)
-    X_val = pd.DataFrame(np.random.rand(20, 10), columns=X_train.columns)
-    y_val_clf = pd.Series(np.random.randint(0, 2, 20))
-    y_val_reg = pd.Series(np.random.randn(20) * 10)
-    X_test = pd.DataFrame(np.random.rand(20, 10), columns=X_train.columns)
-    y_test_clf = pd.Series(np.random.randint(0, 2, 20))
-    y_test_reg = pd.Series(np.random.randn(20) * 10)
+    rng = np.random.default_rng(42)
+    feature_cols = [f'feature_{i}' for i in range(10)]
+    X_train = pd.DataFrame(rng.random((100, 10), dtype=np.float32), columns=feature_cols)
+    y_train_clf = pd.Series(rng.integers(0, 2, 100))
+    y_train_reg = pd.Series(rng.standard_normal(100) * 10)
+    X_val = pd.DataFrame(rng.random((20, 10), dtype=np.float32), columns=feature_cols)
+    y_val_clf = pd.Series(rng.integers(0, 2, 20))
+    y_val_reg = pd.Series(rng.standard_normal(20) * 10)
+    X_test = pd.DataFrame(rng.random((20, 10), dtype=np.float32), columns=feature_cols)
+    y_test_clf = pd.Series(rng.integers(0, 2, 20))
+    y_test_reg = pd.Series(rng.standard_normal(20) * 10)
     print(f"   [OK] Created data: train={len(X_train)}, val={len(X_val)}, test={len(X_test)}")
     
     # Test 3: Train classification model
@@ -102,11 +109,19 @@ def test_trainer():
     assert hasattr(trainer, 'train_with_data_loader'), "Should have train_with_data_loader method"
     print(f"   [OK] train_with_data_loader method available")
     
-    # Test 8: Save training summary
-    print("\n8. Testing save training summary...")
-    summary_path = trainer.save_training_summary()
-    assert summary_path.exists(), "Summary file should exist"
-    print(f"   [OK] Training summary saved to: {summary_path}")
+    # Test 8: Streamed training records
+    print("\n8. Testing streamed training records...")
+    records_path = trainer.records_path
+    assert records_path.exists(), "Records file should exist"
+    records = pd.read_json(records_path, lines=True)
+    assert len(records) == 3, f"Should have 3 records (2 trained + 1 tuned), got {len(records)}"
+    unsaved_trainer = ModelTrainer(random_state=42)
+    unsaved_trainer.train_model(
+        XGBoostModel("unsaved_classifier", "classification", random_state=42, n_estimators=10),
+        X_train, y_train_clf, save_model=False
+    )
+    assert unsaved_trainer.records_path is None, "Unsaved models without a records path should not be recorded"
+    print(f"   [OK] Training records streamed to: {records_path}")
     
     # Test 9: Print comparison
     print("\n9. Testing print comparison...")
@@ -125,6 +140,8 @@ def test_trainer():
     assert len(comparison) == 3, f"Should have 3 models (2 trained + 1 tuned), got {len(comparison)}"
     print(f"   [OK] Multiple models comparison: {len(comparison)} models")
     
+    records_dir.cleanup()
+    
     print("\n" + "=" * 70)
     print("All ModelTrainer tests passed!")
     print("=" * 70)
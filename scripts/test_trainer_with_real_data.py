@@ -9,6 +9,7 @@ import os
 os.environ['DATABASE_TYPE'] = 'sqlite'
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from src.training.trainer import ModelTrainer
 from src.models.xgboost_model import XGBoostModel
 
@@ -29,8 +30,9 @@ def test_trainer_with_real_data():
     trainer = ModelTrainer(random_state=42)
     print(f"   [OK] Trainer initialized")
     
-    # Test 2: Train classification model with real data
-    print("\n2. Training classification model with real data...")
+    # Test 2: Train classification and regression models with real data
+    # (both heads share one DataLoader pass)
+    print("\n2. Training classification and regression models with real data...")
     clf_model = XGBoostModel(
         "nba_classifier",
         "classification",
@@ -38,15 +40,24 @@ def test_trainer_with_real_data():
         n_estimators=50,  # Small for testing
         verbosity=0
     )
+    reg_model = XGBoostModel(
+        "nba_regressor",
+        "regression",
+        random_state=42,
+        n_estimators=50,  # Small for testing
+        verbosity=0
+    )
     
     try:
-        results_clf = trainer.train_with_data_loader(
-            clf_model,
+        all_results = trainer.train_models_with_data_loader(
+            [clf_model, reg_model],
             train_seasons=['2022-23'],
             val_seasons=['2023-24'],
             test_seasons=['2024-25'],
             save_model=True
         )
+        results_clf = all_results[clf_model.model_name]
+        results_reg = all_results[reg_model.model_name]
         
         assert 'training_metrics' in results_clf, "Should have training metrics"
         assert 'test_metrics' in results_clf, "Should have test metrics"
@@ -61,30 +72,14 @@ def test_trainer_with_real_data():
         print(f"       Test accuracy: {results_clf.get('test_accuracy', 'N/A'):.3f}")
         
     except Exception as e:
-        print(f"   [ERROR] Classification training failed: {e}")
+        print(f"   [ERROR] Training failed: {e}")
         import traceback
         traceback.print_exc()
         return False
     
-    # Test 3: Train regression model with real data
-    print("\n3. Training regression model with real data...")
-    reg_model = XGBoostModel(
-        "nba_regressor",
-        "regression",
-        random_state=42,
-        n_estimators=50,  # Small for testing
-        verbosity=0
-    )
-    
+    # Test 3: Check regression results from the shared load
+    print("\n3. Checking regression model results...")
     try:
-        results_reg = trainer.train_with_data_loader(
-            reg_model,
-            train_seasons=['2022-23'],
-            val_seasons=['2023-24'],
-            test_seasons=['2024-25'],
-            save_model=True
-        )
-        
         assert 'training_metrics' in results_reg, "Should have training metrics"
         assert 'test_metrics' in results_reg, "Should have test metrics"
         assert 'test_rmse' in results_reg, "Should have test RMSE"
@@ -98,16 +93,17 @@ def test_trainer_with_real_data():
         print(f"       Test RMSE: {results_reg.get('test_rmse', 'N/A'):.3f}")
         
     except Exception as e:
-        print(f"   [ERROR] Regression training failed: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"   [ERROR] Regression check failed: {e}")
         return False
     
     # Test 4: Model comparison
     print("\n4. Comparing trained models...")
     try:
-        comparison_clf = trainer.compare_trained_models(task_type="classification")
-        comparison_reg = trainer.compare_trained_models(task_type="regression")
+        # Both comparisons only read trainer results, so run them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            clf_future = executor.submit(trainer.compare_trained_models, task_type="classification")
+            reg_future = executor.submit(trainer.compare_trained_models, task_type="regression")
+            comparison_clf, comparison_reg = clf_future.result(), reg_future.result()
         
         assert not comparison_clf.empty, "Classification comparison should not be empty"
         assert not comparison_reg.empty, "Regression comparison should not be empty"
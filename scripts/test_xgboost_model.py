@@ -7,128 +7,166 @@ sys.path.insert(0, str(project_root))
 
 import os
 os.environ['DATABASE_TYPE'] = 'sqlite'
+# Tiny fixtures: thread-pool startup costs more than it saves
+os.environ.setdefault('OMP_NUM_THREADS', '1')
 
 import numpy as np
 import pandas as pd
-from src.models.xgboost_model import XGBoostModel
+import pytest
 
-def test_xgboost_model():
-    """Test XGBoostModel functionality."""
-    print("=" * 70)
-    print("Testing XGBoostModel Implementation")
-    print("=" * 70)
-    
-    # Test 1: Create classification model
-    print("\n1. Creating classification model...")
-    clf_model = XGBoostModel("test_classifier", "classification", random_state=42)
-    print(f"   [OK] Created: {clf_model}")
-    assert not clf_model.is_trained, "Model should not be trained initially"
-    
-    # Test 2: Create regression model
-    print("\n2. Creating regression model...")
-    reg_model = XGBoostModel("test_regressor", "regression", random_state=42)
-    print(f"   [OK] Created: {reg_model}")
-    
-    # Test 3: Test classification training
-    print("\n3. Testing classification training...")
-    X_train_clf = pd.DataFrame(np.random.rand(100, 10), columns=[f'feature_{i}' for i in range(10)])
-    y_train_clf = pd.Series(np.random.randint(0, 2, 100))
-    X_val_clf = pd.DataFrame(np.random.rand(20, 10), columns=X_train_clf.columns)
-    y_val_clf = pd.Series(np.random.randint(0, 2, 20))
-    
-    metrics_clf = clf_model.train(X_train_clf, y_train_clf, X_val_clf, y_val_clf, early_stopping_rounds=5)
+# Deterministic fixtures: one seeded generator and one float32 feature block.
+# Rows 0-99 train, 100-119 validate, 120-129 test; classification and
+# regression sections share the same feature views.
+RNG = np.random.default_rng(42)
+COLS = [f'feature_{i}' for i in range(10)]
+X_ALL = np.empty((130, 10), dtype=np.float32)
+RNG.random(out=X_ALL, dtype=np.float32)  # fill in place, no extra init pass
+X_TRAIN = pd.DataFrame(X_ALL[0:100], columns=COLS, copy=False)
+X_VAL = pd.DataFrame(X_ALL[100:120], columns=COLS, copy=False)
+X_TEST = pd.DataFrame(X_ALL[120:130], columns=COLS, copy=False)
+# Frame with the wrong feature names, for the schema validation check.
+# Validation only reads column names, so no rows are needed.
+WRONG_COLS = ('a', 'b', 'c', 'd', 'e')
+X_WRONG = pd.DataFrame(np.empty((0, 5), dtype=np.float32), columns=WRONG_COLS)
+# Smoke test - params minimized, not representative of production
+SMOKE_PARAMS = {'n_estimators': 10, 'max_depth': 3, 'n_jobs': 1, 'tree_method': 'hist'}
+
+
+@pytest.fixture(scope="module")
+def model_cls():
+    """XGBoostModel, imported on first use (xgboost loads its native library on import)."""
+    from src.models.xgboost_model import XGBoostModel
+    return XGBoostModel
+
+
+@pytest.fixture(scope="module")
+def clf_data():
+    """Classification targets: (y_train, y_val)."""
+    rng = np.random.default_rng(43)  # own stream, independent of fixture order
+    return (
+        pd.Series(rng.integers(0, 2, 100, dtype=np.int8)),
+        pd.Series(rng.integers(0, 2, 20, dtype=np.int8)),
+    )
+
+
+@pytest.fixture(scope="module")
+def reg_data():
+    """Regression targets (point differentials): (y_train, y_val)."""
+    rng = np.random.default_rng(44)  # own stream, independent of fixture order
+    return (
+        pd.Series(rng.standard_normal(100, dtype=np.float32) * 10),
+        pd.Series(rng.standard_normal(20, dtype=np.float32) * 10),
+    )
+
+
+@pytest.fixture(scope="module")
+def clf_trained(model_cls, clf_data):
+    """Classification model trained once and shared: (model, train metrics)."""
+    model = model_cls("test_classifier", "classification", random_state=42, **SMOKE_PARAMS)
+    assert not model.is_trained, "Model should not be trained initially"
+    metrics = model.train(X_TRAIN, clf_data[0], X_VAL, clf_data[1], early_stopping_rounds=5)
+    return model, metrics
+
+
+@pytest.fixture(scope="module")
+def reg_trained(model_cls, reg_data):
+    """Regression model trained once and shared: (model, train metrics)."""
+    model = model_cls("test_regressor", "regression", random_state=42, **SMOKE_PARAMS)
+    metrics = model.train(X_TRAIN, reg_data[0], X_VAL, reg_data[1], early_stopping_rounds=5)
+    return model, metrics
+
+
+@pytest.fixture(scope="module")
+def clf_dmatrices(clf_data):
+    """DMatrix versions of the classification fixtures, built once: (dtrain, dval, dtest)."""
+    import xgboost as xgb
+    return (
+        xgb.DMatrix(X_ALL[0:100], label=clf_data[0].values, feature_names=COLS),
+        xgb.DMatrix(X_ALL[100:120], label=clf_data[1].values, feature_names=COLS),
+        xgb.DMatrix(X_ALL[120:130], feature_names=COLS),
+    )
+
+
+def test_classification_training(clf_trained):
+    clf_model, metrics_clf = clf_trained
     assert clf_model.is_trained, "Model should be trained"
-    assert 'train_accuracy' in metrics_clf, "Should have train accuracy"
-    assert 'val_accuracy' in metrics_clf, "Should have val accuracy"
-    print(f"   [OK] Training completed. Train accuracy: {metrics_clf['train_accuracy']:.3f}")
-    print(f"   [OK] Validation accuracy: {metrics_clf['val_accuracy']:.3f}")
-    
-    # Test 4: Test classification prediction
-    print("\n4. Testing classification prediction...")
-    X_test_clf = pd.DataFrame(np.random.rand(10, 10), columns=X_train_clf.columns)
-    predictions_clf = clf_model.predict(X_test_clf)
-    assert len(predictions_clf) == 10, "Should return 10 predictions"
-    assert all(p in [0, 1] for p in predictions_clf), "Predictions should be binary"
-    print(f"   [OK] Predictions shape: {predictions_clf.shape}")
-    
-    # Test 5: Test classification prediction with probabilities
-    print("\n5. Testing classification prediction with probabilities...")
-    pred_clf, proba_clf = clf_model.predict(X_test_clf, return_proba=True)
-    assert proba_clf.shape == (10, 2), "Probabilities should be (n_samples, n_classes)"
-    assert np.allclose(proba_clf.sum(axis=1), 1.0), "Probabilities should sum to 1"
-    print(f"   [OK] Predictions and probabilities shape: {pred_clf.shape}, {proba_clf.shape}")
-    
-    # Test 6: Test regression training
-    print("\n6. Testing regression training...")
-    X_train_reg = pd.DataFrame(np.random.rand(100, 10), columns=[f'feature_{i}' for i in range(10)])
-    y_train_reg = pd.Series(np.random.randn(100) * 10)  # Point differentials
-    X_val_reg = pd.DataFrame(np.random.rand(20, 10), columns=X_train_reg.columns)
-    y_val_reg = pd.Series(np.random.randn(20) * 10)
-    
-    metrics_reg = reg_model.train(X_train_reg, y_train_reg, X_val_reg, y_val_reg, early_stopping_rounds=5)
+    assert {'train_accuracy', 'val_accuracy'} <= metrics_clf.keys(), "Should have train and val accuracy"
+    print(f"   [OK] Train accuracy: {metrics_clf['train_accuracy']:.3f}, val accuracy: {metrics_clf['val_accuracy']:.3f}")
+
+
+def test_classification_predict(clf_trained):
+    clf_model, _ = clf_trained
+    predictions_clf = clf_model.predict(X_TEST)
+    assert predictions_clf.shape == (10,) and np.isin(predictions_clf, (0, 1)).all(), \
+        "Should return 10 binary predictions"
+
+
+def test_classification_predict_proba(clf_trained):
+    clf_model, _ = clf_trained
+    pred_clf, proba_clf = clf_model.predict(X_TEST, return_proba=True)
+    assert proba_clf.shape == (10, 2) and np.abs(proba_clf.sum(axis=1) - 1.0).max() < 1e-6, \
+        "Probabilities should be (n_samples, n_classes) and sum to 1"
+
+
+def test_regression_training(reg_trained):
+    reg_model, metrics_reg = reg_trained
     assert reg_model.is_trained, "Model should be trained"
-    assert 'train_rmse' in metrics_reg, "Should have train RMSE"
-    assert 'val_rmse' in metrics_reg, "Should have val RMSE"
-    print(f"   [OK] Training completed. Train RMSE: {metrics_reg['train_rmse']:.3f}")
-    print(f"   [OK] Validation RMSE: {metrics_reg['val_rmse']:.3f}")
-    
-    # Test 7: Test regression prediction
-    print("\n7. Testing regression prediction...")
-    X_test_reg = pd.DataFrame(np.random.rand(10, 10), columns=X_train_reg.columns)
-    predictions_reg = reg_model.predict(X_test_reg)
-    assert len(predictions_reg) == 10, "Should return 10 predictions"
-    print(f"   [OK] Predictions shape: {predictions_reg.shape}")
-    
-    # Test 8: Test save and load
-    print("\n8. Testing save and load...")
+    assert {'train_rmse', 'val_rmse'} <= metrics_reg.keys(), "Should have train and val RMSE"
+    print(f"   [OK] Train RMSE: {metrics_reg['train_rmse']:.3f}, val RMSE: {metrics_reg['val_rmse']:.3f}")
+
+
+def test_regression_predict(reg_trained):
+    reg_model, _ = reg_trained
+    predictions_reg = reg_model.predict(X_TEST)
+    assert predictions_reg.shape == (10,), "Should return 10 predictions"
+
+
+def test_save_load(model_cls, clf_trained):
+    clf_model, _ = clf_trained
     save_path = clf_model.save()
     assert save_path.exists(), "Model file should exist"
-    print(f"   [OK] Model saved to: {save_path}")
     
-    # Create new model and load
-    new_model = XGBoostModel("test_classifier", "classification")
+    new_model = model_cls("test_classifier", "classification")
     new_model.load(save_path)
     assert new_model.is_trained, "Loaded model should be trained"
-    print(f"   [OK] Model loaded successfully")
-    
-    # Test predictions match
-    pred_original = clf_model.predict(X_test_clf)
-    pred_loaded = new_model.predict(X_test_clf)
-    assert np.allclose(pred_original, pred_loaded), "Loaded model predictions should match"
-    print(f"   [OK] Loaded model predictions match original")
-    
-    # Test 9: Test feature validation
-    print("\n9. Testing feature validation...")
-    X_wrong = pd.DataFrame(np.random.rand(10, 5), columns=['a', 'b', 'c', 'd', 'e'])
-    try:
-        clf_model.predict(X_wrong)
-        print("   [ERROR] Should have raised ValueError for wrong features")
-        return False
-    except ValueError:
-        print("   [OK] Correctly validates feature names")
-    
-    # Test 10: Test metadata
-    print("\n10. Testing metadata...")
+    assert np.array_equal(clf_model.predict(X_TEST), new_model.predict(X_TEST)), \
+        "Loaded model predictions should match"
+
+
+def test_feature_validation(clf_trained):
+    clf_model, _ = clf_trained
+    with pytest.raises(ValueError):
+        clf_model.predict(X_WRONG)
+
+
+def test_metadata(clf_trained):
+    clf_model, _ = clf_trained
     metadata = clf_model.get_metadata()
-    assert 'n_samples' in metadata, "Metadata should include training info"
-    assert metadata['is_trained'] == True, "Metadata should reflect training status"
-    print(f"   [OK] Metadata keys: {list(metadata.keys())[:5]}...")
-    
-    # Test 11: Test scale_pos_weight
-    print("\n11. Testing scale_pos_weight for class imbalance...")
-    imbalanced_model = XGBoostModel("imbalanced_test", "classification", scale_pos_weight=0.8)
-    assert imbalanced_model.scale_pos_weight == 0.8, "scale_pos_weight should be set"
-    print(f"   [OK] scale_pos_weight set correctly: {imbalanced_model.scale_pos_weight}")
-    
-    print("\n" + "=" * 70)
-    print("All XGBoostModel tests passed!")
-    print("=" * 70)
-    return True
+    assert 'n_samples' in metadata and metadata['is_trained'] == True, \
+        "Metadata should include training info and reflect training status"
 
-if __name__ == "__main__":
-    success = test_xgboost_model()
-    sys.exit(0 if success else 1)
 
+def test_dmatrix_training(model_cls, clf_dmatrices, clf_trained):
+    import xgboost as xgb
+    dtrain, dval, dtest = clf_dmatrices
+    dm_model = model_cls("test_classifier_dmatrix", "classification", random_state=42, **SMOKE_PARAMS)
+    metrics = dm_model.train_dmatrix(dtrain, dval)
+    assert dm_model.is_trained and {'train_accuracy', 'val_accuracy'} <= metrics.keys(), \
+        "DMatrix training should train the model and report train/val accuracy"
+    
+    # Same data and params as the DataFrame path, so the same model
+    _, proba_dm = dm_model.predict_dmatrix(dtest, return_proba=True)
+    _, proba_df = clf_trained[0].predict(X_TEST, return_proba=True)
+    assert np.allclose(proba_dm, proba_df), "DMatrix and DataFrame paths should agree"
+    
+    with pytest.raises(ValueError):
+        dm_model.predict_dmatrix(xgb.DMatrix(np.empty((0, 5), dtype=np.float32), feature_names=list(WRONG_COLS)))
 
 
+def test_scale_pos_weight(model_cls):
+    imbalanced_model = model_cls("imbalanced_test", "classification", scale_pos_weight=0.8, **SMOKE_PARAMS)
+    assert imbalanced_model.scale_pos_weight == 0.8, "scale_pos_weight should be set"
+
 
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -9,11 +9,10 @@ import os
 os.environ['DATABASE_TYPE'] = 'sqlite'
 
 import argparse
+import functools
 import logging
-from typing import List, Optional
-from src.training.trainer import ModelTrainer
-from src.models.xgboost_model import XGBoostModel
-from config.settings import get_settings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,10 +20,162 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Default cap on XGBoost threads per model
+MAX_DEFAULT_THREADS = 8
 
-def parse_seasons(seasons_str: str) -> List[str]:
-    """Parse comma-separated seasons string into list."""
-    return [s.strip() for s in seasons_str.split(',')]
+
+@functools.cache
+def parse_seasons(seasons_str: str) -> Tuple[str, ...]:
+    """Parse comma-separated seasons string into a (hashable) tuple."""
+    return tuple(s.strip() for s in seasons_str.split(','))
+
+
+def train_task(
+    task_type: str,
+    args: argparse.Namespace,
+    data: Dict[str, Any],
+    nthread: int,
+    trainer: Optional[Any] = None,
+    records_path: Optional[Path] = None
+) -> Tuple[Dict[str, Dict], Dict[str, Any]]:
+    """
+    Train (and optionally tune) the model for one task.
+    
+    A single task runs on the caller's trainer. When several tasks are
+    trained, each runs in a worker process with its own ModelTrainer and the
+    parent merges the returned results and models.
+    
+    Args:
+        trainer: ModelTrainer to train on (None = create one, in a worker)
+        records_path: Training records file for a newly created trainer, so
+                      all tasks append to the same file
+    
+    Returns:
+        The trainer's training_results and trained_models keyed by model name
+    """
+    # Imported here so worker processes don't depend on main()'s imports
+    from scipy.stats import loguniform, randint, uniform
+    from src.training.trainer import ModelTrainer
+    from src.models.xgboost_model import XGBoostModel
+    
+    if trainer is None:
+        trainer = ModelTrainer(random_state=args.random_state)
+        trainer.records_path = records_path
+    
+    logger.info("\n%s", "=" * 70)
+    logger.info("Training %s model", task_type)
+    logger.info("=" * 70)
+    
+    # Generate model name
+    if args.model_name:
+        model_name = f"{args.model_name}_{task_type}"
+    else:
+        model_name = f"nba_{task_type}"
+    
+    if args.tune:
+        # Hyperparameter tuning
+        logger.info("Starting hyperparameter tuning...")
+    
+        # Frozen scipy distributions: sampled in C and cover the
+        # continuous axes better than a handful of fixed values
+        param_distributions = {
+            'max_depth': randint(3, 10),
+            'learning_rate': loguniform(0.01, 0.3),
+            'n_estimators': randint(50, 301),
+            'subsample': uniform(0.7, 0.3),
+            'colsample_bytree': uniform(0.7, 0.3),
+            'min_child_weight': randint(1, 6),
+            'gamma': loguniform(1e-3, 0.3),
+            'reg_alpha': loguniform(1e-3, 1.0),
+            'reg_lambda': uniform(1.0, 1.0)
+        }
+    
+        # Select appropriate target
+        if task_type == "classification":
+            y_train = data['y_train_class']
+            y_val = data['y_val_class']
+        else:
+            y_train = data['y_train_reg']
+            y_val = data['y_val_reg']
+    
+        # Concurrent configs share the frames (threads) and get one
+        # core each so they don't fight over the same cores
+        tune_nthread = 1 if args.n_jobs > 1 else nthread
+    
+        # Perform tuning
+        best_model, tuning_results = trainer.hyperparameter_tuning(
+            XGBoostModel,
+            model_name,
+            param_distributions,
+            data['X_train'],
+            y_train,
+            X_val=data['X_val'],
+            y_val=y_val,
+            n_iter=args.n_iter,
+            task_type=task_type,
+            search=args.tuner,
+            n_workers=args.n_jobs,
+            random_state=args.random_state,
+            n_jobs=tune_nthread,
+            tree_method=args.tree_method,
+            device=args.device,
+            verbosity=0
+        )
+    
+        logger.info("Best parameters: %s", tuning_results['best_params'])
+        logger.info("Best score: %.4f", tuning_results['best_score'])
+    
+        # Evaluate on test set
+        if 'X_test' in data:
+            if task_type == "classification":
+                y_test = data['y_test_class']
+            else:
+                y_test = data['y_test_reg']
+    
+            test_results = trainer.train_model(
+                best_model,
+                data['X_train'],
+                y_train,
+                X_val=data['X_val'],
+                y_val=y_val,
+                X_test=data['X_test'],
+                y_test=y_test,
+                save_model=not args.no_save
+            )
+    
+            logger.info("Test results: %s", test_results.get('test_accuracy' if task_type == 'classification' else 'test_rmse', 'N/A'))
+    else:
+        # Standard training
+        model = XGBoostModel(
+            model_name,
+            task_type,
+            n_estimators=args.n_estimators,
+            max_depth=args.max_depth,
+            learning_rate=args.learning_rate,
+            random_state=args.random_state,
+            n_jobs=nthread,
+            tree_method=args.tree_method,
+            device=args.device,
+            verbosity=0
+        )
+    
+        results = trainer.train_with_data_loader(
+            model,
+            save_model=not args.no_save,
+            data=data
+        )
+    
+        logger.info("Training completed successfully")
+        if task_type == "classification":
+            logger.info("  Train accuracy: %.3f", results['training_metrics'].get('train_accuracy', 'N/A'))
+            logger.info("  Val accuracy: %.3f", results['training_metrics'].get('val_accuracy', 'N/A'))
+            logger.info("  Test accuracy: %.3f", results.get('test_accuracy', 'N/A'))
+        else:
+            logger.info("  Train RMSE: %.3f", results['training_metrics'].get('train_rmse', 'N/A'))
+            logger.info("  Val RMSE: %.3f", results['training_metrics'].get('val_rmse', 'N/A'))
+            logger.info("  Test RMSE: %.3f", results.get('test_rmse', 'N/A'))
+    
+    return trainer.training_results, trainer.trained_models
 
 
 def main():
@@ -39,6 +190,9 @@ Examples:
   # Train with hyperparameter tuning
   python scripts/train_model.py --task classification --tune --n_iter 20
   
+  # Tune with successive halving (cheap early rounds, only survivors get more trees)
+  python scripts/train_model.py --task classification --tune --tuner halving --n-iter 81
+  
   # Train both classification and regression
   python scripts/train_model.py --task both
         """
@@ -98,12 +252,33 @@ Examples:
         default=0.1,
         help='Learning rate for XGBoost (default: 0.1)'
     )
+    parser.add_argument(
+        '--nthread',
+        type=int,
+        default=None,
+        help=f'Threads per XGBoost model, -1 for all cores '
+             f'(default: cores split across tasks, capped at {MAX_DEFAULT_THREADS})'
+    )
+    parser.add_argument(
+        '--tree-method',
+        type=str,
+        choices=['auto', 'hist', 'approx', 'exact'],
+        default='hist',
+        help='XGBoost split finding algorithm (default: hist)'
+    )
+    parser.add_argument(
+        '--device',
+        type=str,
+        choices=['cpu', 'cuda'],
+        default='cpu',
+        help='Device to train XGBoost on (default: cpu)'
+    )
     
     # Hyperparameter tuning
     parser.add_argument(
         '--tune',
         action='store_true',
-        help='Enable hyperparameter tuning (random search)'
+        help='Enable hyperparameter tuning (see --tuner)'
     )
     parser.add_argument(
         '--n-iter',
@@ -111,6 +286,19 @@ Examples:
         default=50,
         help='Number of random search iterations (default: 50)'
     )
+    parser.add_argument(
+        '--tuner',
+        type=str,
+        choices=['random', 'halving'],
+        default='random',
+        help='Search strategy: train every config fully, or successive halving on n_estimators (default: random)'
+    )
+    parser.add_argument(
+        '--n-jobs',
+        type=int,
+        default=1,
+        help='Tuning configs trained concurrently in threads; each uses 1 XGBoost thread when > 1 (default: 1)'
+    )
     parser.add_argument(
         '--exclude-betting-features',
         action='store_true',
@@ -132,6 +320,32 @@ Examples:
     
     args = parser.parse_args()
     
+    # Determine which tasks to run
+    tasks = []
+    if args.task == 'both':
+        tasks = ['classification', 'regression']
+    else:
+        tasks = [args.task]
+    
+    # Classification and regression are independent and train in separate
+    # processes, so split the cores between them. hist stops scaling past
+    # ~8 threads, so the default is capped there even on big machines.
+    if args.nthread is None:
+        nthread = max(1, min(MAX_DEFAULT_THREADS, (os.cpu_count() or 1) // len(tasks)))
+    else:
+        nthread = args.nthread
+    
+    # Keep OpenMP/MKL pools in numpy/scipy from claiming the same cores
+    # (must be set before they are imported below)
+    if nthread > 0:
+        os.environ.setdefault('OMP_NUM_THREADS', str(nthread))
+        os.environ.setdefault('MKL_NUM_THREADS', str(nthread))
+    
+    # Heavy imports (pandas, xgboost) deferred so --help and argument errors return immediately
+    import numpy as np
+    import pandas as pd
+    from src.training.trainer import ModelTrainer
+    
     # Parse seasons
     train_seasons = parse_seasons(args.train_seasons)
     val_seasons = parse_seasons(args.val_seasons)
@@ -140,155 +354,77 @@ Examples:
     logger.info("=" * 70)
     logger.info("NBA Model Training")
     logger.info("=" * 70)
-    logger.info(f"Task: {args.task}")
-    logger.info(f"Train seasons: {train_seasons}")
-    logger.info(f"Val seasons: {val_seasons}")
-    logger.info(f"Test seasons: {test_seasons}")
-    logger.info(f"Hyperparameter tuning: {args.tune}")
+    logger.info("Task: %s", args.task)
+    logger.info("Train seasons: %s", train_seasons)
+    logger.info("Val seasons: %s", val_seasons)
+    logger.info("Test seasons: %s", test_seasons)
+    logger.info("Hyperparameter tuning: %s", args.tune)
     if args.tune:
-        logger.info(f"Random search iterations: {args.n_iter}")
+        logger.info("Random search iterations: %d (%s)", args.n_iter, args.tuner)
+    logger.info("XGBoost threads per model: %s", nthread)
     logger.info("=" * 70)
     
     # Initialize trainer
     trainer = ModelTrainer(random_state=args.random_state)
     
-    # Determine which tasks to run
-    tasks = []
-    if args.task == 'both':
-        tasks = ['classification', 'regression']
-    else:
-        tasks = [args.task]
+    # Load data once; both tasks and the tune-then-retrain path reuse it
+    try:
+        data = trainer.data_loader.load_all_data(
+            train_seasons=train_seasons,
+            val_seasons=val_seasons,
+            test_seasons=test_seasons
+        )
+    except Exception as e:
+        logger.error("Error loading training data: %s", e)
+        return 1
     
-    # Train models
-    for task_type in tasks:
-        logger.info(f"\n{'=' * 70}")
-        logger.info(f"Training {task_type} model")
-        logger.info(f"{'=' * 70}")
-        
-        # Generate model name
-        if args.model_name:
-            model_name = f"{args.model_name}_{task_type}"
-        else:
-            model_name = f"nba_{task_type}"
-        
-        try:
-            if args.tune:
-                # Hyperparameter tuning
-                logger.info("Starting hyperparameter tuning...")
-                
-                param_distributions = {
-                    'max_depth': [3, 5, 7, 9],
-                    'learning_rate': [0.01, 0.05, 0.1, 0.2],
-                    'n_estimators': [50, 100, 200, 300],
-                    'subsample': [0.7, 0.8, 0.9, 1.0],
-                    'colsample_bytree': [0.7, 0.8, 0.9, 1.0],
-                    'min_child_weight': [1, 3, 5],
-                    'gamma': [0, 0.1, 0.2],
-                    'reg_alpha': [0, 0.1, 0.5],
-                    'reg_lambda': [1, 1.5, 2]
-                }
-                
-                # Load data for tuning
-                data = trainer.data_loader.load_all_data(
-                    train_seasons=train_seasons,
-                    val_seasons=val_seasons,
-                    test_seasons=test_seasons
-                )
-                
-                # Select appropriate target
-                if task_type == "classification":
-                    y_train = data['y_train_class']
-                    y_val = data['y_val_class']
-                else:
-                    y_train = data['y_train_reg']
-                    y_val = data['y_val_reg']
-                
-                # Perform tuning
-                best_model, tuning_results = trainer.hyperparameter_tuning(
-                    XGBoostModel,
-                    model_name,
-                    param_distributions,
-                    data['X_train'],
-                    y_train,
-                    X_val=data['X_val'],
-                    y_val=y_val,
-                    n_iter=args.n_iter,
-                    task_type=task_type,
-                    random_state=args.random_state,
-                    verbosity=0
-                )
-                
-                logger.info(f"Best parameters: {tuning_results['best_params']}")
-                logger.info(f"Best score: {tuning_results['best_score']:.4f}")
-                
-                # Evaluate on test set
-                if 'X_test' in data:
-                    if task_type == "classification":
-                        y_test = data['y_test_class']
-                    else:
-                        y_test = data['y_test_reg']
-                    
-                    test_results = trainer.train_model(
-                        best_model,
-                        data['X_train'],
-                        y_train,
-                        X_val=data['X_val'],
-                        y_val=y_val,
-                        X_test=data['X_test'],
-                        y_test=y_test,
-                        save_model=not args.no_save
+    # XGBoost stores features as float32 anyway. Casting once gives each
+    # split a single float32 block that .values can view without copying on
+    # every fit/predict, instead of re-converting the mixed-dtype frames.
+    # Worker processes (--task both) each receive a pickled copy of it.
+    for split in ('X_train', 'X_val', 'X_test'):
+        if split in data:
+            X = data[split]
+            data[split] = pd.DataFrame(X.to_numpy(dtype=np.float32), index=X.index, columns=X.columns)
+    
+    # All tasks, including worker processes, append to one records file
+    if not args.no_save:
+        trainer.records_path = trainer.default_records_path()
+    
+    try:
+        if len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+                futures = [
+                    executor.submit(
+                        train_task, task_type, args, data, nthread, records_path=trainer.records_path
                     )
-                    
-                    logger.info(f"Test results: {test_results.get('test_accuracy' if task_type == 'classification' else 'test_rmse', 'N/A')}")
-            else:
-                # Standard training
-                model = XGBoostModel(
-                    model_name,
-                    task_type,
-                    n_estimators=args.n_estimators,
-                    max_depth=args.max_depth,
-                    learning_rate=args.learning_rate,
-                    random_state=args.random_state,
-                    verbosity=0
-                )
-                
-                results = trainer.train_with_data_loader(
-                    model,
-                    train_seasons=train_seasons,
-                    val_seasons=val_seasons,
-                    test_seasons=test_seasons,
-                    save_model=not args.no_save
-                )
-                
-                logger.info(f"Training completed successfully")
-                if task_type == "classification":
-                    logger.info(f"  Train accuracy: {results['training_metrics'].get('train_accuracy', 'N/A'):.3f}")
-                    logger.info(f"  Val accuracy: {results['training_metrics'].get('val_accuracy', 'N/A'):.3f}")
-                    logger.info(f"  Test accuracy: {results.get('test_accuracy', 'N/A'):.3f}")
-                else:
-                    logger.info(f"  Train RMSE: {results['training_metrics'].get('train_rmse', 'N/A'):.3f}")
-                    logger.info(f"  Val RMSE: {results['training_metrics'].get('val_rmse', 'N/A'):.3f}")
-                    logger.info(f"  Test RMSE: {results.get('test_rmse', 'N/A'):.3f}")
-        
-        except Exception as e:
-            logger.error(f"Error training {task_type} model: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return 1
+                    for task_type in tasks
+                ]
+                for future in futures:
+                    results, models = future.result()
+                    trainer.training_results.update(results)
+                    trainer.trained_models.update(models)
+        else:
+            train_task(tasks[0], args, data, nthread, trainer=trainer)
+    except Exception as e:
+        logger.error("Error training models: %s", e)
+        import traceback
+        logger.error(traceback.format_exc())
+        return 1
     
     # Print comparison
-    logger.info(f"\n{'=' * 70}")
+    logger.info("\n%s", "=" * 70)
     logger.info("Model Comparison")
-    logger.info(f"{'=' * 70}")
+    logger.info("=" * 70)
     trainer.print_comparison()
     
     # Save training summary
     summary_path = trainer.save_training_summary()
-    logger.info(f"\nTraining summary saved to: {summary_path}")
+    logger.info("\nTraining summary saved to: %s", summary_path)
     
-    logger.info(f"\n{'=' * 70}")
+    logger.info("\n%s", "=" * 70)
     logger.info("Training Complete!")
-    logger.info(f"{'=' * 70}")
+    logger.info("=" * 70)
     
     return 0
 
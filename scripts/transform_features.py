@@ -21,8 +21,10 @@ os.environ['DATABASE_TYPE'] = 'sqlite'
 import logging
 import argparse
 from datetime import date, datetime, timedelta
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Collection, List, Optional, Tuple
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 logging.basicConfig(
     level=logging.INFO,
@@ -34,13 +36,86 @@ logger = logging.getLogger(__name__)
 import pandas as pd
 import numpy as np
 from tqdm import tqdm
-from sqlalchemy import and_
+from joblib import Parallel, delayed
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.orm import aliased
 
 from src.database.db_manager import DatabaseManager
 from src.database.models import Game, Team, TeamStats, TeamRollingFeatures, GameMatchupFeatures, PlayerStats
 from src.features.team_features import TeamFeatureCalculator
 from src.features.matchup_features import MatchupFeatureCalculator
 from src.features.contextual_features import ContextualFeatureCalculator
+from config.settings import get_settings
+
+# Upper bound on a team's games in one season (regular season + playoffs)
+MAX_SEASON_GAMES = 200
+
+# Box-score counting stats loaded per team game
+COUNT_STAT_COLUMNS = [
+    'points', 'rebounds_total', 'assists', 'turnovers', 'steals', 'blocks',
+    'field_goals_made', 'field_goals_attempted', 'three_pointers_made',
+    'three_pointers_attempted', 'free_throws_made', 'free_throws_attempted',
+]
+
+# Feature columns read from the precomputed rolling windows
+ROLLING_COLUMNS = [
+    f'{window}_{stat}'
+    for window, stats in (
+        ('l5', ('points', 'points_allowed', 'fg_pct', 'three_pct', 'ft_pct', 'rebounds',
+                'assists', 'turnovers', 'steals', 'blocks', 'win_pct')),
+        ('l10', ('points', 'points_allowed', 'fg_pct', 'three_pct', 'ft_pct', 'rebounds',
+                 'assists', 'turnovers', 'steals', 'blocks', 'win_pct')),
+        ('l20', ('points', 'points_allowed', 'fg_pct', 'three_pct', 'win_pct')),
+    )
+    for stat in stats
+] + ['efg_pct', 'ts_pct', 'avg_point_differential', 'avg_points_for', 'avg_points_against']
+
+# TeamFeatureCalculator metrics computed for all of a team's games at once
+ADVANCED_METRIC_COLUMNS = [
+    'offensive_rating', 'defensive_rating', 'net_rating', 'pace', 'tov_pct',
+    'offensive_rebound_rate', 'defensive_rebound_rate',
+    'assist_rate', 'steal_rate', 'block_rate',
+]
+STREAK_COLUMNS = ['win_streak', 'loss_streak']
+
+# Rest/schedule features derived from a team's game dates
+SCHEDULE_COLUMNS = ['days_rest', 'is_back_to_back', 'games_in_last_7_days']
+
+# Injury features, computed game by game
+INJURY_COLUMNS = ['players_out', 'players_questionable', 'injury_severity_score']
+
+# MatchupFeatureCalculator features computed for all games at once
+HEAD_TO_HEAD_COLUMNS = [
+    'h2h_home_wins', 'h2h_away_wins', 'h2h_total_games', 'h2h_avg_point_differential',
+    'h2h_home_avg_score', 'h2h_away_avg_score',
+]
+STYLE_FORM_COLUMNS = [
+    'pace_differential', 'ts_differential', 'efg_differential',
+    'home_win_pct_recent', 'away_win_pct_recent', 'win_pct_differential',
+]
+REST_COLUMNS = [
+    'home_rest_days', 'away_rest_days', 'rest_days_differential',
+    'home_is_b2b', 'away_is_b2b', 'home_days_until_next', 'away_days_until_next',
+]
+
+
+def _window_totals(values: np.ndarray, window_start: np.ndarray, window_end: np.ndarray) -> np.ndarray:
+    """
+    Sum values[window_start:window_end] for each window, newest value first.
+    
+    Values are added one at a time in the order TeamFeatureCalculator walks
+    its newest-first stats history, so float totals match it bit for bit and
+    round() breaks ties the same way.
+    """
+    n_games = window_end - window_start
+    width = int(n_games.max(initial=0))
+    if width == 0:
+        return np.zeros(len(window_end))
+    
+    offsets = np.arange(width)
+    terms = values[np.maximum(window_end[:, None] - 1 - offsets, 0)]
+    terms[offsets >= n_games[:, None]] = 0.0
+    return np.cumsum(terms, axis=1)[:, -1]
 
 
 class FeatureTransformer:
@@ -54,15 +129,36 @@ class FeatureTransformer:
     - Contextual features (rest days, back-to-back, etc.)
     """
     
-    def __init__(self, season: str = '2025-26', db_manager: Optional[DatabaseManager] = None):
+    def __init__(
+        self,
+        season: str = '2025-26',
+        db_manager: Optional[DatabaseManager] = None,
+        n_jobs: int = 1,
+        use_cache: bool = True,
+        quiet: bool = False
+    ):
         self.season = season
         self.db_manager = db_manager or DatabaseManager()
+        self.n_jobs = n_jobs
+        self.quiet = quiet  # Hide progress bars (for automation)
+        
+        # Loaded season frames are cached here between runs (None = no cache)
+        settings = get_settings()
+        self.cache_dir = (
+            Path(settings.FEATURE_CACHE_PATH)
+            if use_cache and settings.FEATURE_CACHE_ENABLED else None
+        )
         
         # Initialize feature calculators
         self.team_calc = TeamFeatureCalculator(db_manager)
         self.matchup_calc = MatchupFeatureCalculator(db_manager)
         self.contextual_calc = ContextualFeatureCalculator(db_manager)
         
+        # Exponential decay weights for rolling stats (w_i = e^(-λ * i)), computed
+        # once and sliced for every window
+        self.decay_rate = get_settings().ROLLING_STATS_DECAY_RATE
+        self._decay_weights = np.exp(-self.decay_rate * np.arange(MAX_SEASON_GAMES))
+        
         # Stats tracking
         self.stats = {
             'games_processed': 0,
@@ -89,17 +185,30 @@ class FeatureTransformer:
         
         try:
             # Load all game data for the season
-            games_df, team_stats_df = self._load_game_data()
+            games_df, team_stats_df = self._load_game_data(use_cache=not full_refresh)
             
             if games_df.empty:
                 print("No games found for this season")
                 return self.stats
             
-            # Calculate rolling features for each team-game
-            self._calculate_rolling_features(games_df, team_stats_df, full_refresh)
+            # Rolling features (per team) and matchup features (per game) are
+            # independent reads over the same games, so they are computed side
+            # by side and stored afterwards, keeping database writes sequential
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                rolling_future = executor.submit(
+                    self._calculate_rolling_features, games_df, team_stats_df, full_refresh
+                )
+                matchup_future = executor.submit(
+                    self._calculate_matchup_features, games_df, full_refresh
+                )
+                team_features = rolling_future.result()
+                matchup_features = matchup_future.result()
+            
+            if not team_features.empty:
+                self._store_features(team_features, full_refresh)
             
-            # Calculate matchup features for each game
-            self._calculate_matchup_features(games_df, full_refresh)
+            if matchup_features:
+                self._store_matchup_features(matchup_features, full_refresh)
             
         except Exception as e:
             logger.error(f"Transform error: {e}")
@@ -110,59 +219,29 @@ class FeatureTransformer:
         self._print_summary()
         return self.stats
     
-    def _load_game_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Load all game and team stats data for the season."""
+    def _load_game_data(self, use_cache: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Load all game and team stats data for the season.
+        
+        The frames are cached in cache_dir, keyed by _game_data_version(), so a
+        rerun against an unchanged database skips the queries.
+        
+        Args:
+            use_cache: If True, read/write the on-disk cache
+        """
         print("\n[STEP 1] Loading game data...")
         
-        with self.db_manager.get_session() as session:
-            # Load games (both finished and upcoming)
-            games = session.query(Game).filter(
-                Game.season == self.season
-            ).order_by(Game.game_date).all()
-            
-            games_data = [{
-                'game_id': g.game_id,
-                'game_date': g.game_date,
-                'home_team_id': g.home_team_id,
-                'away_team_id': g.away_team_id,
-                'home_score': g.home_score,
-                'away_score': g.away_score,
-                'winner': g.winner,
-                'point_differential': g.point_differential,
-                'game_status': g.game_status
-            } for g in games]
-            
-            games_df = pd.DataFrame(games_data)
-            
-            # Load team stats (only for finished games)
-            team_stats = session.query(TeamStats).join(Game).filter(
-                Game.season == self.season
-            ).all()
-            
-            stats_data = [{
-                'game_id': ts.game_id,
-                'team_id': ts.team_id,
-                'is_home': ts.is_home,
-                'points': ts.points,
-                'field_goal_percentage': ts.field_goal_percentage,
-                'three_point_percentage': ts.three_point_percentage,
-                'free_throw_percentage': ts.free_throw_percentage,
-                'rebounds_total': ts.rebounds_total,
-                'assists': ts.assists,
-                'turnovers': ts.turnovers,
-                'steals': ts.steals,
-                'blocks': ts.blocks,
-                'field_goals_made': ts.field_goals_made,
-                'field_goals_attempted': ts.field_goals_attempted,
-                'three_pointers_made': ts.three_pointers_made,
-                'three_pointers_attempted': ts.three_pointers_attempted,
-                'free_throws_made': ts.free_throws_made,
-                'free_throws_attempted': ts.free_throws_attempted,
-                'true_shooting_percentage': ts.true_shooting_percentage,
-                'effective_field_goal_percentage': ts.effective_field_goal_percentage
-            } for ts in team_stats]
-            
-            team_stats_df = pd.DataFrame(stats_data)
+        use_cache = use_cache and self.cache_dir is not None
+        version = self._game_data_version() if use_cache else None
+        cached = self._read_game_data_cache(version) if use_cache else None
+        
+        if cached is not None:
+            games_df, team_stats_df = cached
+            print("  [OK] Using cached game data")
+        else:
+            games_df, team_stats_df = self._query_game_data()
+            if use_cache:
+                self._write_game_data_cache(version, games_df, team_stats_df)
         
         finished_count = len(games_df[games_df['game_status'] == 'finished'])
         upcoming_count = len(games_df[games_df['game_status'] != 'finished'])
@@ -171,60 +250,232 @@ class FeatureTransformer:
         
         return games_df, team_stats_df
     
-    def _calculate_rolling_features(self, games_df: pd.DataFrame, team_stats_df: pd.DataFrame, full_refresh: bool):
+    def _query_game_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Query the season's games and team stats from the database."""
+        with self.db_manager.get_session() as session:
+            # Load games (both finished and upcoming). Selecting columns skips
+            # ORM object hydration; rows go straight into the DataFrame.
+            games_result = session.execute(
+                select(
+                    Game.game_id,
+                    Game.game_date,
+                    Game.home_team_id,
+                    Game.away_team_id,
+                    Game.home_score,
+                    Game.away_score,
+                    Game.winner,
+                    Game.point_differential,
+                    Game.game_status
+                )
+                .where(Game.season == self.season)
+                .order_by(Game.game_date)
+            )
+            games_df = pd.DataFrame(games_result.all(), columns=list(games_result.keys()))
+            
+            # All date arithmetic below works on datetime64[ns]
+            games_df['game_date'] = pd.to_datetime(games_df['game_date']).astype('datetime64[ns]')
+            
+            # Load team stats (only for finished games)
+            stats_result = session.execute(
+                select(
+                    TeamStats.game_id,
+                    TeamStats.team_id,
+                    TeamStats.is_home,
+                    TeamStats.points,
+                    TeamStats.field_goal_percentage,
+                    TeamStats.three_point_percentage,
+                    TeamStats.free_throw_percentage,
+                    TeamStats.rebounds_total,
+                    TeamStats.assists,
+                    TeamStats.turnovers,
+                    TeamStats.steals,
+                    TeamStats.blocks,
+                    TeamStats.field_goals_made,
+                    TeamStats.field_goals_attempted,
+                    TeamStats.three_pointers_made,
+                    TeamStats.three_pointers_attempted,
+                    TeamStats.free_throws_made,
+                    TeamStats.free_throws_attempted,
+                    TeamStats.true_shooting_percentage,
+                    TeamStats.effective_field_goal_percentage
+                )
+                .join(Game, TeamStats.game_id == Game.game_id)
+                .where(Game.season == self.season)
+            )
+            team_stats_df = pd.DataFrame(stats_result.all(), columns=list(stats_result.keys()))
+        
+        # Counting stats are whole numbers, so float32 holds them exactly at half
+        # the memory; percentages stay float64 so stored features don't change
+        for column in COUNT_STAT_COLUMNS:
+            if column in team_stats_df.columns:
+                team_stats_df[column] = pd.to_numeric(team_stats_df[column], downcast='float')
+        
+        # ~30 distinct teams/statuses: categorical codes make the per-team
+        # equality filters and groupbys integer comparisons
+        for column in ('home_team_id', 'away_team_id', 'winner', 'game_status'):
+            games_df[column] = games_df[column].astype('category')
+        team_stats_df['team_id'] = team_stats_df['team_id'].astype('category')
+        
+        return games_df, team_stats_df
+    
+    def _game_data_version(self) -> Tuple:
+        """
+        Cheap fingerprint of the season's games and team stats.
+        
+        Games carry updated_at; TeamStats only has created_at, so in-place stat
+        corrections are caught through column sums.
+        """
+        with self.db_manager.get_session() as session:
+            games = session.execute(
+                select(func.count(Game.game_id), func.max(Game.updated_at))
+                .where(Game.season == self.season)
+            ).one()
+            stats = session.execute(
+                select(
+                    func.count(TeamStats.id),
+                    func.max(TeamStats.created_at),
+                    func.sum(TeamStats.points),
+                    func.sum(TeamStats.field_goals_attempted),
+                    func.sum(TeamStats.rebounds_total),
+                    func.sum(TeamStats.assists),
+                    func.sum(TeamStats.turnovers)
+                )
+                .join(Game, TeamStats.game_id == Game.game_id)
+                .where(Game.season == self.season)
+            ).one()
+        return tuple(str(value) for value in (*games, *stats))
+    
+    def _game_data_cache_path(self) -> Path:
+        return Path(self.cache_dir) / f"game_data_{self.season}.pkl"
+    
+    def _read_game_data_cache(self, version: Tuple) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """Return the cached (games_df, team_stats_df) if it matches version."""
+        path = self._game_data_cache_path()
+        if not path.exists():
+            return None
+        
+        try:
+            cached = pd.read_pickle(path)
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable game data cache {path}: {e}")
+            return None
+        
+        if cached.get('version') != version:
+            return None
+        return cached['games'], cached['team_stats']
+    
+    def _write_game_data_cache(self, version: Tuple, games_df: pd.DataFrame, team_stats_df: pd.DataFrame):
+        """Write the loaded frames to the cache (best effort)."""
+        path = self._game_data_cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            pd.to_pickle({'version': version, 'games': games_df, 'team_stats': team_stats_df}, tmp_path)
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.warning(f"Could not write game data cache {path}: {e}")
+    
+    def _calculate_rolling_features(
+        self,
+        games_df: pd.DataFrame,
+        team_stats_df: pd.DataFrame,
+        full_refresh: bool
+    ) -> pd.DataFrame:
         """Calculate rolling features for each team-game combination."""
         print("\n[STEP 2] Calculating rolling features...")
         
         if games_df.empty:
             print("  No games to process")
-            return
+            return pd.DataFrame()
         
         # Get all unique teams from games (not just from stats)
         all_teams = set(games_df['home_team_id'].unique()) | set(games_df['away_team_id'].unique())
         print(f"  Processing {len(all_teams)} teams...")
         
-        # Merge games with team stats
-        games_df['game_date'] = pd.to_datetime(games_df['game_date'])
-        
-        # Get existing features to skip if not full refresh
-        existing_features = set()
+        # Get existing features (game ids per team) to skip if not full refresh
+        existing_by_team = {}
         if not full_refresh:
             with self.db_manager.get_session() as session:
-                existing = session.query(TeamRollingFeatures.game_id, TeamRollingFeatures.team_id).filter(
-                    TeamRollingFeatures.season == self.season
-                ).all()
-                existing_features = {(e.game_id, e.team_id) for e in existing}
-                print(f"  Found {len(existing_features)} existing feature records")
+                existing = pd.DataFrame(
+                    session.execute(
+                        select(TeamRollingFeatures.game_id, TeamRollingFeatures.team_id)
+                        .where(TeamRollingFeatures.season == self.season)
+                    ).all(),
+                    columns=['game_id', 'team_id']
+                )
+            existing_by_team = {
+                team_id: game_ids.to_numpy()
+                for team_id, game_ids in existing.groupby('team_id')['game_id']
+            }
+            print(f"  Found {len(existing)} existing feature records")
+        
+        # Slice each team's games and stats once; teams are independent, so
+        # they are computed concurrently (threads share the DB connection pool)
+        home_rows = games_df.groupby('home_team_id', observed=True).indices
+        away_rows = games_df.groupby('away_team_id', observed=True).indices
+        stats_rows = (
+            team_stats_df.groupby('team_id', observed=True).indices
+            if 'team_id' in team_stats_df.columns else {}
+        )
         
-        all_features = []
+        def team_inputs(team_id):
+            rows = np.union1d(home_rows.get(team_id, []), away_rows.get(team_id, [])).astype(np.intp)
+            stats = (
+                team_stats_df.iloc[stats_rows[team_id]]
+                if team_id in stats_rows else team_stats_df.iloc[:0]
+            )
+            return games_df.iloc[rows], stats
         
-        for team_id in tqdm(all_teams, desc="  Computing features"):
-            team_features = self._calculate_team_features(
-                team_id, games_df, team_stats_df, existing_features
+        results = Parallel(n_jobs=self.n_jobs, prefer="threads", return_as="generator")(
+            delayed(self._calculate_team_features)(
+                team_id, *team_inputs(team_id), existing_by_team.get(team_id, ())
             )
-            all_features.extend(team_features)
+            for team_id in all_teams
+        )
         
-        # Store features in database
-        if all_features:
-            self._store_features(all_features, full_refresh)
+        team_frames = []
+        for team_features in tqdm(
+            results, total=len(all_teams), desc="  Computing features", mininterval=0.5, disable=self.quiet
+        ):
+            if not team_features.empty:
+                team_frames.append(team_features)
+                self.stats['games_processed'] += len(team_features)
+        
+        if not team_frames:
+            return pd.DataFrame()
+        return pd.concat(team_frames, ignore_index=True)
     
     def _calculate_team_features(
         self,
         team_id: str,
         games_df: pd.DataFrame,
         team_stats_df: pd.DataFrame,
-        existing_features: set
-    ) -> List[Dict[str, Any]]:
-        """Calculate rolling features for a single team."""
-        features_list = []
+        existing_game_ids: Collection[str] = ()
+    ) -> pd.DataFrame:
+        """
+        Calculate rolling features for a single team.
         
+        Features are laid out column-wise: one array per feature, filled by
+        indexing the team's precomputed rolling windows for all games at once.
+        The games/stats frames may be pre-sliced to the team. Nothing on self is
+        mutated, so teams can be computed concurrently.
+        
+        Args:
+            team_id: Team to featurize
+            games_df: Season games (at least all of the team's)
+            team_stats_df: Season team stats (at least all of the team's)
+            existing_game_ids: Game ids the team already has features for (skipped)
+            
+        Returns:
+            DataFrame with one row per game that still needs features (NaN/None = missing)
+        """
         # Get all games for this team (as home or away)
         team_games = games_df[
             (games_df['home_team_id'] == team_id) | (games_df['away_team_id'] == team_id)
         ].sort_values('game_date').copy()
         
         if team_games.empty:
-            return []
+            return pd.DataFrame()
         
         # Get team stats (only for finished games)
         if team_stats_df.empty or 'team_id' not in team_stats_df.columns:
@@ -242,545 +493,1018 @@ class FeatureTransformer:
             team_game_stats = team_game_stats.sort_values('game_date')
             
             # Add opponent's score (points allowed)
-            team_game_stats['points_allowed'] = team_game_stats.apply(
-                lambda row: row['away_score'] if row['is_home'] else row['home_score'],
-                axis=1
+            is_home_arr = team_game_stats['is_home'].eq(True).to_numpy()
+            team_game_stats['points_allowed'] = np.where(
+                is_home_arr,
+                team_game_stats['away_score'].to_numpy(),
+                team_game_stats['home_score'].to_numpy()
             )
             
             # Add win indicator
-            team_game_stats['won'] = team_game_stats.apply(
-                lambda row: 1 if row['winner'] == team_id else 0,
-                axis=1
-            )
+            team_game_stats['won'] = (team_game_stats['winner'].to_numpy() == team_id).astype(np.int8)
         
-        # Process all games (including upcoming ones)
-        for idx, game_row in team_games.iterrows():
-            game_id = game_row['game_id']
-            
-            # Skip if already exists
-            if (game_id, team_id) in existing_features:
-                continue
+        # Finished-game history the rolling features are computed from
+        if not team_game_stats.empty:
+            history = team_game_stats
+        else:
+            # Fallback: Use Game records when TeamStats is not available
+            history = self._build_fallback_history(team_id, team_games)
+        history = history[history['game_date'].notna()]
+        
+        # Skip games that already have features
+        pending = team_games[~team_games['game_id'].isin(existing_game_ids)]
+        n_games = len(pending)
+        if n_games == 0:
+            return pd.DataFrame()
+        
+        # Rolling windows for every prefix of the history, computed once per team.
+        # A game's features are the entry for the number of games before it
+        # (no leakage!), so every game is featurized with one fancy index.
+        past_dates = history['game_date'].to_numpy()
+        rolling = self._precompute_rolling_windows(history) if not history.empty else {}
+        
+        game_dates = pending['game_date'].to_numpy()
+        game_days = game_dates.astype('datetime64[D]').astype(object)
+        n_past = np.searchsorted(past_dates, game_dates, side='left')
+        has_past = n_past > 0
+        last_idx = n_past[has_past] - 1
+        
+        out = {
+            'game_id': pending['game_id'].to_numpy(dtype=object),
+            'team_id': np.full(n_games, team_id, dtype=object),
+            'is_home': (pending['home_team_id'] == team_id).to_numpy(),
+            'game_date': game_days,
+            'season': np.full(n_games, self.season, dtype=object),
+        }
+        
+        for column in ROLLING_COLUMNS:
+            values = np.full(n_games, np.nan)
+            values[has_past] = rolling[column][last_idx] if rolling else np.nan
+            out[column] = values
+        
+        # Home/Away win percentages index by the number of past home (away) games
+        for venue in ('home', 'away'):
+            values = np.full(n_games, np.nan)
+            if rolling:
+                seen = rolling[f'{venue}_games_seen'][last_idx]
+                positions = np.flatnonzero(has_past)[seen > 0]
+                values[positions] = rolling[f'{venue}_win_pct'][seen[seen > 0] - 1]
+            out[f'{venue}_win_pct'] = values
+        
+        missing_l5 = int(np.count_nonzero(has_past & np.isnan(out['l5_points'])))
+        if missing_l5:
+            logger.warning(f"l5_points is None for {missing_l5} {team_id} games despite past games")
+        
+        for column in ADVANCED_METRIC_COLUMNS + STREAK_COLUMNS + SCHEDULE_COLUMNS + INJURY_COLUMNS:
+            out[column] = np.full(n_games, None, dtype=object)
+        out['won_game'] = np.full(n_games, None, dtype=object)
+        out['point_differential'] = np.full(n_games, None, dtype=object)
+        
+        # Advanced metrics and streaks for all games with history, one query each
+        past_positions = np.flatnonzero(has_past)
+        if len(past_positions):
+            try:
+                advanced = self._bulk_advanced_metrics(team_id, game_dates[past_positions])
+                for column in ADVANCED_METRIC_COLUMNS:
+                    out[column][past_positions] = advanced[column].to_numpy()
+            except Exception as e:
+                logger.debug(f"Error calculating advanced metrics for {team_id}: {e}")
             
-            game_date = game_row['game_date']
-            is_home = (game_row['home_team_id'] == team_id)
-            is_finished = (game_row['game_status'] == 'finished')
+            try:
+                streaks = self._bulk_streaks(team_id, game_dates[past_positions])
+                for column in STREAK_COLUMNS:
+                    out[column][past_positions] = streaks[column].to_numpy()
+            except Exception as e:
+                logger.debug(f"Error calculating streak for {team_id}: {e}")
+        
+        # Rest and schedule density from the team's past game dates
+        if len(past_positions):
+            current_dates = game_dates[past_positions]
+            past_counts = n_past[past_positions]
+            days_rest = (current_dates - past_dates[past_counts - 1]).astype('timedelta64[D]').astype(np.int64)
+            week_start = np.searchsorted(past_dates, current_dates - np.timedelta64(7, 'D'), side='left')
+            out['days_rest'][past_positions] = days_rest
+            out['is_back_to_back'][past_positions] = days_rest <= 1
+            out['games_in_last_7_days'][past_positions] = past_counts - week_start
+        
+        # Injury features, game by game
+        for i in range(n_games):
+            game_date = game_days[i]
             
-            # Get past games BEFORE this game (no leakage!)
-            # Use finished games with stats for rolling averages
-            if not team_game_stats.empty:
-                past_games = team_game_stats[team_game_stats['game_date'] < game_date]
+            if has_past[i]:
+                injury = self._compute_injury_features(team_id, game_date)
+                for column, value in injury.items():
+                    out[column][i] = value
             else:
-                # Fallback: Use Game records when TeamStats is not available
-                # Filter for finished games before this game date
-                past_games_df = team_games[
-                    (team_games['game_date'] < game_date) &
-                    (team_games['game_status'] == 'finished') &
-                    (team_games['home_score'].notna()) &
-                    (team_games['away_score'].notna())
-                ].copy()
-                
-                if not past_games_df.empty:
-                    # Build a DataFrame similar to team_game_stats structure
-                    past_games_list = []
-                    for _, row in past_games_df.iterrows():
-                        is_home_game = (row['home_team_id'] == team_id)
-                        points = row['home_score'] if is_home_game else row['away_score']
-                        points_allowed = row['away_score'] if is_home_game else row['home_score']
-                        won = 1 if row['winner'] == team_id else 0
-                        
-                        past_games_list.append({
-                            'game_id': row['game_id'],
-                            'game_date': row['game_date'],
-                            'is_home': is_home_game,
-                            'points': points,
-                            'points_allowed': points_allowed,
-                            'won': won,
-                            # For Game records, we don't have detailed stats, so set them to None
-                            'field_goal_percentage': None,
-                            'three_point_percentage': None,
-                            'free_throw_percentage': None,
-                            'rebounds_total': None,
-                            'assists': None,
-                            'turnovers': None,
-                            'steals': None,
-                            'blocks': None,
-                        })
-                    
-                    past_games = pd.DataFrame(past_games_list)
-                else:
-                    past_games = pd.DataFrame()
-            
-            if past_games.empty:
-                # First game of season - use minimal features
+                # First game of season - rolling features stay missing
                 logger.debug(f"No past games for {team_id} before {game_date}, using minimal features")
-                features = self._create_minimal_features(game_id, team_id, is_home, game_date)
-            else:
-                logger.debug(f"Computing rolling averages for {team_id} game {game_id} with {len(past_games)} past games")
-                features = self._compute_rolling_averages(
-                    game_id, team_id, is_home, game_date, past_games
+        
+        # Add target variables (only for finished games), looked up by game_id once
+        if not team_game_stats.empty:
+            game_stats = team_game_stats.drop_duplicates('game_id').set_index('game_id').reindex(out['game_id'])
+            won = game_stats['won'].to_numpy(dtype=np.float64)
+            point_diff = (
+                pd.to_numeric(game_stats['points'], errors='coerce') -
+                pd.to_numeric(game_stats['points_allowed'], errors='coerce')
+            ).to_numpy(dtype=np.float64)
+            
+            has_target = (pending['game_status'] == 'finished').to_numpy() & ~np.isnan(won)
+            has_diff = has_target & ~np.isnan(point_diff)
+            out['won_game'][has_target] = won[has_target] == 1
+            out['point_differential'][has_diff] = point_diff[has_diff].astype(np.int64)
+        
+        return pd.DataFrame(out)
+    
+    def _build_fallback_history(self, team_id: str, team_games: pd.DataFrame) -> pd.DataFrame:
+        """Build a team_game_stats-like history from Game records (scores only)."""
+        finished = team_games[
+            (team_games['game_status'] == 'finished') &
+            (team_games['home_score'].notna()) &
+            (team_games['away_score'].notna())
+        ]
+        
+        is_home_col = finished['home_team_id'].to_numpy() == team_id
+        home_scores = finished['home_score'].to_numpy()
+        away_scores = finished['away_score'].to_numpy()
+        missing = np.full(len(finished), np.nan)
+        
+        return pd.DataFrame({
+            'game_id': finished['game_id'].to_numpy(),
+            'game_date': finished['game_date'].to_numpy(),
+            'is_home': is_home_col,
+            'points': np.where(is_home_col, home_scores, away_scores),
+            'points_allowed': np.where(is_home_col, away_scores, home_scores),
+            'won': (finished['winner'].to_numpy() == team_id).astype(np.int8),
+            # For Game records, we don't have detailed stats, so leave them missing
+            'field_goal_percentage': missing,
+            'three_point_percentage': missing,
+            'free_throw_percentage': missing,
+            'rebounds_total': missing,
+            'assists': missing,
+            'turnovers': missing,
+            'steals': missing,
+            'blocks': missing,
+        })
+    
+    def _precompute_rolling_windows(self, history: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Precompute decay-weighted rolling stats for every prefix of a team's history.
+        
+        Entry m of each returned array is the value for a game whose most recent
+        past game is history row m (i.e. m + 1 games before it). Each window is a
+        convolution with the decay kernel, so a whole season costs one pass per
+        column instead of re-slicing the history for every game.
+        
+        Uses the same exponential decay as calculate_rolling_stats():
+        w_i = e^(-λ * games_ago_i), games_ago_i = 0 for the most recent game.
+        NaN values are skipped (their weight is dropped from the denominator).
+        
+        Args:
+            history: Past finished games for one team, sorted by date ascending
+            
+        Returns:
+            Dictionary mapping feature name to per-prefix values (NaN = missing)
+        """
+        n = len(history)
+        
+        def column(name: str) -> np.ndarray:
+            if name not in history.columns:
+                return np.full(n, np.nan)
+            return pd.to_numeric(history[name], errors='coerce').to_numpy(dtype=np.float64)
+        
+        def weighted_means(values: np.ndarray, window: int) -> np.ndarray:
+            """Decay-weighted mean of the last `window` values ending at each index."""
+            weights = self._get_decay_weights(window)
+            valid = ~np.isnan(values)
+            numerator = np.convolve(np.where(valid, values, 0.0), weights)[:len(values)]
+            denominator = np.convolve(valid.astype(np.float64), weights)[:len(values)]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(denominator > 0, numerator / denominator, np.nan)
+        
+        points = column('points')
+        points_allowed = column('points_allowed')
+        won = column('won')
+        
+        rolling = {}
+        for window_name, window in (('l5', 5), ('l10', 10), ('l20', 20)):
+            rolling[f'{window_name}_points'] = weighted_means(points, window)
+            rolling[f'{window_name}_points_allowed'] = weighted_means(points_allowed, window)
+            rolling[f'{window_name}_fg_pct'] = weighted_means(column('field_goal_percentage'), window)
+            rolling[f'{window_name}_three_pct'] = weighted_means(column('three_point_percentage'), window)
+            rolling[f'{window_name}_win_pct'] = weighted_means(won, window) * 100
+            
+            # Add extra stats for l5 and l10
+            if window_name in ('l5', 'l10'):
+                rolling[f'{window_name}_ft_pct'] = weighted_means(column('free_throw_percentage'), window)
+                rolling[f'{window_name}_rebounds'] = weighted_means(column('rebounds_total'), window)
+                rolling[f'{window_name}_assists'] = weighted_means(column('assists'), window)
+                rolling[f'{window_name}_turnovers'] = weighted_means(column('turnovers'), window)
+                rolling[f'{window_name}_steals'] = weighted_means(column('steals'), window)
+                rolling[f'{window_name}_blocks'] = weighted_means(column('blocks'), window)
+        
+        # Advanced metrics over the last 10 games
+        rolling['efg_pct'] = weighted_means(column('effective_field_goal_percentage'), 10)
+        rolling['ts_pct'] = weighted_means(column('true_shooting_percentage'), 10)
+        rolling['avg_point_differential'] = weighted_means(points - points_allowed, 10)
+        rolling['avg_points_for'] = rolling['l10_points']
+        rolling['avg_points_against'] = rolling['l10_points_allowed']
+        
+        # Home/Away win percentages over all past home (away) games. Entry k of
+        # these arrays is for k + 1 past home (away) games.
+        home_mask = (history['is_home'] == True).to_numpy()
+        away_mask = (history['is_home'] == False).to_numpy()
+        rolling['home_win_pct'] = weighted_means(won[home_mask], n) * 100
+        rolling['away_win_pct'] = weighted_means(won[away_mask], n) * 100
+        rolling['home_games_seen'] = np.cumsum(home_mask)
+        rolling['away_games_seen'] = np.cumsum(away_mask)
+        
+        return rolling
+    
+    def _get_decay_weights(self, window: int) -> np.ndarray:
+        """Decay weights for a window of `window` games, most recent first."""
+        if window <= len(self._decay_weights):
+            return self._decay_weights[:window]
+        return np.exp(-self.decay_rate * np.arange(window))
+    
+    def _bulk_advanced_metrics(
+        self,
+        team_id: str,
+        game_dates: np.ndarray,
+        games_back: int = 10
+    ) -> pd.DataFrame:
+        """
+        Compute TeamFeatureCalculator's advanced metrics for many games at once.
+        
+        The team's stat lines (all seasons, joined with the opponent's) are
+        fetched in one query. Each game's window is its last `games_back` stat
+        lines on or before the game date, summed newest first. Values
+        match calculate_offensive_rating(), calculate_pace(), etc. called with
+        the same games_back and end_date.
+        
+        Args:
+            team_id: Team identifier
+            game_dates: Game dates (datetime64), any order
+            games_back: Number of recent games per window
+            
+        Returns:
+            DataFrame aligned with game_dates, one column per metric (None = missing)
+        """
+        opponent = aliased(TeamStats)
+        end_date = game_dates.max().astype('datetime64[D]').item()
+        
+        with self.db_manager.get_session() as session:
+            rows = session.query(
+                Game.game_date,
+                TeamStats.points,
+                TeamStats.field_goals_attempted,
+                TeamStats.rebounds_offensive,
+                TeamStats.rebounds_defensive,
+                TeamStats.turnovers,
+                TeamStats.free_throws_attempted,
+                TeamStats.assists,
+                TeamStats.steals,
+                TeamStats.blocks,
+                opponent.points,
+                opponent.field_goals_attempted,
+                opponent.rebounds_offensive,
+                opponent.rebounds_defensive,
+                opponent.turnovers,
+                opponent.free_throws_attempted
+            ).join(
+                Game, TeamStats.game_id == Game.game_id
+            ).outerjoin(
+                opponent, and_(
+                    opponent.game_id == TeamStats.game_id,
+                    opponent.team_id == case(
+                        (TeamStats.is_home, Game.away_team_id), else_=Game.home_team_id
+                    )
                 )
-                # Debug: Check if features were calculated
-                if features.get('l5_points') is None and len(past_games) > 0:
-                    logger.warning(f"l5_points is None for {team_id} game {game_id} despite {len(past_games)} past games")
-            
-            # Add target variables (only for finished games)
-            if is_finished and not team_game_stats.empty:
-                game_stats = team_game_stats[team_game_stats['game_id'] == game_id]
-                if not game_stats.empty:
-                    stats_row = game_stats.iloc[0]
-                    features['won_game'] = bool(stats_row['won'])
-                    features['point_differential'] = int(stats_row['points'] - stats_row['points_allowed']) if pd.notna(stats_row['points']) else None
-                else:
-                    features['won_game'] = None
-                    features['point_differential'] = None
-            else:
-                # Upcoming game - no target variables
-                features['won_game'] = None
-                features['point_differential'] = None
+            ).filter(
+                TeamStats.team_id == team_id,
+                Game.game_date <= end_date
+            ).order_by(Game.game_date).all()
+        
+        stats = pd.DataFrame(rows, columns=[
+            'game_date', 'points', 'fga', 'orb', 'drb', 'tov', 'fta', 'ast', 'stl', 'blk',
+            'opp_points', 'opp_fga', 'opp_orb', 'opp_drb', 'opp_tov', 'opp_fta'
+        ])
+        
+        # Window of stat lines on or before each game (no leakage beyond end_date)
+        window_end = np.searchsorted(
+            stats['game_date'].to_numpy(dtype='datetime64[ns]'), game_dates, side='right'
+        )
+        window_start = np.maximum(window_end - games_back, 0)
+        n_games = window_end - window_start
+        enough = n_games >= 3  # Need at least 3 games for reliable metric
+        
+        def column(name: str) -> np.ndarray:
+            return stats[name].to_numpy(dtype=np.float64)
+        
+        def window_sum(values: np.ndarray) -> np.ndarray:
+            return _window_totals(values, window_start, window_end)
+        
+        def per_100(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(enough & (denominator != 0), numerator / denominator * 100, np.nan)
+        
+        # Possessions: FGA - ORB + TOV + (0.44 * FTA), non-negative
+        possessions = np.maximum(column('fga') - column('orb') + column('tov') + 0.44 * column('fta'), 0)
+        opp_possessions = np.maximum(
+            column('opp_fga') - column('opp_orb') + column('opp_tov') + 0.44 * column('opp_fta'), 0
+        )
+        
+        # Games without opponent stats only drop out of the opponent totals
+        has_opponent = stats['opp_points'].notna().to_numpy()
+        team_possessions = window_sum(possessions)
+        opp_points = window_sum(np.where(has_opponent, column('opp_points'), 0.0))
+        opp_possessions = window_sum(np.where(has_opponent, opp_possessions, 0.0))
+        team_orb = window_sum(column('orb'))
+        team_drb = window_sum(column('drb'))
+        opp_orb = window_sum(np.where(has_opponent, column('opp_orb'), 0.0))
+        opp_drb = window_sum(np.where(has_opponent, column('opp_drb'), 0.0))
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pace = np.where(enough, team_possessions / n_games, np.nan)
+        
+        metrics = {
+            'offensive_rating': per_100(window_sum(column('points')), team_possessions),
+            'defensive_rating': per_100(opp_points, opp_possessions),
+            'pace': pace,
+            'offensive_rebound_rate': per_100(team_orb, team_orb + opp_drb),
+            'defensive_rebound_rate': per_100(team_drb, team_drb + opp_orb),
+            'tov_pct': per_100(window_sum(column('tov')), team_possessions),
+            'assist_rate': per_100(window_sum(column('ast')), team_possessions),
+            'steal_rate': per_100(window_sum(column('stl')), team_possessions),
+            'block_rate': per_100(window_sum(column('blk')), team_possessions),
+        }
+        
+        # Round like TeamFeatureCalculator (Python round on each value)
+        result = {
+            name: [None if value != value else round(value, 2) for value in values.tolist()]
+            for name, values in metrics.items()
+        }
+        result['net_rating'] = [
+            None if off is None or dfn is None else round(off - dfn, 2)
+            for off, dfn in zip(result['offensive_rating'], result['defensive_rating'])
+        ]
+        return pd.DataFrame(result, dtype=object)
+    
+    def _bulk_streaks(self, team_id: str, game_dates: np.ndarray, limit: int = 20) -> pd.DataFrame:
+        """
+        Compute current win/loss streaks for many games at once.
+        
+        Matches calculate_current_streak(): games on or before each date are
+        walked back from the most recent one (at most `limit` games) until the
+        result changes or a game without a winner is reached.
+        
+        Args:
+            team_id: Team identifier
+            game_dates: Game dates (datetime64), any order
+            limit: Maximum streak length looked back over
             
-            features_list.append(features)
-            self.stats['games_processed'] += 1
+        Returns:
+            DataFrame aligned with game_dates with 'win_streak' and 'loss_streak'
+        """
+        end_date = game_dates.max().astype('datetime64[D]').item()
+        
+        with self.db_manager.get_session() as session:
+            rows = session.query(Game.game_date, Game.winner).filter(
+                or_(Game.home_team_id == team_id, Game.away_team_id == team_id),
+                Game.game_date <= end_date
+            ).order_by(Game.game_date).all()
+        
+        if not rows:
+            no_streak = [0] * len(game_dates)
+            return pd.DataFrame({'win_streak': no_streak, 'loss_streak': no_streak}, dtype=object)
+        
+        n = len(rows)
+        dates = np.array([row.game_date for row in rows], dtype='datetime64[ns]')
         
-        return features_list
+        # +1 win, -1 loss, 0 no result yet
+        outcome = np.array(
+            [0 if not row.winner else (1 if row.winner == team_id else -1) for row in rows],
+            dtype=np.int64
+        )
+        
+        # Length of the run of identical results ending at each game
+        changed = np.ones(n, dtype=bool)
+        changed[1:] = outcome[1:] != outcome[:-1]
+        run_starts = np.flatnonzero(changed)
+        run_length = np.arange(n) - run_starts[np.cumsum(changed) - 1] + 1
+        run_length[outcome == 0] = 0
+        
+        # Most recent game on or before each date
+        last = np.searchsorted(dates, game_dates, side='right') - 1
+        last_outcome = np.where(last >= 0, outcome[np.maximum(last, 0)], 0)
+        streak = np.minimum(run_length[np.maximum(last, 0)], limit)
+        
+        return pd.DataFrame({
+            'win_streak': np.where(last_outcome == 1, streak, 0).tolist(),
+            'loss_streak': np.where(last_outcome == -1, streak, 0).tolist(),
+        }, dtype=object)
     
-    def _create_minimal_features(self, game_id: str, team_id: str, is_home: bool, game_date) -> Dict[str, Any]:
-        """Create minimal features for first game of season."""
+    def _load_team_schedules(self, end_date: date) -> Dict[str, pd.DataFrame]:
+        """
+        Load every team's games on or before end_date (all seasons, any status).
+        
+        Args:
+            end_date: Last game date needed
+            
+        Returns:
+            Dictionary of team_id -> DataFrame sorted by game_date with
+            'game_date', 'opponent', 'won', 'lost', 'points_for' and 'points_against'
+        """
+        with self.db_manager.get_session() as session:
+            rows = session.query(
+                Game.game_date,
+                Game.home_team_id,
+                Game.away_team_id,
+                Game.home_score,
+                Game.away_score,
+                Game.winner
+            ).filter(Game.game_date <= end_date).order_by(Game.game_date).all()
+        
+        games = pd.DataFrame(rows, columns=[
+            'game_date', 'home_team_id', 'away_team_id', 'home_score', 'away_score', 'winner'
+        ])
+        games['game_date'] = pd.to_datetime(games['game_date']).astype('datetime64[ns]')
+        
+        # One row per team per game, from that team's side
+        sides = []
+        for team, opponent, points_for, points_against in (
+            ('home_team_id', 'away_team_id', 'home_score', 'away_score'),
+            ('away_team_id', 'home_team_id', 'away_score', 'home_score'),
+        ):
+            sides.append(pd.DataFrame({
+                'team_id': games[team],
+                'game_date': games['game_date'],
+                'opponent': games[opponent],
+                'won': (games['winner'] == games[team]).to_numpy(),
+                'lost': (games['winner'] == games[opponent]).to_numpy(),
+                'points_for': pd.to_numeric(games[points_for]).astype(np.float64),
+                'points_against': pd.to_numeric(games[points_against]).astype(np.float64),
+            }))
+        schedule = pd.concat(sides, ignore_index=True).sort_values(
+            ['team_id', 'game_date'], kind='mergesort'
+        )
+        
         return {
-            'game_id': game_id,
-            'team_id': team_id,
-            'is_home': is_home,
-            'game_date': game_date.date() if hasattr(game_date, 'date') else game_date,
-            'season': self.season,
-            # All rolling averages are None for first game
-            'l5_points': None, 'l5_points_allowed': None, 'l5_fg_pct': None,
-            'l5_three_pct': None, 'l5_ft_pct': None, 'l5_rebounds': None,
-            'l5_assists': None, 'l5_turnovers': None, 'l5_steals': None,
-            'l5_blocks': None, 'l5_win_pct': None,
-            'l10_points': None, 'l10_points_allowed': None, 'l10_fg_pct': None,
-            'l10_three_pct': None, 'l10_ft_pct': None, 'l10_rebounds': None,
-            'l10_assists': None, 'l10_turnovers': None, 'l10_steals': None,
-            'l10_blocks': None, 'l10_win_pct': None,
-            'l20_points': None, 'l20_points_allowed': None, 'l20_fg_pct': None,
-            'l20_three_pct': None, 'l20_win_pct': None,
-            'offensive_rating': None, 'defensive_rating': None, 'net_rating': None,
-            'pace': None, 'efg_pct': None, 'ts_pct': None, 'tov_pct': None,
-            'offensive_rebound_rate': None, 'defensive_rebound_rate': None,
-            'assist_rate': None, 'steal_rate': None, 'block_rate': None,
-            'avg_point_differential': None, 'avg_points_for': None, 'avg_points_against': None,
-            'win_streak': None, 'loss_streak': None,
-            'players_out': None, 'players_questionable': None, 'injury_severity_score': None,
-            'days_rest': None, 'is_back_to_back': None, 'games_in_last_7_days': None,
-            'home_win_pct': None, 'away_win_pct': None
+            team_id: team_games.reset_index(drop=True)
+            for team_id, team_games in schedule.groupby('team_id', sort=False)
         }
     
-    def _compute_rolling_averages(
+    def _bulk_head_to_head(
         self,
-        game_id: str,
-        team_id: str,
-        is_home: bool,
-        game_date,
-        past_games: pd.DataFrame
-    ) -> Dict[str, Any]:
+        games_df: pd.DataFrame,
+        schedules: Dict[str, pd.DataFrame],
+        games_back: int = 5,
+        lookback: int = 50
+    ) -> pd.DataFrame:
         """
-        Compute rolling averages from past games using exponential decay weighting.
+        Compute head-to-head features for many games at once.
         
-        This method is used to pre-compute features for the TeamRollingFeatures table.
-        It uses the same exponential decay logic as calculate_rolling_stats() to ensure
-        consistency between pre-computed and on-the-fly calculations.
+        Matches MatchupFeatureCalculator: meetings with the away team are taken
+        from the home team's last `lookback` games on or before the game date,
+        keeping the most recent `games_back`. Values are from the home team's
+        side, as get_head_to_head_record(), get_avg_point_differential_h2h()
+        and get_avg_score_h2h() return them for (home, away).
         
-        Weight formula: w_i = e^(-λ * games_ago_i)
-        Where games_ago_i = 0 for most recent game, 1 for previous, etc.
+        Args:
+            games_df: Games with 'game_date', 'home_team_id' and 'away_team_id'
+            schedules: Team schedules from _load_team_schedules()
+            games_back: Number of recent head-to-head games to consider
+            lookback: Number of the home team's recent games searched
+            
+        Returns:
+            DataFrame aligned with games_df rows, one column per feature (None = missing)
         """
-        # Sort by date descending (most recent first)
-        past_games = past_games.sort_values('game_date', ascending=False)
-        
-        # Get decay rate from settings
-        from config.settings import get_settings
-        settings = get_settings()
-        decay_rate = settings.ROLLING_STATS_DECAY_RATE
+        game_dates = games_df['game_date'].to_numpy(dtype='datetime64[ns]')
+        away_team_ids = games_df['away_team_id'].to_numpy(dtype=object)
+        features = [(0, 0, 0, None, None, None)] * len(games_df)
         
-        def safe_weighted_mean(series: pd.Series, weights: np.ndarray) -> Optional[float]:
-            """
-            Calculate weighted mean, handling None/NaN values.
+        for home_team_id, positions in games_df.groupby('home_team_id', observed=True).indices.items():
+            schedule = schedules.get(home_team_id)
+            if schedule is None:
+                continue
+            
+            dates = schedule['game_date'].to_numpy()
+            opponents = schedule['opponent'].to_numpy()
+            won = schedule['won'].to_numpy()
+            lost = schedule['lost'].to_numpy()
+            points_for = schedule['points_for'].to_numpy()
+            points_against = schedule['points_against'].to_numpy()
+            
+            # Scores of 0/None don't count, like `if not game.home_score`
+            scored = (np.nan_to_num(points_for) != 0) & (np.nan_to_num(points_against) != 0)
             
-            Args:
-                series: Pandas Series with values
-                weights: NumPy array with corresponding weights
+            window_ends = np.searchsorted(dates, game_dates[positions], side='right')
+            for position, window_end in zip(positions.tolist(), window_ends.tolist()):
+                window_start = max(window_end - lookback, 0)
+                meetings = np.flatnonzero(opponents[window_start:window_end] == away_team_ids[position])
+                meetings = (meetings + window_start)[-games_back:]
+                
+                # Meetings without a winner count for neither side
+                home_wins = int(won[meetings].sum())
+                away_wins = int(lost[meetings].sum())
+                
+                scored_meetings = meetings[scored[meetings]]
+                home_points = points_for[scored_meetings].tolist()
+                away_points = points_against[scored_meetings].tolist()
                 
-            Returns:
-                Weighted mean or None if no valid values
-            """
-            if series.empty or series.isna().all():
-                return None
+                if home_points:
+                    avg_differential = round((sum(home_points) - sum(away_points)) / len(home_points), 2)
+                    home_avg_score = round(sum(home_points) / len(home_points), 2)
+                    away_avg_score = round(sum(away_points) / len(away_points), 2)
+                else:
+                    avg_differential = home_avg_score = away_avg_score = None
+                
+                features[position] = (
+                    home_wins, away_wins, len(meetings),
+                    avg_differential, home_avg_score, away_avg_score
+                )
+        
+        return pd.DataFrame(features, columns=HEAD_TO_HEAD_COLUMNS, dtype=object)
+    
+    def _bulk_style_and_form(
+        self,
+        games_df: pd.DataFrame,
+        schedules: Dict[str, pd.DataFrame],
+        games_back: int = 10
+    ) -> pd.DataFrame:
+        """
+        Compute style matchup and recent form features for many games at once.
+        
+        Every team's stat lines (all seasons) are fetched in one query. Each
+        team's window is its last `games_back` stat lines (or games, for win
+        percentage) on or before the game date. Values match
+        calculate_style_matchup() and get_recent_form_comparison() called for
+        (home, away) with the same games_back and end_date.
+        
+        Args:
+            games_df: Games with 'game_date', 'home_team_id' and 'away_team_id'
+            schedules: Team schedules from _load_team_schedules()
+            games_back: Number of recent games per window
             
-            # Filter out NaN values
-            valid_mask = ~series.isna()
-            if not valid_mask.any():
-                return None
+        Returns:
+            DataFrame aligned with games_df rows, one column per feature (None = missing)
+        """
+        game_dates = games_df['game_date'].to_numpy(dtype='datetime64[ns]')
+        end_date = game_dates.max().astype('datetime64[D]').item()
+        
+        with self.db_manager.get_session() as session:
+            rows = session.query(
+                TeamStats.team_id,
+                Game.game_date,
+                TeamStats.points,
+                TeamStats.field_goals_made,
+                TeamStats.field_goals_attempted,
+                TeamStats.three_pointers_made,
+                TeamStats.free_throws_attempted,
+                TeamStats.rebounds_offensive,
+                TeamStats.turnovers
+            ).join(
+                Game, TeamStats.game_id == Game.game_id
+            ).filter(Game.game_date <= end_date).order_by(Game.game_date).all()
+        
+        stats = pd.DataFrame(rows, columns=[
+            'team_id', 'game_date', 'points', 'fgm', 'fga', 'fg3m', 'fta', 'orb', 'tov'
+        ])
+        stats_by_team = stats.groupby('team_id', sort=False).indices
+        stat_dates = pd.to_datetime(stats['game_date']).to_numpy(dtype='datetime64[ns]')
+        
+        def column(name: str) -> np.ndarray:
+            return stats[name].to_numpy(dtype=np.float64)
+        
+        # Possessions: FGA - ORB + TOV + (0.44 * FTA), non-negative
+        possessions = np.maximum(column('fga') - column('orb') + column('tov') + 0.44 * column('fta'), 0)
+        shot_attempts = column('fga') + 0.44 * column('fta')
+        
+        def window_sums(
+            values: List[np.ndarray],
+            dates: np.ndarray,
+            targets: np.ndarray
+        ) -> Tuple[np.ndarray, List[np.ndarray]]:
+            window_end = np.searchsorted(dates, targets, side='right')
+            window_start = np.maximum(window_end - games_back, 0)
+            return window_end - window_start, [_window_totals(value, window_start, window_end) for value in values]
+        
+        sides = {}
+        for side in ('home_team_id', 'away_team_id'):
+            metrics = {name: np.full(len(games_df), np.nan) for name in ('pace', 'ts', 'efg', 'win_pct')}
             
-            valid_series = series[valid_mask]
-            valid_weights = weights[valid_mask.values]
+            for team_id, positions in games_df.groupby(side, observed=True).indices.items():
+                targets = game_dates[positions]
+                
+                team_rows = stats_by_team.get(team_id)
+                if team_rows is not None:
+                    n_games, (total_possessions, points, attempts, fgm, fg3m, fga) = window_sums(
+                        [possessions[team_rows], column('points')[team_rows], shot_attempts[team_rows],
+                         column('fgm')[team_rows], column('fg3m')[team_rows], column('fga')[team_rows]],
+                        stat_dates[team_rows], targets
+                    )
+                    enough = n_games >= 3  # Need at least 3 games for reliable metric
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        metrics['pace'][positions] = np.where(enough, total_possessions / n_games, np.nan)
+                        metrics['ts'][positions] = np.where(
+                            enough & (attempts != 0), (points / (2 * attempts)) * 100, np.nan
+                        )
+                        metrics['efg'][positions] = np.where(
+                            enough & (fga != 0), ((fgm + 0.5 * fg3m) / fga) * 100, np.nan
+                        )
+                
+                schedule = schedules.get(team_id)
+                if schedule is not None:
+                    n_games, (wins,) = window_sums(
+                        [schedule['won'].to_numpy(dtype=np.float64)],
+                        schedule['game_date'].to_numpy(), targets
+                    )
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        metrics['win_pct'][positions] = np.where(n_games >= 3, (wins / n_games) * 100, np.nan)
             
-            if valid_weights.sum() == 0:
-                return None
+            # Round like TeamFeatureCalculator (Python round on each value)
+            sides[side] = {
+                name: [None if value != value else round(value, 2) for value in values.tolist()]
+                for name, values in metrics.items()
+            }
+        
+        def differential(name: str) -> List[Optional[float]]:
+            return [
+                round(home - away, 2) if (home and away) else None
+                for home, away in zip(sides['home_team_id'][name], sides['away_team_id'][name])
+            ]
+        
+        return pd.DataFrame({
+            'pace_differential': differential('pace'),
+            'ts_differential': differential('ts'),
+            'efg_differential': differential('efg'),
+            'home_win_pct_recent': sides['home_team_id']['win_pct'],
+            'away_win_pct_recent': sides['away_team_id']['win_pct'],
+            'win_pct_differential': differential('win_pct'),
+        }, dtype=object)
+    
+    def _bulk_rest_days(self, games_df: pd.DataFrame, schedules: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Compute rest, back-to-back and days-until-next features for many games at once.
+        
+        Matches ContextualFeatureCalculator for each side: rest days count from
+        the team's last game before the game date. Days until next uses the
+        game get_days_until_next_game() receives from get_games(), which sorts
+        newest first, i.e. the team's latest game after the game date.
+        
+        Args:
+            games_df: Games with 'game_date', 'home_team_id' and 'away_team_id'
+            schedules: Team schedules from _load_team_schedules()
             
-            return (valid_series * valid_weights).sum() / valid_weights.sum()
+        Returns:
+            DataFrame aligned with games_df rows, one column per feature (None = missing)
+        """
+        game_dates = games_df['game_date'].to_numpy(dtype='datetime64[ns]')
+        one_day = np.timedelta64(1, 'D')
+        
+        # Latest game date per team over the whole table (future seasons included)
+        latest_dates = {}
+        with self.db_manager.get_session() as session:
+            for team_column in (Game.home_team_id, Game.away_team_id):
+                for team_id, latest_date in session.execute(
+                    select(team_column, func.max(Game.game_date)).group_by(team_column)
+                ):
+                    latest_date = np.datetime64(latest_date, 'ns')
+                    latest_dates[team_id] = max(latest_dates.get(team_id, latest_date), latest_date)
         
-        def compute_weighted_stats(df: pd.DataFrame, window_name: str) -> Dict[str, Optional[float]]:
-            """
-            Compute weighted statistics for a rolling window.
+        sides = {}
+        for side in ('home_team_id', 'away_team_id'):
+            rest_days = np.full(len(games_df), np.nan)
+            days_until_next = np.full(len(games_df), np.nan)
             
-            Args:
-                df: DataFrame with past games (already sorted, most recent first)
-                window_name: Prefix for feature names (e.g., 'l5', 'l10', 'l20')
+            for team_id, positions in games_df.groupby(side, observed=True).indices.items():
+                targets = game_dates[positions]
                 
-            Returns:
-                Dictionary with weighted statistics
-            """
-            if df.empty:
-                stats = {
-                    f'{window_name}_points': None,
-                    f'{window_name}_points_allowed': None,
-                    f'{window_name}_fg_pct': None,
-                    f'{window_name}_three_pct': None,
-                    f'{window_name}_win_pct': None,
-                }
-                # Add extra stats for l5 and l10
-                if window_name in ('l5', 'l10'):
-                    stats.update({
-                        f'{window_name}_ft_pct': None,
-                        f'{window_name}_rebounds': None,
-                        f'{window_name}_assists': None,
-                        f'{window_name}_turnovers': None,
-                        f'{window_name}_steals': None,
-                        f'{window_name}_blocks': None,
-                    })
-                return stats
-            
-            # Calculate weights: most recent game (index 0) has weight 1.0
-            num_games = len(df)
-            weights = np.array([np.exp(-decay_rate * i) for i in range(num_games)])
-            
-            stats = {}
-            
-            # Simple weighted averages for count-based stats
-            stats[f'{window_name}_points'] = safe_weighted_mean(df['points'], weights)
-            stats[f'{window_name}_points_allowed'] = safe_weighted_mean(df['points_allowed'], weights)
-            stats[f'{window_name}_win_pct'] = (
-                safe_weighted_mean(df['won'], weights) * 100 
-                if 'won' in df.columns and not df['won'].isna().all() else None
-            )
-            
-            # For percentages, we can use the pre-calculated percentages with weighting
-            # Or use weighted totals - using pre-calculated for simplicity here
-            stats[f'{window_name}_fg_pct'] = safe_weighted_mean(df['field_goal_percentage'], weights)
-            stats[f'{window_name}_three_pct'] = safe_weighted_mean(df['three_point_percentage'], weights)
+                schedule = schedules.get(team_id)
+                if schedule is not None:
+                    dates = schedule['game_date'].to_numpy()
+                    previous = np.searchsorted(dates, targets, side='left') - 1
+                    rest_days[positions] = np.where(
+                        previous >= 0, (targets - dates[np.maximum(previous, 0)]) / one_day, np.nan
+                    )
+                
+                latest_date = latest_dates.get(team_id)
+                if latest_date is not None:
+                    days_until_next[positions] = np.where(
+                        latest_date > targets, (latest_date - targets) / one_day, np.nan
+                    )
             
-            # Add extra stats for l5 and l10
-            if window_name in ('l5', 'l10'):
-                stats[f'{window_name}_ft_pct'] = safe_weighted_mean(df['free_throw_percentage'], weights)
-                stats[f'{window_name}_rebounds'] = safe_weighted_mean(df['rebounds_total'], weights)
-                stats[f'{window_name}_assists'] = safe_weighted_mean(df['assists'], weights)
-                stats[f'{window_name}_turnovers'] = safe_weighted_mean(df['turnovers'], weights)
-                stats[f'{window_name}_steals'] = safe_weighted_mean(df['steals'], weights)
-                stats[f'{window_name}_blocks'] = safe_weighted_mean(df['blocks'], weights)
-            
-            return stats
-        
-        # Get last N games
-        l5 = past_games.head(5)
-        l10 = past_games.head(10)
-        l20 = past_games.head(20)
-        
-        # Compute weighted statistics for each window
-        l5_stats = compute_weighted_stats(l5, 'l5')
-        l10_stats = compute_weighted_stats(l10, 'l10')
-        l20_stats = compute_weighted_stats(l20, 'l20')
-        
-        # Calculate weights for advanced metrics (using l10)
-        l10_weights = np.array([np.exp(-decay_rate * i) for i in range(len(l10))]) if not l10.empty else np.array([])
-        
-        # Build features dictionary
-        features = {
-            'game_id': game_id,
-            'team_id': team_id,
-            'is_home': is_home,
-            'game_date': game_date.date() if hasattr(game_date, 'date') else game_date,
-            'season': self.season,
-            
-            # Last 5 games (weighted)
-            **l5_stats,
-            
-            # Last 10 games (weighted)
-            **l10_stats,
-            
-            # Last 20 games (weighted)
-            **l20_stats,
-            
-            # Advanced metrics (calculated using TeamFeatureCalculator)
-            'offensive_rating': None,
-            'defensive_rating': None,
-            'net_rating': None,
-            'pace': None,
-            'efg_pct': safe_weighted_mean(l10['effective_field_goal_percentage'], l10_weights) if not l10.empty and 'effective_field_goal_percentage' in l10.columns else None,
-            'ts_pct': safe_weighted_mean(l10['true_shooting_percentage'], l10_weights) if not l10.empty and 'true_shooting_percentage' in l10.columns else None,
-            'tov_pct': None,
-            'offensive_rebound_rate': None,
-            'defensive_rebound_rate': None,
-            'assist_rate': None,
-            'steal_rate': None,
-            'block_rate': None,
-            'avg_point_differential': safe_weighted_mean(l10['points'] - l10['points_allowed'], l10_weights) if not l10.empty else None,
-            'avg_points_for': safe_weighted_mean(l10['points'], l10_weights) if not l10.empty else None,
-            'avg_points_against': safe_weighted_mean(l10['points_allowed'], l10_weights) if not l10.empty else None,
-            'win_streak': None,
-            'loss_streak': None,
-            'players_out': None,
-            'players_questionable': None,
-            'injury_severity_score': None,
-        }
+            sides[side] = (
+                [None if value != value else int(value) for value in rest_days.tolist()],
+                [None if value != value else int(value) for value in days_until_next.tolist()],
+            )
         
-        # Calculate advanced metrics using TeamFeatureCalculator
-        try:
-            game_date_obj = game_date.date() if hasattr(game_date, 'date') else game_date
-            features['offensive_rating'] = self.team_calc.calculate_offensive_rating(team_id, 10, game_date_obj)
-            features['defensive_rating'] = self.team_calc.calculate_defensive_rating(team_id, 10, game_date_obj)
-            features['net_rating'] = self.team_calc.calculate_net_rating(team_id, 10, game_date_obj)
-            features['pace'] = self.team_calc.calculate_pace(team_id, 10, game_date_obj)
-            features['offensive_rebound_rate'] = self.team_calc.calculate_rebound_rate(team_id, 10, True, game_date_obj)
-            features['defensive_rebound_rate'] = self.team_calc.calculate_rebound_rate(team_id, 10, False, game_date_obj)
-            features['tov_pct'] = self.team_calc.calculate_turnover_rate(team_id, 10, game_date_obj)
-            features['assist_rate'] = self.team_calc.calculate_assist_rate(team_id, 10, game_date_obj)
-            features['steal_rate'] = self.team_calc.calculate_steal_rate(team_id, 10, game_date_obj)
-            features['block_rate'] = self.team_calc.calculate_block_rate(team_id, 10, game_date_obj)
-        except Exception as e:
-            logger.debug(f"Error calculating advanced metrics for {team_id}: {e}")
+        home_rest, home_days_next = sides['home_team_id']
+        away_rest, away_days_next = sides['away_team_id']
         
-        # Calculate streaks
-        try:
-            game_date_obj = game_date.date() if hasattr(game_date, 'date') else game_date
-            streak = self.team_calc.calculate_current_streak(team_id, game_date_obj)
-            features['win_streak'] = streak.get('win_streak', 0)
-            features['loss_streak'] = streak.get('loss_streak', 0)
-        except Exception as e:
-            logger.debug(f"Error calculating streak for {team_id}: {e}")
+        return pd.DataFrame({
+            'home_rest_days': home_rest,
+            'away_rest_days': away_rest,
+            'rest_days_differential': [
+                (home - away) if (home is not None and away is not None) else None
+                for home, away in zip(home_rest, away_rest)
+            ],
+            # A previous game is always at least a day back, so this mirrors
+            # is_back_to_back() exactly (rest_days == 0)
+            'home_is_b2b': [rest == 0 if rest is not None else False for rest in home_rest],
+            'away_is_b2b': [rest == 0 if rest is not None else False for rest in away_rest],
+            'home_days_until_next': home_days_next,
+            'away_days_until_next': away_days_next,
+        }, dtype=object)
+    
+    def _compute_injury_features(self, team_id: str, game_date: date) -> Dict[str, Any]:
+        """
+        Compute injury features for one game using TeamFeatureCalculator.
+        
+        Args:
+            team_id: Team being featurized
+            game_date: Date of the game
+            
+        Returns:
+            Dictionary of injury feature values (None = missing)
+        """
+        features = dict.fromkeys(INJURY_COLUMNS)
         
-        # Calculate injury features
         try:
-            game_date_obj = game_date.date() if hasattr(game_date, 'date') else game_date
-            injury = self.team_calc.calculate_injury_impact(team_id, game_date_obj)
+            injury = self.team_calc.calculate_injury_impact(team_id, game_date)
             features['players_out'] = injury.get('players_out')
             features['players_questionable'] = injury.get('players_questionable')
             features['injury_severity_score'] = injury.get('injury_severity_score')
         except Exception as e:
             logger.debug(f"Error calculating injury features for {team_id}: {e}")
         
-        # Calculate contextual features
-        if len(past_games) > 0:
-            last_game_date = past_games.iloc[0]['game_date']
-            if hasattr(last_game_date, 'date'):
-                last_game_date = last_game_date
-            game_date_cmp = game_date if hasattr(game_date, 'days') else pd.Timestamp(game_date)
-            
-            days_rest = (game_date_cmp - last_game_date).days
-            features['days_rest'] = int(days_rest)
-            features['is_back_to_back'] = days_rest <= 1
-            
-            # Games in last 7 days
-            week_ago = game_date_cmp - pd.Timedelta(days=7)
-            games_last_week = past_games[past_games['game_date'] >= week_ago]
-            features['games_in_last_7_days'] = len(games_last_week)
-        else:
-            features['days_rest'] = None
-            features['is_back_to_back'] = None
-            features['games_in_last_7_days'] = None
-        
-        # Home/Away win percentages (using weighted mean)
-        home_games = past_games[past_games['is_home'] == True]
-        away_games = past_games[past_games['is_home'] == False]
-        home_weights = np.array([np.exp(-decay_rate * i) for i in range(len(home_games))]) if not home_games.empty else np.array([])
-        away_weights = np.array([np.exp(-decay_rate * i) for i in range(len(away_games))]) if not away_games.empty else np.array([])
-        features['home_win_pct'] = safe_weighted_mean(home_games['won'], home_weights) * 100 if not home_games.empty else None
-        features['away_win_pct'] = safe_weighted_mean(away_games['won'], away_weights) * 100 if not away_games.empty else None
-        
         return features
     
-    def _store_features(self, features_list: List[Dict[str, Any]], full_refresh: bool):
-        """Store features in database."""
-        print(f"\n[STEP 3] Storing {len(features_list)} feature records...")
+    @contextmanager
+    def _bulk_write_session(self):
+        """
+        Session for bulk-loading the derived feature tables.
         
-        with self.db_manager.get_session() as session:
-            batch_count = 0
+        On SQLite the session is pinned to one connection that runs with
+        synchronous=OFF (in-memory temp store, larger page cache) until the
+        load is done, so batch commits don't wait on fsync. The feature
+        tables can always be rebuilt from games/team_stats. The connection's
+        previous settings are restored before it goes back to the pool; the
+        journal mode is left alone since SQLite persists it in the database
+        file. Other backends get a regular session.
+        """
+        if self.db_manager.engine.dialect.name != 'sqlite':
+            with self.db_manager.get_session() as session:
+                yield session
+            return
+        
+        with self.db_manager.engine.connect() as connection:
+            pragmas = ('synchronous', 'temp_store', 'cache_size')
+            previous = {
+                name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in pragmas
+            }
+            connection.exec_driver_sql("PRAGMA synchronous=OFF")
+            connection.exec_driver_sql("PRAGMA temp_store=MEMORY")
+            connection.exec_driver_sql("PRAGMA cache_size=-200000")
+            connection.commit()
             
-            for features in tqdm(features_list, desc="  Saving features"):
+            session = self.db_manager.SessionLocal(bind=connection)
+            try:
+                yield session
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Database session error: {e}")
+                raise
+            finally:
+                session.close()
+                for name, value in previous.items():
+                    connection.exec_driver_sql(f"PRAGMA {name}={value}")
+                connection.commit()
+    
+    def _store_features(self, features_df: pd.DataFrame, full_refresh: bool):
+        """
+        Store features in database with batched upserts.
+        
+        Rows conflicting on (game_id, team_id) are updated when full_refresh is set
+        and left untouched otherwise.
+        """
+        print(f"\n[STEP 4] Storing {len(features_df)} feature records...")
+        
+        # Convert the columns to plain Python rows once, with NaN as NULL
+        columns = list(features_df.columns)
+        column_values = []
+        for column in columns:
+            values = features_df[column].tolist()
+            missing = features_df[column].isna().to_numpy()
+            if missing.any():
+                values = [None if is_missing else value for value, is_missing in zip(values, missing.tolist())]
+            column_values.append(values)
+        rows = [dict(zip(columns, values)) for values in zip(*column_values)]
+        
+        with self._bulk_write_session() as session:
+            # One query to tell creates from updates for the summary
+            existing_keys = {
+                (e.game_id, e.team_id) for e in session.query(
+                    TeamRollingFeatures.game_id, TeamRollingFeatures.team_id
+                ).filter(TeamRollingFeatures.season == self.season)
+            }
+            
+            if session.get_bind().dialect.name == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            
+            stmt = dialect_insert(TeamRollingFeatures)
+            if full_refresh:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['game_id', 'team_id'],
+                    set_={
+                        **{c: stmt.excluded[c] for c in columns if c not in ('game_id', 'team_id')},
+                        'updated_at': func.now(),
+                    }
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=['game_id', 'team_id'])
+            
+            batch_size = 500
+            for start in tqdm(
+                range(0, len(rows), batch_size), desc="  Saving features", mininterval=0.5, disable=self.quiet
+            ):
+                chunk = rows[start:start + batch_size]
                 try:
-                    # Check if exists
-                    existing = session.query(TeamRollingFeatures).filter_by(
-                        game_id=features['game_id'],
-                        team_id=features['team_id']
-                    ).first()
-                    
-                    if existing:
-                        if full_refresh:
-                            for key, value in features.items():
-                                if key not in ('game_id', 'team_id'):
-                                    setattr(existing, key, value)
-                            self.stats['features_updated'] += 1
-                    else:
-                        new_feature = TeamRollingFeatures(**features)
-                        session.add(new_feature)
-                        self.stats['features_created'] += 1
-                    
-                    batch_count += 1
-                    if batch_count >= 100:
-                        session.commit()
-                        batch_count = 0
-                        
+                    session.execute(stmt, chunk)
+                    session.commit()
                 except Exception as e:
-                    logger.debug(f"Error storing features: {e}")
+                    session.rollback()
+                    logger.error(f"Error storing features batch: {e}")
                     self.stats['errors'] += 1
-            
-            session.commit()
+                    continue
+                
+                for row in chunk:
+                    if (row['game_id'], row['team_id']) not in existing_keys:
+                        self.stats['features_created'] += 1
+                    elif full_refresh:
+                        self.stats['features_updated'] += 1
         
         print(f"  [OK] Created {self.stats['features_created']}, Updated {self.stats['features_updated']}")
     
-    def _calculate_matchup_features(self, games_df: pd.DataFrame, full_refresh: bool):
+    def _calculate_matchup_features(self, games_df: pd.DataFrame, full_refresh: bool) -> List[Dict[str, Any]]:
         """Calculate matchup features for each game."""
-        print("\n[STEP 4] Calculating matchup features...")
+        print("\n[STEP 3] Calculating matchup features...")
         
         if games_df.empty:
             print("  No games to process")
-            return
+            return []
         
         # Get existing matchup features to skip if not full refresh
         existing_matchups = set()
         if not full_refresh:
             with self.db_manager.get_session() as session:
-                existing = session.query(GameMatchupFeatures.game_id).filter(
-                    GameMatchupFeatures.season == self.season
-                ).all()
-                existing_matchups = {e.game_id for e in existing}
+                existing_matchups = set(session.execute(
+                    select(GameMatchupFeatures.game_id).where(GameMatchupFeatures.season == self.season)
+                ).scalars())
                 print(f"  Found {len(existing_matchups)} existing matchup feature records")
         
+        # Drop games that already have features before any per-game work
+        if existing_matchups:
+            games_df = games_df[~games_df['game_id'].isin(existing_matchups)].reset_index(drop=True)
+            if games_df.empty:
+                print("  No new games to process")
+                return []
+        
         matchup_features_list = []
         
-        for idx, game_row in tqdm(games_df.iterrows(), total=len(games_df), desc="  Computing matchup features"):
-            game_id = game_row['game_id']
-            
-            # Skip if already exists
-            if game_id in existing_matchups:
-                continue
-            
-            game_date = game_row['game_date']
-            home_team_id = game_row['home_team_id']
-            away_team_id = game_row['away_team_id']
-            game_date_obj = game_date.date() if hasattr(game_date, 'date') else game_date
+        # Head-to-head, style, form and rest features for all games from a few queries
+        history_columns = HEAD_TO_HEAD_COLUMNS + STYLE_FORM_COLUMNS + REST_COLUMNS
+        try:
+            schedules = self._load_team_schedules(games_df['game_date'].max().date())
+            history = pd.concat([
+                self._bulk_head_to_head(games_df, schedules, games_back=5),
+                self._bulk_style_and_form(games_df, schedules, games_back=10),
+                self._bulk_rest_days(games_df, schedules),
+            ], axis=1)
+        except Exception as e:
+            logger.error(f"Error calculating matchup history features: {e}")
+            self.stats['errors'] += 1
+            history = pd.DataFrame([[None] * len(history_columns)] * len(games_df), columns=history_columns)
+        
+        # Conference/division for every team (~30) and the season's game types
+        with self.db_manager.get_session() as session:
+            team_groups = {
+                team_id: (conference, division)
+                for team_id, conference, division in session.execute(
+                    select(Team.team_id, Team.conference, Team.division)
+                )
+            }
+            season_types = dict(session.execute(
+                select(Game.game_id, Game.season_type).where(Game.season == self.season)
+            ).all())
+        
+        # One plain list per column; the loop reads them by position
+        game_ids = games_df['game_id'].tolist()
+        home_team_ids = games_df['home_team_id'].tolist()
+        away_team_ids = games_df['away_team_id'].tolist()
+        # The whole date column becomes datetime.date at once (datetime64[D] -> date)
+        game_days = games_df['game_date'].to_numpy(dtype='datetime64[D]').tolist()
+        history_rows = history[history_columns].to_numpy(dtype=object).tolist()
+        
+        # Every row has the same keys in this order
+        columns = (
+            ['game_id', 'game_date', 'season', 'home_team_id', 'away_team_id']
+            + history_columns
+            + ['same_conference', 'same_division', 'is_playoffs', 'is_home_advantage']
+        )
+        
+        for i in tqdm(
+            range(len(game_ids)), desc="  Computing matchup features",
+            mininterval=0.5, miniters=50, disable=self.quiet
+        ):
+            game_id = game_ids[i]
+            home_team_id = home_team_ids[i]
+            away_team_id = away_team_ids[i]
             
             try:
-                matchup_features = {
-                    'game_id': game_id,
-                    'game_date': game_date_obj,
-                    'season': self.season,
-                    'home_team_id': home_team_id,
-                    'away_team_id': away_team_id,
-                }
-                
-                # Head-to-head features
-                h2h = self.matchup_calc.get_head_to_head_record(home_team_id, away_team_id, 5, game_date_obj)
-                matchup_features['h2h_home_wins'] = h2h.get('team1_wins', 0)
-                matchup_features['h2h_away_wins'] = h2h.get('team2_wins', 0)
-                matchup_features['h2h_total_games'] = h2h.get('total_games', 0)
-                matchup_features['h2h_avg_point_differential'] = self.matchup_calc.get_avg_point_differential_h2h(
-                    home_team_id, away_team_id, 5, game_date_obj
-                )
-                
-                h2h_scores = self.matchup_calc.get_avg_score_h2h(home_team_id, away_team_id, 5, game_date_obj)
-                matchup_features['h2h_home_avg_score'] = h2h_scores.get('team1_avg_score')
-                matchup_features['h2h_away_avg_score'] = h2h_scores.get('team2_avg_score')
-                
-                # Style matchup
-                style = self.matchup_calc.calculate_style_matchup(home_team_id, away_team_id, 10, game_date_obj)
-                matchup_features['pace_differential'] = style.get('pace_differential')
-                matchup_features['ts_differential'] = style.get('ts_differential')
-                matchup_features['efg_differential'] = style.get('efg_differential')
-                
-                # Recent form comparison
-                form = self.matchup_calc.get_recent_form_comparison(home_team_id, away_team_id, 10, game_date_obj)
-                matchup_features['home_win_pct_recent'] = form.get('team1_win_pct')
-                matchup_features['away_win_pct_recent'] = form.get('team2_win_pct')
-                matchup_features['win_pct_differential'] = form.get('win_pct_differential')
-                
                 # Contextual features
-                same_conf = self.contextual_calc.get_conference_matchup(home_team_id, away_team_id)
-                matchup_features['same_conference'] = same_conf if same_conf is not None else None
-                
-                same_div = self.contextual_calc.get_division_matchup(home_team_id, away_team_id)
-                matchup_features['same_division'] = same_div if same_div is not None else None
-                
-                season_type = self.contextual_calc.get_season_type(game_id)
-                matchup_features['is_playoffs'] = (season_type == 'Playoffs')
-                matchup_features['is_home_advantage'] = 1
-                
-                # Rest days
-                home_rest = self.contextual_calc.calculate_rest_days(home_team_id, game_date_obj)
-                away_rest = self.contextual_calc.calculate_rest_days(away_team_id, game_date_obj)
-                matchup_features['home_rest_days'] = home_rest if home_rest is not None else None
-                matchup_features['away_rest_days'] = away_rest if away_rest is not None else None
-                matchup_features['rest_days_differential'] = (
-                    (home_rest - away_rest) if (home_rest is not None and away_rest is not None) else None
+                home_conference, home_division = team_groups.get(home_team_id, (None, None))
+                away_conference, away_division = team_groups.get(away_team_id, (None, None))
+                same_conference = (
+                    (home_conference == away_conference) if (home_conference and away_conference) else None
+                )
+                same_division = (
+                    (home_division == away_division) if (home_division and away_division) else None
                 )
                 
-                # Back-to-back
-                home_b2b = self.contextual_calc.is_back_to_back(home_team_id, game_date_obj)
-                away_b2b = self.contextual_calc.is_back_to_back(away_team_id, game_date_obj)
-                matchup_features['home_is_b2b'] = home_b2b if home_b2b is not None else None
-                matchup_features['away_is_b2b'] = away_b2b if away_b2b is not None else None
-                
-                # Days until next game
-                home_days_next = self.contextual_calc.get_days_until_next_game(home_team_id, game_date_obj)
-                away_days_next = self.contextual_calc.get_days_until_next_game(away_team_id, game_date_obj)
-                matchup_features['home_days_until_next'] = home_days_next if home_days_next is not None else None
-                matchup_features['away_days_until_next'] = away_days_next if away_days_next is not None else None
-                
-                matchup_features_list.append(matchup_features)
+                # Build the row in one go instead of growing it key by key
+                matchup_features_list.append(dict(zip(columns, (
+                    game_id, game_days[i], self.season, home_team_id, away_team_id,
+                    *history_rows[i],  # Head-to-head, style matchup, recent form and rest
+                    same_conference, same_division, season_types.get(game_id) == 'Playoffs', 1,
+                ))))
                 
             except Exception as e:
                 logger.error(f"Error calculating matchup features for game {game_id}: {e}")
                 self.stats['errors'] += 1
         
-        # Store matchup features
-        if matchup_features_list:
-            self._store_matchup_features(matchup_features_list, full_refresh)
+        return matchup_features_list
     
     def _store_matchup_features(self, features_list: List[Dict[str, Any]], full_refresh: bool):
-        """Store matchup features in database."""
+        """
+        Store matchup features in database with batched upserts.
+        
+        Rows conflicting on game_id are updated when full_refresh is set and
+        left untouched otherwise.
+        """
         print(f"\n[STEP 5] Storing {len(features_list)} matchup feature records...")
         
-        with self.db_manager.get_session() as session:
-            for features in tqdm(features_list, desc="  Saving matchup features"):
+        if not features_list:
+            print(f"  [OK] Created {self.stats['matchup_features_created']}, Updated {self.stats['matchup_features_updated']}")
+            return
+        
+        columns = list(features_list[0].keys())
+        
+        with self._bulk_write_session() as session:
+            # One query to tell creates from updates for the summary
+            existing_game_ids = set(session.execute(
+                select(GameMatchupFeatures.game_id).where(GameMatchupFeatures.season == self.season)
+            ).scalars())
+            
+            if session.get_bind().dialect.name == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            
+            stmt = dialect_insert(GameMatchupFeatures)
+            if full_refresh:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['game_id'],
+                    set_={
+                        **{c: stmt.excluded[c] for c in columns if c != 'game_id'},
+                        'updated_at': func.now(),
+                    }
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=['game_id'])
+            
+            batch_size = 500
+            for start in tqdm(
+                range(0, len(features_list), batch_size), desc="  Saving matchup features",
+                mininterval=0.5, disable=self.quiet
+            ):
+                chunk = features_list[start:start + batch_size]
                 try:
-                    existing = session.query(GameMatchupFeatures).filter_by(
-                        game_id=features['game_id']
-                    ).first()
-                    
-                    if existing:
-                        if full_refresh:
-                            # Update existing
-                            for key, value in features.items():
-                                if key != 'game_id':
-                                    setattr(existing, key, value)
-                            self.stats['matchup_features_updated'] += 1
-                    else:
-                        # Create new
-                        matchup_feat = GameMatchupFeatures(**features)
-                        session.add(matchup_feat)
-                        self.stats['matchup_features_created'] += 1
-                    
+                    session.execute(stmt, chunk)
+                    session.commit()
                 except Exception as e:
-                    logger.error(f"Error storing matchup features for {features.get('game_id')}: {e}")
+                    session.rollback()
+                    logger.error(f"Error storing matchup features batch: {e}")
                     self.stats['errors'] += 1
-            
-            session.commit()
+                    continue
+                
+                for features in chunk:
+                    if features['game_id'] not in existing_game_ids:
+                        self.stats['matchup_features_created'] += 1
+                    elif full_refresh:
+                        self.stats['matchup_features_updated'] += 1
         
         print(f"  [OK] Created {self.stats['matchup_features_created']}, Updated {self.stats['matchup_features_updated']}")
     
@@ -814,6 +1538,22 @@ def main():
         action='store_true',
         help='Recalculate all features even if they exist'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always query game data instead of using the on-disk cache'
+    )
+    parser.add_argument(
+        '--n-jobs',
+        type=int,
+        default=1,
+        help='Number of teams to compute features for concurrently (-1 = all cores)'
+    )
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Hide progress bars (for automation)'
+    )
     
     args = parser.parse_args()
     
@@ -822,7 +1562,13 @@ def main():
     db_manager.create_tables()
     
     # Run transformation
-    transformer = FeatureTransformer(season=args.season, db_manager=db_manager)
+    transformer = FeatureTransformer(
+        season=args.season,
+        db_manager=db_manager,
+        n_jobs=args.n_jobs,
+        use_cache=not args.no_cache,
+        quiet=args.quiet
+    )
     stats = transformer.run(full_refresh=args.full_refresh)
     
     return 0 if stats['errors'] == 0 else 1
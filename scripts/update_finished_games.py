@@ -16,10 +16,15 @@ import warnings
 warnings.filterwarnings('ignore', category=FutureWarning)
 
 import logging
+import re
 from datetime import date, timedelta
 from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import func, select, update
 from src.database.db_manager import DatabaseManager
-from src.database.models import Game
+from src.database.models import Game, Team
 from src.data_collectors.nba_api_collector import NBAPICollector
 
 logging.basicConfig(
@@ -28,8 +33,80 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Betting API ids start with the game date (YYYYMMDD + team suffixes);
+# NBA ids are 10 digits starting with '00'
+_DATE_PREFIXED_GAME_ID = re.compile(r'(?:19|20)\d{2}(?:0[1-9]|1[0-2])\d{2}')
 
-def update_game_scores(target_date: date, db: DatabaseManager, quiet: bool = False) -> dict:
+
+def fetch_game_result(
+    game: Game,
+    nba_collector: NBAPICollector,
+    quiet: bool = False
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Look up the final score of one scheduled game from the NBA API.
+    
+    Args:
+        game: Scheduled game to check (a Game or a row with its game_id,
+            home_team_id, away_team_id and game_date)
+        nba_collector: NBA API collector
+        quiet: Suppress detailed output
+        
+    Returns:
+        ('updated', column values for the game) when it has a final score,
+        otherwise ('still_scheduled', None) or ('error', None)
+    """
+    try:
+        # Check if game_id is betting API format (starts with date) or NBA format (starts with 00)
+        if _DATE_PREFIXED_GAME_ID.match(game.game_id) or len(game.game_id) > 10:
+            # Betting API format - need to find NBA game ID
+            nba_game_id = nba_collector.find_nba_game_id(
+                game.home_team_id,
+                game.away_team_id,
+                game.game_date
+            )
+            if not nba_game_id:
+                if not quiet:
+                    logger.debug(f"Could not find NBA game ID for {game.game_id}")
+                return 'still_scheduled', None
+            game_details = nba_collector.get_game_details(nba_game_id)
+        else:
+            # NBA format - use directly
+            game_details = nba_collector.get_game_details(game.game_id)
+        
+        if not game_details:
+            if not quiet:
+                logger.debug(f"No API response for game {game.game_id}")
+            return 'still_scheduled', None
+        
+        home_score = game_details.get('home_score')
+        away_score = game_details.get('away_score')
+        
+        # Only games with both final scores can be marked finished
+        if home_score is None or away_score is None:
+            return 'still_scheduled', None
+        
+        return 'updated', {
+            'game_id': game.game_id,
+            'home_score': home_score,
+            'away_score': away_score,
+            'point_differential': home_score - away_score,
+            'winner': game.home_team_id if home_score > away_score else game.away_team_id,
+            'game_status': 'finished',
+        }
+    
+    except Exception as e:
+        if not quiet:
+            logger.warning(f"Error checking game {game.game_id}: {e}")
+        return 'error', None
+
+
+def update_game_scores(
+    target_date: date,
+    db: DatabaseManager,
+    quiet: bool = False,
+    max_workers: int = 2
+) -> dict:
     """
     Update scores for finished games on the target date.
     
@@ -37,6 +114,9 @@ def update_game_scores(target_date: date, db: DatabaseManager, quiet: bool = Fal
         target_date: Date to check for finished games
         db: Database manager
         quiet: Suppress detailed output
+        max_workers: Number of games checked against the NBA API at once. The
+            collector spaces all calls RATE_LIMIT_DELAY apart, so extra workers
+            only overlap request latency; they don't raise the request rate.
         
     Returns:
         Dictionary with update statistics
@@ -49,19 +129,23 @@ def update_game_scores(target_date: date, db: DatabaseManager, quiet: bool = Fal
         'errors': 0
     }
     
-    # Get scheduled games for the date
+    # Get scheduled games for the date; finished ones are only counted
     with db.get_session() as session:
-        scheduled_games = session.query(Game).filter(
-            Game.game_date == target_date,
-            Game.game_status != 'finished'
-        ).all()
+        status_counts = dict(session.execute(
+            select(Game.game_status, func.count())
+            .where(Game.game_date == target_date)
+            .group_by(Game.game_status)
+        ).all())
+        stats['already_finished'] = status_counts.get('finished', 0)
         
-        finished_games = session.query(Game).filter(
-            Game.game_date == target_date,
-            Game.game_status == 'finished'
+        # Only the columns the API lookup needs rather than full ORM objects
+        scheduled_games = session.execute(
+            select(Game.game_id, Game.home_team_id, Game.away_team_id, Game.game_date)
+            .where(
+                Game.game_date == target_date,
+                Game.game_status != 'finished'
+            )
         ).all()
-        
-        stats['already_finished'] = len(finished_games)
     
     if not scheduled_games:
         if not quiet:
@@ -80,78 +164,47 @@ def update_game_scores(target_date: date, db: DatabaseManager, quiet: bool = Fal
         logger.error(f"Failed to initialize NBA API collector: {e}")
         return stats
     
-    # Check each scheduled game
-    for game in scheduled_games:
+    # API calls are network-bound: check the games concurrently. The shared
+    # collector starts calls at most once per RATE_LIMIT_DELAY across threads.
+    check_game = partial(fetch_game_result, nba_collector=nba_collector, quiet=quiet)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(check_game, scheduled_games))
+    
+    # Finished games are collected here and written in one batch
+    updates = []
+    updated_games = []
+    
+    for game, (status, values) in zip(scheduled_games, results):
         stats['checked'] += 1
         
+        if status == 'updated':
+            updates.append(values)
+            updated_games.append(game)
+        elif status == 'error':
+            stats['errors'] += 1
+        else:
+            stats['still_scheduled'] += 1
+    
+    if updates:
+        # One executemany UPDATE (by primary key) for all finished games
         try:
-            # Check if game_id is betting API format (starts with date) or NBA format (starts with 00)
-            if game.game_id.startswith('2026') or len(game.game_id) > 10:
-                # Betting API format - need to find NBA game ID
-                nba_game_id = nba_collector.find_nba_game_id(
-                    game.home_team_id,
-                    game.away_team_id,
-                    game.game_date
-                )
-                if not nba_game_id:
-                    if not quiet:
-                        logger.debug(f"Could not find NBA game ID for {game.game_id}")
-                    stats['still_scheduled'] += 1
-                    continue
-                game_details = nba_collector.get_game_details(nba_game_id)
-            else:
-                # NBA format - use directly
-                game_details = nba_collector.get_game_details(game.game_id)
-            
-            if not game_details:
-                # Try alternative: check if game has scores in database already
-                if not quiet:
-                    logger.debug(f"No API response for game {game.game_id}")
-                stats['still_scheduled'] += 1
-                continue
-            
-            # Check if game is finished
-            if game_details.get('game_status') == 'finished' or (
-                game_details.get('home_score') is not None and 
-                game_details.get('away_score') is not None
-            ):
-                home_score = game_details.get('home_score')
-                away_score = game_details.get('away_score')
-                
-                if home_score is not None and away_score is not None:
-                    # Update game in database
-                    with db.get_session() as session:
-                        game_to_update = session.query(Game).filter_by(
-                            game_id=game.game_id
-                        ).first()
-                        
-                        if game_to_update:
-                            game_to_update.home_score = home_score
-                            game_to_update.away_score = away_score
-                            game_to_update.point_differential = home_score - away_score
-                            game_to_update.winner = (
-                                game_to_update.home_team_id if home_score > away_score 
-                                else game_to_update.away_team_id
-                            )
-                            game_to_update.game_status = 'finished'
-                            session.commit()
-                            
-                            stats['updated'] += 1
-                            if not quiet:
-                                away_team = db.get_team(game.away_team_id)
-                                home_team = db.get_team(game.home_team_id)
-                                away_name = away_team.team_name if away_team else game.away_team_id
-                                home_name = home_team.team_name if home_team else game.home_team_id
-                                logger.info(f"  Updated: {away_name} @ {home_name}: {away_score}-{home_score}")
-                else:
-                    stats['still_scheduled'] += 1
-            else:
-                stats['still_scheduled'] += 1
-                
+            with db.get_session() as session:
+                session.execute(update(Game), updates)
         except Exception as e:
-            stats['errors'] += 1
-            if not quiet:
-                logger.warning(f"Error checking game {game.game_id}: {e}")
+            stats['errors'] += len(updates)
+            logger.error(f"Error saving {len(updates)} finished games for {target_date}: {e}")
+            return stats
+        
+        stats['updated'] += len(updates)
+        if not quiet:
+            # All team names in one query for the log lines
+            with db.get_session() as session:
+                team_names = dict(session.execute(select(Team.team_id, Team.team_name)).all())
+            
+            for game, values in zip(updated_games, updates):
+                away_name = team_names.get(game.away_team_id) or game.away_team_id
+                home_name = team_names.get(game.home_team_id) or game.home_team_id
+                logger.info(f"  Updated: {away_name} @ {home_name}: {values['away_score']}-{values['home_score']}")
     
     return stats
 
@@ -164,6 +217,9 @@ def main():
                        help='Number of days back to check (default: 1)')
     parser.add_argument('--quiet', action='store_true',
                        help='Suppress detailed output (for automation)')
+    parser.add_argument('--workers', type=int, default=2,
+                       help='Games checked against the NBA API at once; calls stay '
+                            'RATE_LIMIT_DELAY apart (default: 2)')
     args = parser.parse_args()
     
     # Determine target dates
@@ -197,7 +253,7 @@ def main():
             print(f"\n[{target_date}]")
             print("-" * 70)
         
-        stats = update_game_scores(target_date, db, quiet=args.quiet)
+        stats = update_game_scores(target_date, db, quiet=args.quiet, max_workers=args.workers)
         
         for key in total_stats:
             total_stats[key] += stats[key]
@@ -34,7 +34,7 @@ def calculate_weights(num_games: int, decay_rate: float) -> List[float]:
     Returns:
         List of weights (most recent game first)
     """
-    return [np.exp(-decay_rate * i) for i in range(num_games)]
+    return np.exp(-decay_rate * np.arange(num_games, dtype=np.float64)).tolist()
 
 
 def analyze_weight_distribution(weights: List[float]) -> dict:
@@ -47,39 +47,23 @@ def analyze_weight_distribution(weights: List[float]) -> dict:
     Returns:
         Dictionary with analysis results
     """
-    total = sum(weights)
-    num_games = len(weights)
+    weights_arr = np.asarray(weights, dtype=np.float64)
     
     # Calculate percentage of weight for each game
-    percentages = [w / total * 100 for w in weights]
+    percentages = weights_arr / weights_arr.sum() * 100
     
     # Calculate cumulative percentages
-    cumulative = []
-    running = 0
-    for pct in percentages:
-        running += pct
-        cumulative.append(running)
-    
-    # Calculate weight by segments
-    if num_games >= 5:
-        first_5_pct = sum(percentages[:5])
-    else:
-        first_5_pct = sum(percentages)
-    
-    if num_games >= 10:
-        games_6_10_pct = sum(percentages[5:10])
-    else:
-        games_6_10_pct = sum(percentages[5:]) if num_games > 5 else 0
+    cumulative = np.cumsum(percentages)
     
-    if num_games >= 20:
-        games_11_20_pct = sum(percentages[10:20])
-    else:
-        games_11_20_pct = sum(percentages[10:]) if num_games > 10 else 0
+    # Calculate weight by segments (slices past the end are empty)
+    first_5_pct = float(percentages[:5].sum())
+    games_6_10_pct = float(percentages[5:10].sum())
+    games_11_20_pct = float(percentages[10:20].sum())
     
     return {
         'weights': weights,
-        'percentages': percentages,
-        'cumulative': cumulative,
+        'percentages': percentages.tolist(),
+        'cumulative': cumulative.tolist(),
         'first_5_pct': first_5_pct,
         'games_6_10_pct': games_6_10_pct,
         'games_11_20_pct': games_11_20_pct,
@@ -100,10 +84,9 @@ def verify_weighted_average():
     decay_rate = 0.1
     weights = calculate_weights(5, decay_rate)
     
-    # Calculate weighted average manually
-    weighted_sum = sum(v * w for v, w in zip(values, weights))
-    weight_total = sum(weights)
-    weighted_avg = weighted_sum / weight_total
+    # Calculate weighted average as one dot product
+    weights_arr = np.asarray(weights, dtype=np.float64)
+    weighted_avg = float(np.dot(np.asarray(values, dtype=np.float64), weights_arr) / weights_arr.sum())
     
     # Simple average
     simple_avg = sum(values) / len(values)
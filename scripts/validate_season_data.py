@@ -1,33 +1,65 @@
 """Validate data quality for a specific season."""
 
+import io
 import sys
+from functools import partial
 from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.database.db_manager import DatabaseManager
-from src.database.models import Game, TeamStats, PlayerStats, Team
-from sqlalchemy import func, and_
-from datetime import date
+from typing import NamedTuple, Optional
+
+# Section rule for the report
+SEPARATOR = "=" * 70
+
+
+class PercentageIssue(NamedTuple):
+    """A team stat line with a suspicious shooting percentage."""
+    game_id: str
+    team_id: str
+    stat: str
+    stored: float
+    calculated: Optional[float] = None  # Set when stored doesn't match makes/attempts
+
 
 def validate_season(season: str):
     """Validate data quality for a season."""
-    print("=" * 70)
-    print(f"Data Validation for Season: {season}")
-    print("=" * 70)
+    # The report is buffered and written to stdout in one go at the end
+    report = io.StringIO()
+    write = partial(print, file=report)
+    try:
+        return _run_validation(season, write)
+    finally:
+        sys.stdout.write(report.getvalue())
+
+
+def _run_validation(season: str, write):
+    """Run the checks for a season, writing the report lines with write()."""
+    # Imported here so `--help` doesn't load SQLAlchemy, NumPy and the database layer
+    import numpy as np
+    from sqlalchemy import func, and_, case, or_
+    from src.database.db_manager import DatabaseManager
+    from src.database.models import Game, TeamStats, PlayerStats
+    
+    write(SEPARATOR)
+    write(f"Data Validation for Season: {season}")
+    write(SEPARATOR)
     
     db_manager = DatabaseManager()
     
     with db_manager.get_session() as session:
-        # Get all games for the season
-        games = session.query(Game).filter(Game.season == season).all()
-        total_games = len(games)
+        # Count the season's games by status in SQL
+        status_counts = dict(session.query(Game.game_status, func.count()).filter(
+            Game.season == season
+        ).group_by(Game.game_status).all())
+        total_games = sum(status_counts.values())
         
-        print(f"\nTotal games: {total_games}")
+        write(f"\nTotal games: {total_games}")
         
         # Check finished games
-        finished_games = [g for g in games if g.game_status == 'finished']
-        print(f"Finished games: {len(finished_games)}")
+        finished = and_(Game.season == season, Game.game_status == 'finished')
+        finished_count = status_counts.get('finished', 0)
+        write(f"Finished games: {finished_count}")
         
         # Check games with stats
         games_with_team_stats = []
@@ -43,128 +75,184 @@ def validate_season(season: str):
             'winner_mismatch': []
         }
         
-        for game in finished_games:
-            team_stats = session.query(TeamStats).filter_by(game_id=game.game_id).all()
-            player_stats = session.query(PlayerStats).filter_by(game_id=game.game_id).all()
-            
-            has_team_stats = len(team_stats) > 0
-            has_player_stats = len(player_stats) > 0
+        # Games with stats are looked up from two queries instead of per game
+        team_stats_game_ids = {
+            game_id for (game_id,) in session.query(TeamStats.game_id).join(
+                Game, TeamStats.game_id == Game.game_id
+            ).filter(Game.season == season).distinct()
+        }
+        player_stats_game_ids = {
+            game_id for (game_id,) in session.query(PlayerStats.game_id).join(
+                Game, PlayerStats.game_id == Game.game_id
+            ).filter(Game.season == season).distinct()
+        }
+        
+        # Finished game ids are streamed rather than loaded as a list
+        for (game_id,) in session.query(Game.game_id).filter(finished).yield_per(500):
+            has_team_stats = game_id in team_stats_game_ids
+            has_player_stats = game_id in player_stats_game_ids
             
             if has_team_stats:
-                games_with_team_stats.append(game.game_id)
+                games_with_team_stats.append(game_id)
             if has_player_stats:
-                games_with_player_stats.append(game.game_id)
+                games_with_player_stats.append(game_id)
             if has_team_stats and has_player_stats:
-                games_with_both.append(game.game_id)
-            if not has_team_stats or not has_player_stats:
-                games_missing_stats.append(game.game_id)
-            
-            # Check data quality issues
-            for ts in team_stats:
-                # Check rebounds
-                if ts.rebounds_total == 0 and ts.rebounds_offensive == 0 and ts.rebounds_defensive == 0:
-                    if ts.points > 0:  # Only flag if team scored (game was played)
-                        issues['zero_rebounds'].append((game.game_id, ts.team_id))
-                
-                # Check percentages (should be between 0 and 100, or 0 and 1)
-                fg_pct = ts.field_goal_percentage
-                if fg_pct < 0 or (fg_pct > 1 and fg_pct > 100):
-                    issues['invalid_percentages'].append((game.game_id, ts.team_id, 'FG%', fg_pct))
-                elif fg_pct > 0 and fg_pct < 1:
-                    # Might be stored as decimal, check if it should be percentage
-                    if ts.field_goals_attempted > 0:
-                        calc_pct = (ts.field_goals_made / ts.field_goals_attempted) * 100
-                        if abs(calc_pct - fg_pct) > 1:  # More than 1% difference
-                            issues['invalid_percentages'].append((game.game_id, ts.team_id, 'FG%', fg_pct, calc_pct))
-            
-            # Check scores
-            if game.home_score is None or game.away_score is None:
-                if game.game_status == 'finished':
-                    issues['missing_scores'].append(game.game_id)
-            
-            # Check winner
-            if game.home_score is not None and game.away_score is not None and game.winner:
-                expected_winner = game.home_team_id if game.home_score > game.away_score else game.away_team_id
-                if game.home_score == game.away_score:
-                    expected_winner = None  # Tie
-                if expected_winner and game.winner != expected_winner:
-                    issues['winner_mismatch'].append((game.game_id, expected_winner, game.winner))
+                games_with_both.append(game_id)
+            else:
+                games_missing_stats.append(game_id)
+        
+        # Data quality checks run in SQL and return only the offending rows
+        team_stats_order = (Game.game_date, Game.game_id, TeamStats.id)
+        
+        # Check rebounds (only flag if team scored, i.e. the game was played)
+        zero_rebounds = session.query(TeamStats.game_id, TeamStats.team_id).join(
+            Game, TeamStats.game_id == Game.game_id
+        ).filter(
+            finished,
+            TeamStats.rebounds_total == 0,
+            TeamStats.rebounds_offensive == 0,
+            TeamStats.rebounds_defensive == 0,
+            TeamStats.points > 0
+        ).order_by(*team_stats_order)
+        issues['zero_rebounds'] = [tuple(row) for row in zero_rebounds]
+        
+        # Check percentages (should be between 0 and 100, or 0 and 1)
+        suspect_percentages = session.query(
+            TeamStats.game_id,
+            TeamStats.team_id,
+            TeamStats.field_goal_percentage,
+            TeamStats.field_goals_made,
+            TeamStats.field_goals_attempted
+        ).join(
+            Game, TeamStats.game_id == Game.game_id
+        ).filter(
+            finished,
+            or_(
+                TeamStats.field_goal_percentage < 0,
+                TeamStats.field_goal_percentage > 100,
+                # Might be stored as decimal, checked against FGM/FGA below
+                and_(
+                    TeamStats.field_goal_percentage > 0,
+                    TeamStats.field_goal_percentage < 1,
+                    TeamStats.field_goals_attempted > 0
+                )
+            )
+        ).order_by(*team_stats_order).all()
+        
+        # Stored vs calculated FG% is compared for all suspect rows at once
+        values = np.array(
+            [row[2:] for row in suspect_percentages], dtype=np.float64
+        ).reshape(-1, 3)
+        fg_pct, fg_made, fg_attempted = values.T
+        out_of_range = (fg_pct < 0) | (fg_pct > 100)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            calc_pct = (fg_made / fg_attempted) * 100
+        mismatch = ~out_of_range & (np.abs(calc_pct - fg_pct) > 1)  # More than 1% difference
+        for i in np.flatnonzero(out_of_range | mismatch):
+            game_id, team_id, stored = suspect_percentages[i][:3]
+            calculated = None if out_of_range[i] else float(calc_pct[i])
+            issues['invalid_percentages'].append(PercentageIssue(game_id, team_id, 'FG%', stored, calculated))
+        
+        # Check scores
+        missing_scores = session.query(Game.game_id).filter(
+            finished,
+            or_(Game.home_score.is_(None), Game.away_score.is_(None))
+        ).order_by(Game.game_date, Game.game_id)
+        issues['missing_scores'] = [game_id for (game_id,) in missing_scores]
+        
+        # Check winner (ties have no expected winner)
+        expected_winner = case(
+            (Game.home_score > Game.away_score, Game.home_team_id), else_=Game.away_team_id
+        )
+        winner_mismatch = session.query(Game.game_id, expected_winner, Game.winner).filter(
+            finished,
+            Game.home_score.isnot(None),
+            Game.away_score.isnot(None),
+            Game.home_score != Game.away_score,
+            Game.winner.isnot(None),
+            Game.winner != '',
+            Game.winner != expected_winner
+        ).order_by(Game.game_date, Game.game_id)
+        issues['winner_mismatch'] = [tuple(row) for row in winner_mismatch]
+        total_issues = sum(len(found) for found in issues.values())
         
         # Print summary
-        print(f"\n{'='*70}")
-        print("Coverage Summary")
-        print(f"{'='*70}")
-        print(f"Games with team stats: {len(games_with_team_stats)}/{len(finished_games)} ({len(games_with_team_stats)/len(finished_games)*100:.1f}%)" if finished_games else "N/A")
-        print(f"Games with player stats: {len(games_with_player_stats)}/{len(finished_games)} ({len(games_with_player_stats)/len(finished_games)*100:.1f}%)" if finished_games else "N/A")
-        print(f"Games with both: {len(games_with_both)}/{len(finished_games)} ({len(games_with_both)/len(finished_games)*100:.1f}%)" if finished_games else "N/A")
-        print(f"Games missing stats: {len(games_missing_stats)}")
+        write(f"\n{SEPARATOR}")
+        write("Coverage Summary")
+        write(SEPARATOR)
+        coverage = (
+            ("Games with team stats", len(games_with_team_stats)),
+            ("Games with player stats", len(games_with_player_stats)),
+            ("Games with both", len(games_with_both))
+        )
+        for label, count in coverage:
+            # Only the ratio is unavailable without finished games, not the whole line
+            share = f"{count / finished_count * 100:.1f}%" if finished_count else "N/A"
+            write(f"{label}: {count}/{finished_count} ({share})")
+        write(f"Games missing stats: {len(games_missing_stats)}")
         
         # Print issues
-        print(f"\n{'='*70}")
-        print("Data Quality Issues")
-        print(f"{'='*70}")
+        write(f"\n{SEPARATOR}")
+        write("Data Quality Issues")
+        write(SEPARATOR)
         
         if issues['missing_scores']:
-            print(f"\n[WARNING] Missing scores: {len(issues['missing_scores'])} games")
-            print(f"  Sample: {issues['missing_scores'][:5]}")
+            write(f"\n[WARNING] Missing scores: {len(issues['missing_scores'])} games")
+            write(f"  Sample: {issues['missing_scores'][:5]}")
         
         if issues['zero_rebounds']:
-            print(f"\n[WARNING] Zero rebounds (but scored points): {len(issues['zero_rebounds'])} team-game records")
-            print(f"  Sample: {issues['zero_rebounds'][:5]}")
+            write(f"\n[WARNING] Zero rebounds (but scored points): {len(issues['zero_rebounds'])} team-game records")
+            write(f"  Sample: {issues['zero_rebounds'][:5]}")
         
         if issues['invalid_percentages']:
-            print(f"\n[WARNING] Invalid percentages: {len(issues['invalid_percentages'])} records")
+            write(f"\n[WARNING] Invalid percentages: {len(issues['invalid_percentages'])} records")
             for issue in issues['invalid_percentages'][:5]:
-                if len(issue) == 5:
-                    print(f"  Game {issue[0]}, Team {issue[1]}, {issue[2]}: stored={issue[3]:.3f}, calculated={issue[4]:.1f}")
+                if issue.calculated is not None:
+                    write(f"  Game {issue.game_id}, Team {issue.team_id}, {issue.stat}: stored={issue.stored:.3f}, calculated={issue.calculated:.1f}")
                 else:
-                    print(f"  Game {issue[0]}, Team {issue[1]}, {issue[2]}: {issue[3]:.3f}")
+                    write(f"  Game {issue.game_id}, Team {issue.team_id}, {issue.stat}: {issue.stored:.3f}")
         
         if issues['winner_mismatch']:
-            print(f"\n[WARNING] Winner mismatches: {len(issues['winner_mismatch'])} games")
+            write(f"\n[WARNING] Winner mismatches: {len(issues['winner_mismatch'])} games")
             for issue in issues['winner_mismatch'][:5]:
-                print(f"  Game {issue[0]}: expected={issue[1]}, stored={issue[2]}")
+                write(f"  Game {issue[0]}: expected={issue[1]}, stored={issue[2]}")
         
-        if not any(issues.values()):
-            print("\n[OK] No data quality issues found!")
+        if total_issues == 0:
+            write("\n[OK] No data quality issues found!")
         
         # Sample some games for manual inspection
-        print(f"\n{'='*70}")
-        print("Sample Games (for manual inspection)")
-        print(f"{'='*70}")
+        write(f"\n{SEPARATOR}")
+        write("Sample Games (for manual inspection)")
+        write(SEPARATOR)
         
-        sample_games = session.query(Game).filter(
-            Game.season == season,
-            Game.game_status == 'finished'
-        ).order_by(Game.game_date).limit(3).all()
+        sample_games = db_manager.get_games_with_stats(season, game_status='finished', limit=3)
         
         for game in sample_games:
-            print(f"\nGame {game.game_id} ({game.game_date}):")
-            print(f"  {game.away_team_id} @ {game.home_team_id}")
-            print(f"  Score: {game.away_score} - {game.home_score}")
-            print(f"  Winner: {game.winner}")
+            write(f"\nGame {game.game_id} ({game.game_date}):")
+            write(f"  {game.away_team_id} @ {game.home_team_id}")
+            write(f"  Score: {game.away_score} - {game.home_score}")
+            write(f"  Winner: {game.winner}")
             
-            team_stats = session.query(TeamStats).filter_by(game_id=game.game_id).all()
-            print(f"  Team stats: {len(team_stats)} records")
-            for ts in team_stats:
+            write(f"  Team stats: {len(game.team_stats)} records")
+            for ts in game.team_stats:
                 home_away = "Home" if ts.is_home else "Away"
                 fg_pct = ts.field_goal_percentage * 100 if ts.field_goal_percentage < 1.0 else ts.field_goal_percentage
-                print(f"    {home_away} Team {ts.team_id}: {ts.points} pts, "
+                write(f"    {home_away} Team {ts.team_id}: {ts.points} pts, "
                       f"{ts.field_goals_made}/{ts.field_goals_attempted} FG ({fg_pct:.1f}%), "
                       f"{ts.rebounds_total} reb")
             
-            player_count = session.query(PlayerStats).filter_by(game_id=game.game_id).count()
-            print(f"  Player stats: {player_count} records")
+            write(f"  Player stats: {len(game.player_stats)} records")
         
-        print(f"\n{'='*70}")
+        write(f"\n{SEPARATOR}")
         
         return {
             'total_games': total_games,
-            'finished_games': len(finished_games),
+            'finished_games': finished_count,
             'games_with_team_stats': len(games_with_team_stats),
             'games_with_player_stats': len(games_with_player_stats),
             'games_missing_stats': len(games_missing_stats),
-            'issues': issues
+            'issues': issues,
+            'total_issues': total_issues
         }
 
 
@@ -179,5 +267,4 @@ if __name__ == "__main__":
     result = validate_season(args.season)
     
     # Exit with error code if there are issues
-    total_issues = sum(len(v) for v in result['issues'].values())
-    sys.exit(1 if total_issues > 0 else 0)
+    sys.exit(1 if result['total_issues'] > 0 else 0)
@@ -11,10 +11,10 @@ Handles all betting operations including:
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import date, datetime, timedelta
-from sqlalchemy import func
+from sqlalchemy import func, insert, update
 
 from src.database.db_manager import DatabaseManager
-from src.database.models import Game, Prediction, BettingLine, Bet, BankrollSnapshot
+from src.database.models import Game, Team, Prediction, BettingLine, Bet, BankrollSnapshot
 from src.prediction.prediction_service import PredictionService
 from src.backtesting.strategies import (
     BettingStrategy,
@@ -59,6 +59,7 @@ class BettingManager:
         self.db_manager = db_manager or DatabaseManager()
         self.prediction_service = PredictionService(self.db_manager)
         self.initial_bankroll = initial_bankroll
+        self._team_names: Optional[Dict[str, str]] = None
     
     def get_strategy(self, strategy_name: str) -> BettingStrategy:
         """Get a betting strategy by name."""
@@ -145,6 +146,46 @@ class BettingManager:
                 'point_spread_away': latest.point_spread_away
             }
     
+    def _get_team_names(self, session) -> Dict[str, str]:
+        """Get team names keyed by team ID (loaded once and cached)."""
+        if self._team_names is None:
+            self._team_names = {
+                team_id: team_name
+                for team_id, team_name in session.query(Team.team_id, Team.team_name)
+            }
+        return self._team_names
+    
+    def _get_latest_lines(self, session, game_ids: List[str]) -> Dict[str, BettingLine]:
+        """
+        Get the betting line to use for each of several games in one query.
+        
+        Applies the same priority as get_odds_for_game(): the most recent
+        DraftKings line, then FanDuel, then the most recent line from any
+        sportsbook.
+        
+        Args:
+            game_ids: Game identifiers
+            
+        Returns:
+            Dictionary of game ID to BettingLine (games without lines are omitted)
+        """
+        latest_by_sportsbook: Dict[str, Dict[str, BettingLine]] = {}
+        latest_any: Dict[str, BettingLine] = {}
+        
+        lines = session.query(BettingLine).filter(
+            BettingLine.game_id.in_(game_ids)
+        ).order_by(BettingLine.created_at.desc())
+        
+        for line in lines:
+            latest_by_sportsbook.setdefault(line.game_id, {}).setdefault(line.sportsbook, line)
+            latest_any.setdefault(line.game_id, line)
+        
+        latest_lines = {}
+        for game_id, line in latest_any.items():
+            by_sportsbook = latest_by_sportsbook[game_id]
+            latest_lines[game_id] = by_sportsbook.get('draftkings') or by_sportsbook.get('fanduel') or line
+        return latest_lines
+    
     def place_bets_for_date(
         self,
         target_date: date,
@@ -189,6 +230,18 @@ class BettingManager:
             
             logger.info(f"Found {len(games)} games for {target_date}")
             
+            # Predictions, odds and team names for the slate are loaded up front
+            game_ids = [game.game_id for game in games]
+            predictions = {
+                prediction.game_id: prediction
+                for prediction in session.query(Prediction).filter(
+                    Prediction.game_id.in_(game_ids),
+                    Prediction.model_name == model_name
+                )
+            }
+            latest_lines = self._get_latest_lines(session, game_ids)
+            team_names = self._get_team_names(session)
+            
             for strategy_name in strategy_names:
                 strategy = self.get_strategy(strategy_name)
                 # Get bankroll counting only from today (for fresh starts)
@@ -199,25 +252,28 @@ class BettingManager:
                 existing_game_ids = {bet['game_id'] for bet in existing_bets}  # Track which games already have bets
                 
                 bets_placed = []
+                new_bets = []  # Rows for one multi-row INSERT after the game loop
                 total_wagered = 0.0
                 
                 # First pass: validate existing bets match current predictions
                 bets_to_remove = []
+                strategy_bets = {}
+                if existing_game_ids:
+                    for bet in session.query(Bet).filter(
+                        Bet.game_id.in_(existing_game_ids),
+                        Bet.strategy_name == strategy_name
+                    ):
+                        strategy_bets.setdefault(bet.game_id, bet)
+                
                 for game in games:
-                    prediction = session.query(Prediction).filter(
-                        Prediction.game_id == game.game_id,
-                        Prediction.model_name == model_name
-                    ).first()
+                    prediction = predictions.get(game.game_id)
                     
                     if not prediction:
                         continue
                     
                     if game.game_id in existing_game_ids:
                         # Validate that existing bet matches current prediction
-                        existing_bet = session.query(Bet).filter(
-                            Bet.game_id == game.game_id,
-                            Bet.strategy_name == strategy_name
-                        ).first()
+                        existing_bet = strategy_bets.get(game.game_id)
                         
                         if existing_bet and existing_bet.bet_team != prediction.predicted_winner:
                             # Bet was placed with old prediction, delete it
@@ -245,10 +301,7 @@ class BettingManager:
                             continue
                         
                         # Get prediction
-                        prediction = session.query(Prediction).filter(
-                            Prediction.game_id == game.game_id,
-                            Prediction.model_name == model_name
-                        ).first()
+                        prediction = predictions.get(game.game_id)
                         
                         if not prediction:
                             logger.debug(f"No prediction for game {game.game_id}")
@@ -262,11 +315,23 @@ class BettingManager:
                             'win_probability_away': prediction.win_probability_away
                         }
                         
-                        # Get odds
-                        odds = self.get_odds_for_game(game.game_id)
-                        if not odds:
-                            logger.debug(f"No odds for game {game.game_id}")
+                        # Get odds (DraftKings, then FanDuel, then any other sportsbook)
+                        betting_line = latest_lines.get(game.game_id)
+                        if not betting_line:
+                            logger.warning(f"No odds found for game {game.game_id}")
                             continue
+                        if betting_line.sportsbook not in ('draftkings', 'fanduel'):
+                            logger.debug(
+                                f"Using {betting_line.sportsbook} odds for game {game.game_id} "
+                                f"(DraftKings/FanDuel not available)"
+                            )
+                        
+                        odds = {
+                            'moneyline_home': betting_line.moneyline_home,
+                            'moneyline_away': betting_line.moneyline_away,
+                            'point_spread_home': betting_line.point_spread_home,
+                            'point_spread_away': betting_line.point_spread_away
+                        }
                         
                         # Apply strategy
                         bet_decision = strategy.should_bet(
@@ -278,53 +343,29 @@ class BettingManager:
                         
                         if bet_decision:
                             # Record bet
-                            bet = Bet(
-                                game_id=game.game_id,
-                                strategy_name=strategy_name,
-                                bet_type=bet_decision['bet_type'],
-                                bet_team=bet_decision['bet_team'],
-                                bet_value=bet_decision.get('bet_value'),
-                                bet_amount=bet_decision['bet_amount'],
-                                odds=bet_decision['odds'],
-                                expected_value=bet_decision['expected_value'],
-                                confidence=bet_decision.get('confidence')
-                            )
-                            session.add(bet)
+                            new_bets.append({
+                                'game_id': game.game_id,
+                                'strategy_name': strategy_name,
+                                'bet_type': bet_decision['bet_type'],
+                                'bet_team': bet_decision['bet_team'],
+                                'bet_value': bet_decision.get('bet_value'),
+                                'bet_amount': bet_decision['bet_amount'],
+                                'odds': bet_decision['odds'],
+                                'expected_value': bet_decision['expected_value'],
+                                'confidence': bet_decision.get('confidence')
+                            })
                             
                             total_wagered += bet_decision['bet_amount']
                             
                             # Get team name for logging
-                            from src.database.models import Team
-                            team = session.query(Team).filter(Team.team_id == bet_decision['bet_team']).first()
-                            team_name = team.team_name if team else bet_decision['bet_team']
-                            
-                            # Get original American odds from BettingLine for display
-                            # Prioritize DraftKings, then FanDuel, then any other (same as get_odds_for_game)
-                            betting_line = None
-                            sportsbook_used = None
-                            for sb in ['draftkings', 'fanduel']:
-                                betting_line = session.query(BettingLine).filter(
-                                    BettingLine.game_id == game.game_id,
-                                    BettingLine.sportsbook == sb.lower()
-                                ).order_by(BettingLine.created_at.desc()).first()
-                                if betting_line:
-                                    sportsbook_used = sb
-                                    break
-                            
-                            # If still not found, get any sportsbook
-                            if not betting_line:
-                                betting_line = session.query(BettingLine).filter(
-                                    BettingLine.game_id == game.game_id
-                                ).order_by(BettingLine.created_at.desc()).first()
-                                if betting_line:
-                                    sportsbook_used = betting_line.sportsbook
+                            team_name = team_names.get(bet_decision['bet_team'], bet_decision['bet_team'])
                             
-                            american_odds = None
-                            if betting_line:
-                                if bet_decision['bet_team'] == game.home_team_id:
-                                    american_odds = betting_line.moneyline_home
-                                else:
-                                    american_odds = betting_line.moneyline_away
+                            # Original American odds from the same line, for display
+                            sportsbook_used = betting_line.sportsbook
+                            if bet_decision['bet_team'] == game.home_team_id:
+                                american_odds = betting_line.moneyline_home
+                            else:
+                                american_odds = betting_line.moneyline_away
                             
                             bets_placed.append({
                                 'game_id': game.game_id,
@@ -341,6 +382,8 @@ class BettingManager:
                         logger.error(f"Error placing bet for {game.game_id}: {e}")
                         continue
                 
+                if new_bets:
+                    session.execute(insert(Bet), new_bets)
                 session.commit()
                 
                 # Calculate total pending bets (new + existing)
@@ -379,43 +422,31 @@ class BettingManager:
         existing_bets = []
         
         with self.db_manager.get_session() as session:
-            bets = session.query(Bet).join(Game).filter(
+            bets = session.query(Bet, Game.home_team_id).join(Game).filter(
                 Game.game_date == target_date,
                 Bet.strategy_name == strategy_name
             ).all()
             
-            for bet in bets:
+            if not bets:
+                return existing_bets
+            
+            # Odds and team names for all bets are loaded up front
+            latest_lines = self._get_latest_lines(session, list({bet.game_id for bet, _ in bets}))
+            team_names = self._get_team_names(session)
+            
+            for bet, home_team_id in bets:
                 # Get team name
-                from src.database.models import Team
-                team = session.query(Team).filter(Team.team_id == bet.bet_team).first()
-                team_name = team.team_name if team else bet.bet_team
+                team_name = team_names.get(bet.bet_team, bet.bet_team)
                 
                 # Get original American odds from BettingLine
                 # Prioritize DraftKings, then FanDuel, then any other (same as get_odds_for_game)
-                betting_line = None
+                betting_line = latest_lines.get(bet.game_id)
                 sportsbook_used = None
-                for sb in ['draftkings', 'fanduel']:
-                    betting_line = session.query(BettingLine).filter(
-                        BettingLine.game_id == bet.game_id,
-                        BettingLine.sportsbook == sb.lower()
-                    ).order_by(BettingLine.created_at.desc()).first()
-                    if betting_line:
-                        sportsbook_used = sb
-                        break
-                
-                # If still not found, get any sportsbook
-                if not betting_line:
-                    betting_line = session.query(BettingLine).filter(
-                        BettingLine.game_id == bet.game_id
-                    ).order_by(BettingLine.created_at.desc()).first()
-                    if betting_line:
-                        sportsbook_used = betting_line.sportsbook
-                
-                # Determine if bet was on home or away team
-                game = session.query(Game).filter(Game.game_id == bet.game_id).first()
                 american_odds = None
-                if game and betting_line:
-                    if bet.bet_team == game.home_team_id:
+                if betting_line:
+                    sportsbook_used = betting_line.sportsbook
+                    # Determine if bet was on home or away team
+                    if bet.bet_team == home_team_id:
                         american_odds = betting_line.moneyline_home
                     else:
                         american_odds = betting_line.moneyline_away
@@ -456,7 +487,8 @@ class BettingManager:
             if not finished_games:
                 return {'status': 'no_finished_games', 'strategies': {}}
             
-            game_ids = [g.game_id for g in finished_games]
+            games_by_id = {g.game_id: g for g in finished_games}
+            game_ids = list(games_by_id)
             
             # Get pending bets for these games
             pending_bets = session.query(Bet).filter(
@@ -467,6 +499,8 @@ class BettingManager:
             if not pending_bets:
                 return {'status': 'no_pending_bets', 'strategies': {}}
             
+            team_names = self._get_team_names(session)
+            
             # Group by strategy
             strategy_bets = {}
             for bet in pending_bets:
@@ -479,10 +513,11 @@ class BettingManager:
                 losses = 0
                 total_profit = 0.0
                 resolved_bets = []
+                bet_updates = []  # Applied in one executemany UPDATE by primary key
                 
                 for bet in bets:
                     # Get the game
-                    game = session.query(Game).filter(Game.game_id == bet.game_id).first()
+                    game = games_by_id.get(bet.game_id)
                     if not game or not game.winner:
                         continue
                     
@@ -490,36 +525,37 @@ class BettingManager:
                     if bet.bet_type == 'moneyline':
                         if bet.bet_team == game.winner:
                             # Win
+                            outcome = 'win'
                             payout = bet.bet_amount * bet.odds
                             profit = payout - bet.bet_amount
-                            bet.outcome = 'win'
-                            bet.payout = payout
-                            bet.profit = profit
                             wins += 1
                         else:
                             # Loss
-                            bet.outcome = 'loss'
-                            bet.payout = 0.0
-                            bet.profit = -bet.bet_amount
+                            outcome = 'loss'
+                            payout = 0.0
+                            profit = -bet.bet_amount
                             losses += 1
                         
-                        bet.resolved_at = datetime.now()
-                        total_profit += bet.profit
-                        
-                        # Get team names for logging
-                        from src.database.models import Team
-                        bet_team = session.query(Team).filter(Team.team_id == bet.bet_team).first()
-                        winner_team = session.query(Team).filter(Team.team_id == game.winner).first()
+                        bet_updates.append({
+                            'id': bet.id,
+                            'outcome': outcome,
+                            'payout': payout,
+                            'profit': profit,
+                            'resolved_at': datetime.now()
+                        })
+                        total_profit += profit
                         
                         resolved_bets.append({
                             'game_id': bet.game_id,
-                            'bet_team': bet_team.team_name if bet_team else bet.bet_team,
-                            'winner': winner_team.team_name if winner_team else game.winner,
-                            'outcome': bet.outcome,
+                            'bet_team': team_names.get(bet.bet_team, bet.bet_team),
+                            'winner': team_names.get(game.winner, game.winner),
+                            'outcome': outcome,
                             'amount': bet.bet_amount,
-                            'profit': bet.profit
+                            'profit': profit
                         })
                 
+                if bet_updates:
+                    session.execute(update(Bet), bet_updates)
                 session.commit()
                 
                 results[strategy_name] = {
@@ -538,37 +574,37 @@ class BettingManager:
     
     def _save_bankroll_snapshots(self, target_date: date, results: Dict[str, Any]):
         """Save daily bankroll snapshots for each strategy."""
+        snapshots = [
+            {
+                'strategy_name': strategy_name,
+                'snapshot_date': target_date,
+                'bankroll': self.get_bankroll(strategy_name),
+                'daily_pnl': data['total_profit'],
+                'total_bets': data['resolved'],
+                'wins': data['wins'],
+                'losses': data['losses']
+            }
+            for strategy_name, data in results.items()
+        ]
+        if not snapshots:
+            return
+        
         with self.db_manager.get_session() as session:
-            for strategy_name, data in results.items():
-                # Check if snapshot exists
-                existing = session.query(BankrollSnapshot).filter(
-                    BankrollSnapshot.strategy_name == strategy_name,
-                    BankrollSnapshot.snapshot_date == target_date
-                ).first()
-                
-                bankroll = self.get_bankroll(strategy_name)
-                
-                if existing:
-                    # Update existing
-                    existing.bankroll = bankroll
-                    existing.daily_pnl = data['total_profit']
-                    existing.total_bets = data['resolved']
-                    existing.wins = data['wins']
-                    existing.losses = data['losses']
-                else:
-                    # Create new
-                    snapshot = BankrollSnapshot(
-                        strategy_name=strategy_name,
-                        snapshot_date=target_date,
-                        bankroll=bankroll,
-                        daily_pnl=data['total_profit'],
-                        total_bets=data['resolved'],
-                        wins=data['wins'],
-                        losses=data['losses']
-                    )
-                    session.add(snapshot)
-                
-                session.commit()
+            if session.get_bind().dialect.name == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            
+            # Insert new snapshots and update existing ones in a single upsert
+            stmt = dialect_insert(BankrollSnapshot)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['strategy_name', 'snapshot_date'],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in ('bankroll', 'daily_pnl', 'total_bets', 'wins', 'losses')
+                }
+            )
+            session.execute(stmt, snapshots)
     
     def get_daily_pnl(self, target_date: date) -> Dict[str, Any]:
         """Get PNL summary for a specific date."""
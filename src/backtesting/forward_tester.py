@@ -7,7 +7,6 @@ from pathlib import Path
 
 from src.database.db_manager import DatabaseManager
 from src.database.models import Game, Prediction, BettingLine, Bet
-from src.prediction.prediction_service import PredictionService
 from src.backtesting.strategies import BettingStrategy
 from config.settings import get_settings
 
@@ -28,7 +27,8 @@ class ForwardTester:
     def __init__(
         self,
         db_manager: Optional[DatabaseManager] = None,
-        initial_bankroll: float = 10000.0
+        initial_bankroll: float = 10000.0,
+        prediction_service: Optional[Any] = None
     ):
         """
         Initialize forward tester.
@@ -36,12 +36,23 @@ class ForwardTester:
         Args:
             db_manager: Database manager instance
             initial_bankroll: Starting bankroll amount
+            prediction_service: Optional PredictionService to reuse (keeps its
+                                loaded-model cache across forward tests)
         """
         self.db_manager = db_manager or DatabaseManager()
-        self.prediction_service = PredictionService(self.db_manager)
+        self._prediction_service = prediction_service
         self.initial_bankroll = initial_bankroll
         self.settings = get_settings()
     
+    @property
+    def prediction_service(self):
+        """Prediction service, created on first use (resolve/summary never need it)."""
+        if self._prediction_service is None:
+            # Imported lazily to avoid loading model dependencies when only resolving bets
+            from src.prediction.prediction_service import PredictionService
+            self._prediction_service = PredictionService(self.db_manager)
+        return self._prediction_service
+    
     def setup_today_test(
         self,
         test_date: date,
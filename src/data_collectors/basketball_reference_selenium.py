@@ -1,5 +1,6 @@
 """Basketball Reference scraper using Selenium (bypasses 403 errors)."""
 
+import atexit
 import logging
 import time
 import re
@@ -11,6 +12,7 @@ try:
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.driver_finder import DriverFinder
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
@@ -19,11 +21,38 @@ try:
 except ImportError:
     SELENIUM_AVAILABLE = False
 
+try:
+    from playwright.sync_api import sync_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
 from config.settings import get_settings
 from src.database.db_manager import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
+# Shared ChromeDriver service so collectors reuse one driver process
+_chromedriver_service = None
+
+
+def _get_chromedriver_service(options):
+    """
+    Start (once per process) and return the shared ChromeDriver service.
+    
+    The driver path is resolved the same way webdriver.Chrome does (PATH or
+    Selenium Manager). The service is only shared once it has started, so a
+    failed start is retried by the next collector.
+    """
+    global _chromedriver_service
+    if _chromedriver_service is None:
+        driver_path = DriverFinder(Service(), options).get_driver_path()
+        service = Service(executable_path=driver_path)
+        service.start()
+        atexit.register(service.stop)
+        _chromedriver_service = service
+    return _chromedriver_service
+
 
 class BasketballReferenceSeleniumCollector:
     """Collects NBA game statistics using Selenium to bypass anti-scraping."""
@@ -40,8 +69,26 @@ class BasketballReferenceSeleniumCollector:
         'UTA': 'UTA', 'WAS': 'WAS',
     }
 
-    def __init__(self, db_manager: Optional[DatabaseManager] = None):
-        if not SELENIUM_AVAILABLE:
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+    def __init__(
+        self,
+        db_manager: Optional[DatabaseManager] = None,
+        use_playwright: bool = False,
+        driver: Optional[Any] = None
+    ):
+        """
+        Initialize collector.
+        
+        Args:
+            db_manager: Optional database manager
+            use_playwright: Fetch pages with Playwright + Chromium instead of Selenium
+            driver: Optional already-running WebDriver to reuse (e.g. a session-scoped
+                    test fixture). The caller keeps ownership and must quit it.
+        """
+        if use_playwright and not PLAYWRIGHT_AVAILABLE:
+            raise ImportError("Playwright is not installed. Install with: pip install playwright && playwright install chromium")
+        if not use_playwright and not SELENIUM_AVAILABLE:
             raise ImportError("Selenium is not installed. Install with: pip install selenium")
         
         self.settings = get_settings()
@@ -49,9 +96,16 @@ class BasketballReferenceSeleniumCollector:
         self.db_manager = db_manager or DatabaseManager()
         self.scraping_delay = self.settings.SCRAPING_DELAY
         
-        # Initialize Selenium driver
-        self.driver = None
-        self._init_driver()
+        # Initialize browser (Selenium driver or Playwright page)
+        self.driver = driver
+        self._owns_driver = driver is None
+        self._playwright = None
+        self._browser = None
+        self.page = None
+        if use_playwright:
+            self._init_playwright()
+        elif self.driver is None:
+            self._init_driver()
         
         logger.info("Basketball Reference Selenium Collector initialized")
 
@@ -65,18 +119,23 @@ class BasketballReferenceSeleniumCollector:
             chrome_options.add_argument('--disable-blink-features=AutomationControlled')
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+            chrome_options.add_argument(f'user-agent={self.USER_AGENT}')
             chrome_options.add_argument('--disable-gpu')
             chrome_options.add_argument('--window-size=1920,1080')
             
             # Set page load strategy to 'eager' (don't wait for all resources)
             chrome_options.page_load_strategy = 'eager'
             
-            self.driver = webdriver.Chrome(options=chrome_options)
+            # Open a lightweight session against the shared ChromeDriver service
+            service = _get_chromedriver_service(chrome_options)
+            self.driver = webdriver.Remote(
+                command_executor=service.service_url,
+                options=chrome_options
+            )
             
             # Set longer timeouts
             self.driver.set_page_load_timeout(60)  # 60 seconds for page load
-            self.driver.implicitly_wait(10)  # 10 seconds for element finding
+            # Element lookups use explicit WebDriverWait (no implicit wait)
             
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
@@ -85,13 +144,30 @@ class BasketballReferenceSeleniumCollector:
             logger.error("Make sure ChromeDriver is installed and in PATH")
             raise
 
+    def _init_playwright(self):
+        """Initialize Playwright with a headless Chromium page."""
+        try:
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=True)
+            self.page = self._browser.new_page(user_agent=self.USER_AGENT)
+        except Exception as e:
+            logger.error(f"Failed to initialize Playwright browser: {e}")
+            logger.error("Make sure Chromium is installed with: playwright install chromium")
+            raise
+
     def __del__(self):
         """Clean up driver on deletion."""
-        if self.driver:
+        if self.driver and self._owns_driver:
             try:
                 self.driver.quit()
             except:
                 pass
+        if self._browser:
+            try:
+                self._browser.close()
+                self._playwright.stop()
+            except:
+                pass
 
     def _rate_limit(self):
         """Apply rate limiting delay."""
@@ -113,8 +189,37 @@ class BasketballReferenceSeleniumCollector:
         url = f"{self.base_url}/boxscores/{date_str}0{home_team_abbrev}.html"
         return url
 
+    def _parse_page_source(self, url: str, page_source: Optional[str]) -> Optional[BeautifulSoup]:
+        """Parse fetched page source, returning None if it has no usable content."""
+        # Check if we got actual content
+        if not page_source or len(page_source) < 1000:
+            logger.warning(f"Page source seems empty or too short for {url}")
+            return None
+        
+        soup = BeautifulSoup(page_source, 'html.parser')
+        
+        # Verify we got some content
+        if not soup.find('body'):
+            logger.warning(f"No body tag found in page source for {url}")
+            return None
+        
+        return soup
+
+    def _fetch_page_playwright(self, url: str) -> Optional[BeautifulSoup]:
+        """Fetch and parse a web page using Playwright."""
+        try:
+            self._rate_limit()
+            self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            return self._parse_page_source(url, self.page.content())
+        except Exception as e:
+            logger.error(f"Playwright error fetching {url}: {e}")
+            return None
+
     def _fetch_page(self, url: str) -> Optional[BeautifulSoup]:
-        """Fetch and parse a web page using Selenium."""
+        """Fetch and parse a web page using Selenium (or Playwright if enabled)."""
+        if self.page is not None:
+            return self._fetch_page_playwright(url)
+        
         try:
             self._rate_limit()
             
@@ -147,21 +252,7 @@ class BasketballReferenceSeleniumCollector:
                 logger.debug(f"No tables found immediately for {url}, but continuing...")
             
             # Get page source and parse with BeautifulSoup
-            page_source = self.driver.page_source
-            
-            # Check if we got actual content
-            if not page_source or len(page_source) < 1000:
-                logger.warning(f"Page source seems empty or too short for {url}")
-                return None
-            
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Verify we got some content
-            if not soup.find('body'):
-                logger.warning(f"No body tag found in page source for {url}")
-                return None
-            
-            return soup
+            return self._parse_page_source(url, self.driver.page_source)
             
         except WebDriverException as e:
             logger.error(f"Selenium error fetching {url}: {e}")
@@ -1,7 +1,10 @@
 """NBA API Collector - Proof of Concept for data collection."""
 
+import json
+import threading
 import time
 import logging
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date
 from nba_api.stats.endpoints import (
@@ -31,14 +34,33 @@ class NBAPICollector:
         self.settings = get_settings()
         self.db_manager = db_manager or DatabaseManager()
         self.rate_limit_delay = self.settings.RATE_LIMIT_DELAY
+        # Start time of the most recent call, shared by threads using this collector
+        self._rate_limit_lock = threading.Lock()
+        self._last_call_time = float('-inf')
         self.max_retries = self.settings.MAX_RETRIES
         self.retry_delay = self.settings.RETRY_DELAY
         
+        # Box scores of finished games are cached here (None = no cache)
+        self.cache_dir = (
+            Path(self.settings.NBA_API_CACHE_PATH)
+            if self.settings.NBA_API_CACHE_ENABLED else None
+        )
+        
         logger.info("NBA API Collector initialized")
     
     def _rate_limit(self):
-        """Apply rate limiting delay."""
-        time.sleep(self.rate_limit_delay)
+        """
+        Apply rate limiting delay.
+        
+        Each call waits rate_limit_delay. Calls from threads sharing this
+        collector are also started at least rate_limit_delay apart, so
+        concurrent callers overlap API latency without raising the request rate.
+        """
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            call_time = max(now, self._last_call_time) + self.rate_limit_delay
+            self._last_call_time = call_time
+        time.sleep(call_time - now)
     
     def _retry_api_call(self, func, *args, **kwargs):
         """Retry API call with exponential backoff. Fails faster on timeouts."""
@@ -312,6 +334,62 @@ class NBAPICollector:
             logger.debug(f"Error finding NBA game ID: {e}")
             return None
     
+    def _get_boxscore_data(self, endpoint, game_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Call a per-game box score endpoint and return its payload.
+        
+        With NBA_API_CACHE_ENABLED, payloads of finished games are stored on
+        disk and re-used on later calls instead of hitting the API (final box
+        scores don't change). A game counts as finished once its
+        BoxScoreSummaryV3 payload reports gameStatus 3.
+        
+        Args:
+            endpoint: nba_api endpoint class (BoxScoreSummaryV3 or BoxScoreTraditionalV3)
+            game_id: NBA game ID
+            
+        Returns:
+            Payload dictionary, or None if the API returned nothing
+        """
+        cache_path = self._boxscore_cache_path(endpoint, game_id)
+        if cache_path is not None and cache_path.exists():
+            try:
+                with open(cache_path) as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Ignoring unreadable API cache {cache_path}: {e}")
+        
+        self._rate_limit()
+        response = self._retry_api_call(endpoint, game_id=game_id)
+        if not response:
+            return None
+        data = response.get_dict()
+        
+        if cache_path is not None:
+            if endpoint is BoxScoreSummaryV3:
+                is_final = data.get('boxScoreSummary', {}).get('gameStatus') == 3
+            else:
+                is_final = self._boxscore_cache_path(BoxScoreSummaryV3, game_id).exists()
+            if is_final:
+                self._write_boxscore_cache(cache_path, data)
+        
+        return data
+    
+    def _boxscore_cache_path(self, endpoint, game_id: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{endpoint.__name__}_{game_id}.json"
+    
+    def _write_boxscore_cache(self, path: Path, data: Dict[str, Any]):
+        """Write a payload to the cache (best effort)."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.warning(f"Could not write API cache {path}: {e}")
+    
     def get_game_details(self, game_id: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed game information including scores.
@@ -325,18 +403,12 @@ class NBAPICollector:
         logger.debug(f"Getting game details for {game_id}")
         
         try:
-            self._rate_limit()
-            
             # Get game summary using BoxScoreSummaryV3 (newer API)
-            game_summary = self._retry_api_call(
-                BoxScoreSummaryV3,
-                game_id=game_id
-            )
+            summary_data = self._get_boxscore_data(BoxScoreSummaryV3, game_id)
             
-            if not game_summary:
+            if summary_data is None:
                 return None
             
-            summary_data = game_summary.get_dict()
             if 'boxScoreSummary' not in summary_data:
                 return None
             
@@ -434,19 +506,13 @@ class NBAPICollector:
         logger.debug(f"Collecting all stats for game {game_id}")
         
         try:
-            self._rate_limit()
-            
             # Single API call gets both team and player stats
-            boxscore = self._retry_api_call(
-                BoxScoreTraditionalV3,
-                game_id=game_id
-            )
+            boxscore_data = self._get_boxscore_data(BoxScoreTraditionalV3, game_id)
             
-            if not boxscore:
+            if boxscore_data is None:
                 logger.warning(f"No boxscore data for game {game_id}")
                 return {'team_stats': [], 'player_stats': []}
             
-            boxscore_data = boxscore.get_dict()
             if 'boxScoreTraditional' not in boxscore_data:
                 logger.warning(f"No boxScoreTraditional data for game {game_id}")
                 return {'team_stats': [], 'player_stats': []}
@@ -522,19 +588,13 @@ class NBAPICollector:
         logger.debug(f"Collecting team stats for game {game_id}")
         
         try:
-            self._rate_limit()
-            
             # Get box score using BoxScoreTraditionalV3
-            boxscore = self._retry_api_call(
-                BoxScoreTraditionalV3,
-                game_id=game_id
-            )
+            boxscore_data = self._get_boxscore_data(BoxScoreTraditionalV3, game_id)
             
-            if not boxscore:
+            if boxscore_data is None:
                 logger.warning(f"No boxscore data for game {game_id}")
                 return []
             
-            boxscore_data = boxscore.get_dict()
             if 'boxScoreTraditional' not in boxscore_data:
                 logger.warning(f"No boxScoreTraditional data for game {game_id}")
                 return []
@@ -715,19 +775,13 @@ class NBAPICollector:
         logger.debug(f"Collecting player stats for game {game_id}")
         
         try:
-            self._rate_limit()
-            
             # Get box score using BoxScoreTraditionalV3
-            boxscore = self._retry_api_call(
-                BoxScoreTraditionalV3,
-                game_id=game_id
-            )
+            boxscore_data = self._get_boxscore_data(BoxScoreTraditionalV3, game_id)
             
-            if not boxscore:
+            if boxscore_data is None:
                 logger.warning(f"No boxscore data for game {game_id}")
                 return []
             
-            boxscore_data = boxscore.get_dict()
             if 'boxScoreTraditional' not in boxscore_data:
                 logger.warning(f"No boxScoreTraditional data for game {game_id}")
                 return []
@@ -4,7 +4,7 @@ import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker, Session, selectinload
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from contextlib import contextmanager
 
@@ -194,6 +194,34 @@ class DatabaseManager:
             
             return query.all()
 
+    def get_games_with_stats(
+        self,
+        season: str,
+        game_status: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Game]:
+        """
+        Get a season's games (oldest first) with team_stats and player_stats loaded.
+        
+        The stats are fetched with one SELECT per relationship (selectinload)
+        rather than one per game, and remain usable after the session closes.
+        """
+        with self.get_session() as session:
+            query = session.query(Game).options(
+                selectinload(Game.team_stats),
+                selectinload(Game.player_stats)
+            ).filter(Game.season == season)
+            
+            if game_status:
+                query = query.filter(Game.game_status == game_status)
+            
+            query = query.order_by(Game.game_date, Game.game_id)
+            
+            if limit:
+                query = query.limit(limit)
+            
+            return query.all()
+
     # Team stats operations
     def insert_team_stats(self, stats_data: Dict[str, Any]) -> TeamStats:
         """Insert or update team stats for a game."""
@@ -68,6 +68,7 @@ class Game(Base):
         Index('idx_home_team_date', 'home_team_id', 'game_date'),
         Index('idx_away_team_date', 'away_team_id', 'game_date'),
         Index('idx_season_type', 'season', 'season_type'),
+        Index('idx_season_status', 'season', 'game_status'),
     )
 
     def __repr__(self):
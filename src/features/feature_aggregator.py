@@ -345,6 +345,11 @@ class FeatureAggregator:
             features: Dictionary of feature names and values
         """
         try:
+            # Team features get the game's team ids; look the game up once
+            game = None
+            if any(name.startswith(('home_', 'away_')) for name in features):
+                game = self.db_manager.get_game(game_id)
+            
             for feature_name, feature_value in features.items():
                 # Determine category
                 if feature_name.startswith('home_') or feature_name.startswith('away_'):
@@ -352,10 +357,8 @@ class FeatureAggregator:
                     # Extract team_id from feature name if possible
                     team_id = None
                     if feature_name.startswith('home_'):
-                        game = self.db_manager.get_game(game_id)
                         team_id = game.home_team_id if game else None
                     elif feature_name.startswith('away_'):
-                        game = self.db_manager.get_game(game_id)
                         team_id = game.away_team_id if game else None
                 elif feature_name.startswith('h2h_') or 'differential' in feature_name:
                     category = 'matchup'
@@ -948,32 +948,37 @@ class TeamFeatureCalculator:
         # Get decay rate (0.0 = no decay = simple average)
         decay_rate = self.settings.ROLLING_STATS_DECAY_RATE if use_exponential_decay else 0.0
         
-        def calculate_weighted_average(values: List, weights: List[float]) -> Optional[float]:
+        def to_array(values: List) -> np.ndarray:
+            """Convert a list of statistic values to float64, None -> NaN."""
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        
+        def calculate_weighted_average(values: List, weights: np.ndarray) -> Optional[float]:
             """
             Calculate weighted average, handling None/NaN values.
             
             Args:
                 values: List of statistic values
-                weights: List of corresponding weights
+                weights: Array of corresponding weights
                 
             Returns:
                 Weighted average or None if no valid values
             """
-            if not values or all(v is None for v in values):
-                return None
-            
-            # Filter out None values
-            valid_pairs = [(v, w) for v, w in zip(values, weights) if v is not None]
-            if not valid_pairs:
-                return None
-            
-            weighted_sum = sum(float(v) * w for v, w in valid_pairs)
-            weight_sum = sum(w for _, w in valid_pairs)
+            values = to_array(values)
+            valid = ~np.isnan(values)
+            weight_sum = weights[valid].sum()
             
             if weight_sum == 0:
                 return None
             
-            return weighted_sum / weight_sum
+            return values[valid] @ weights[valid] / weight_sum
+        
+        def calculate_weighted_total(values: List, weights: np.ndarray, positive_only: bool = False) -> np.float64:
+            """Σ(value_i * w_i) over present values (optionally only values > 0)."""
+            values = to_array(values)
+            valid = ~np.isnan(values)
+            if positive_only:
+                valid &= values > 0
+            return values[valid] @ weights[valid]
         
         # Try TeamStats first (more detailed)
         stats_history = self.db_manager.get_team_stats_history(
@@ -1013,7 +1018,7 @@ class TeamFeatureCalculator:
             # Calculate weights using exponential decay
             # Most recent game (index 0) has games_ago=0, next has games_ago=1, etc.
             num_games = len(finished_games)
-            weights = [np.exp(-decay_rate * i) for i in range(num_games)]
+            weights = np.exp(-decay_rate * np.arange(num_games))
             
             # Extract stats
             points_list = []
@@ -1068,7 +1073,7 @@ class TeamFeatureCalculator:
         
         # Calculate weights using exponential decay
         num_games = len(stats_history)
-        weights = [np.exp(-decay_rate * i) for i in range(num_games)]
+        weights = np.exp(-decay_rate * np.arange(num_games))
         
         # Extract stats for weighted calculation
         points_list = [s.points for s in stats_history]
@@ -1115,38 +1120,14 @@ class TeamFeatureCalculator:
         
         # For percentages, calculate weighted totals first, then divide
         # This ensures proper weighting (games with more attempts get more weight)
-        total_fg_made_weighted = sum(
-            fg_made_list[i] * weights[i] 
-            for i in range(num_games) 
-            if fg_made_list[i] is not None
-        )
-        total_fg_attempted_weighted = sum(
-            fg_attempted_list[i] * weights[i] 
-            for i in range(num_games) 
-            if fg_attempted_list[i] is not None and fg_attempted_list[i] > 0
-        )
+        total_fg_made_weighted = calculate_weighted_total(fg_made_list, weights)
+        total_fg_attempted_weighted = calculate_weighted_total(fg_attempted_list, weights, positive_only=True)
         
-        total_three_made_weighted = sum(
-            three_made_list[i] * weights[i] 
-            for i in range(num_games) 
-            if three_made_list[i] is not None
-        )
-        total_three_attempted_weighted = sum(
-            three_attempted_list[i] * weights[i] 
-            for i in range(num_games) 
-            if three_attempted_list[i] is not None and three_attempted_list[i] > 0
-        )
+        total_three_made_weighted = calculate_weighted_total(three_made_list, weights)
+        total_three_attempted_weighted = calculate_weighted_total(three_attempted_list, weights, positive_only=True)
         
-        total_ft_made_weighted = sum(
-            ft_made_list[i] * weights[i] 
-            for i in range(num_games) 
-            if ft_made_list[i] is not None
-        )
-        total_ft_attempted_weighted = sum(
-            ft_attempted_list[i] * weights[i] 
-            for i in range(num_games) 
-            if ft_attempted_list[i] is not None and ft_attempted_list[i] > 0
-        )
+        total_ft_made_weighted = calculate_weighted_total(ft_made_list, weights)
+        total_ft_attempted_weighted = calculate_weighted_total(ft_attempted_list, weights, positive_only=True)
         
         # Calculate percentages from weighted totals
         fg_pct = (
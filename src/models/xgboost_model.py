@@ -1,12 +1,15 @@
 """XGBoost model implementation for NBA game prediction."""
 
+import heapq
 import logging
 import json
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, Optional, Union, Tuple
 import pandas as pd
 import numpy as np
 import joblib
+import xgboost as xgb
 from xgboost import XGBClassifier, XGBRegressor
 
 from src.models.base_model import BaseModel
@@ -128,6 +131,8 @@ class XGBoostModel(BaseModel):
         fit_params = {}
         if X_val is not None and y_val is not None:
             fit_params['eval_set'] = [(X_val, y_val)]
+            # Don't print the eval metric for every boosting round (override via kwargs)
+            fit_params['verbose'] = False
             # Note: early_stopping_rounds is not supported in XGBoost 3.x fit() method
             # Remove it from kwargs if present (it was used in older versions)
             kwargs.pop('early_stopping_rounds', None)
@@ -205,6 +210,109 @@ class XGBoostModel(BaseModel):
         
         return predictions
     
+    def train_dmatrix(
+        self,
+        dtrain: xgb.DMatrix,
+        dval: Optional[xgb.DMatrix] = None
+    ) -> Dict[str, Any]:
+        """
+        Train on prebuilt DMatrix objects (labels set on the DMatrix).
+        
+        Skips the DataFrame/ndarray conversion in train() when the same data
+        is trained on repeatedly. The booster is loaded back into the sklearn
+        model, so predict(), save() and load() work as usual afterwards.
+        
+        Args:
+            dtrain: Training DMatrix with labels
+            dval: Optional validation DMatrix with labels
+            
+        Returns:
+            Dictionary with training metrics and information
+        """
+        if dtrain.feature_names is not None:
+            self.set_feature_names(list(dtrain.feature_names))
+        
+        xgb_params = {k: v for k, v in self.model.get_xgb_params().items() if v is not None}
+        evals = [(dval, 'val')] if dval is not None else []
+        
+        logger.info(f"Training {self.task_type} model '{self.model_name}' on {dtrain.num_row()} samples (DMatrix)...")
+        
+        booster = xgb.train(
+            xgb_params,
+            dtrain,
+            num_boost_round=self.params['n_estimators'],
+            evals=evals,
+            verbose_eval=False
+        )
+        self.model.load_model(bytearray(booster.save_raw(raw_format='json')))
+        self.is_trained = True
+        
+        train_metrics = self._calculate_metrics(
+            dtrain.get_label(), self._predict_booster(dtrain), dtrain, prefix="train"
+        )
+        metrics = {
+            'status': 'trained',
+            'n_samples': dtrain.num_row(),
+            'n_features': dtrain.num_col(),
+            **train_metrics
+        }
+        
+        if dval is not None:
+            val_metrics = self._calculate_metrics(
+                dval.get_label(), self._predict_booster(dval), dval, prefix="val"
+            )
+            metrics.update(val_metrics)
+        
+        self.update_metadata(
+            n_samples=dtrain.num_row(),
+            n_features=dtrain.num_col(),
+            training_completed=True
+        )
+        
+        logger.info(f"Model '{self.model_name}' training completed. Train accuracy: {train_metrics.get('train_accuracy', 'N/A')}")
+        
+        return metrics
+    
+    def predict_dmatrix(
+        self,
+        dtest: xgb.DMatrix,
+        return_proba: bool = False
+    ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Make predictions on a prebuilt DMatrix.
+        
+        Args:
+            dtest: Features to predict on
+            return_proba: If True, also return prediction probabilities (classification only)
+            
+        Returns:
+            Predictions array, or tuple of (predictions, probabilities) if return_proba=True
+        """
+        self.validate_trained()
+        
+        if self.feature_names is not None and list(dtest.feature_names or []) != self.feature_names:
+            raise ValueError(
+                f"Feature names don't match. Expected {len(self.feature_names)} features, "
+                f"got {dtest.num_col()}. Expected: {self.feature_names[:5]}..., "
+                f"Got: {list(dtest.feature_names or [])[:5]}..."
+            )
+        
+        if return_proba:
+            if self.task_type != "classification":
+                raise ValueError("return_proba=True only supported for classification tasks")
+            positive = self.model.get_booster().predict(dtest)
+            probabilities = np.column_stack([1.0 - positive, positive])
+            return (positive > 0.5).astype(int), probabilities
+        
+        return self._predict_booster(dtest)
+    
+    def _predict_booster(self, dmatrix: xgb.DMatrix) -> np.ndarray:
+        """Predict labels/targets on a DMatrix with the underlying booster."""
+        raw = self.model.get_booster().predict(dmatrix)
+        if self.task_type == "classification":
+            return (raw > 0.5).astype(int)
+        return raw
+    
     def save(self, filepath: Optional[Union[str, Path]] = None) -> Path:
         """
         Save the model to disk.
@@ -345,7 +453,7 @@ class XGBoostModel(BaseModel):
             if self.feature_names is not None:
                 # Create feature importance dict
                 importance_dict = dict(zip(self.feature_names, importances))
-                top_features = sorted(importance_dict.items(), key=lambda x: x[1], reverse=True)[:10]
+                top_features = heapq.nlargest(10, importance_dict.items(), key=itemgetter(1))
                 metrics[f'{prefix}_top_features'] = {name: float(imp) for name, imp in top_features}
         
         return metrics
@@ -3,7 +3,7 @@
 import logging
 import pandas as pd
 import numpy as np
-from typing import Tuple, Optional, Dict, Any, List
+from typing import Tuple, Optional, Dict, Any, List, Sequence
 from datetime import date
 from src.database.db_manager import DatabaseManager
 from src.database.models import Game, Feature, TeamRollingFeatures, GameMatchupFeatures
@@ -29,9 +29,9 @@ class DataLoader:
     
     def load_all_data(
         self,
-        train_seasons: Optional[List[str]] = None,
-        val_seasons: Optional[List[str]] = None,
-        test_seasons: Optional[List[str]] = None,
+        train_seasons: Optional[Sequence[str]] = None,
+        val_seasons: Optional[Sequence[str]] = None,
+        test_seasons: Optional[Sequence[str]] = None,
         min_features: int = 40
     ) -> Dict[str, Any]:
         """
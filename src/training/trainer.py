@@ -7,6 +7,7 @@ from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from sklearn.model_selection import ParameterSampler
 
 from src.training.data_loader import DataLoader
@@ -51,6 +52,9 @@ class ModelTrainer:
         self.settings = get_settings()
         self.trained_models: Dict[str, BaseModel] = {}
         self.training_results: Dict[str, Dict[str, Any]] = {}
+        # JSON-lines file for training records. None = records are only
+        # written for saved models (to a timestamped file in MODELS_DIR)
+        self.records_path: Optional[Path] = None
         
         logger.info("ModelTrainer initialized")
     
@@ -77,7 +81,8 @@ class ModelTrainer:
             y_val: Optional validation labels/targets
             X_test: Optional test features
             y_test: Optional test labels/targets
-            save_model: Whether to save the trained model
+            save_model: Whether to save the trained model. Saved models (or any
+                        model once records_path is set) get a training record
             **train_kwargs: Additional training parameters
             
         Returns:
@@ -129,6 +134,9 @@ class ModelTrainer:
             results['model_path'] = str(model_path)
             logger.info(f"Model saved to {model_path}")
         
+        if save_model or self.records_path is not None:
+            self.append_training_record(results)
+        
         return results
     
     def train_with_data_loader(
@@ -138,6 +146,7 @@ class ModelTrainer:
         val_seasons: Optional[List[str]] = None,
         test_seasons: Optional[List[str]] = None,
         save_model: bool = True,
+        data: Optional[Dict[str, Any]] = None,
         **train_kwargs
     ) -> Dict[str, Any]:
         """
@@ -149,17 +158,20 @@ class ModelTrainer:
             val_seasons: Seasons for validation
             test_seasons: Seasons for testing
             save_model: Whether to save the trained model
+            data: Optional output of DataLoader.load_all_data to reuse
+                  instead of loading from the database again
             **train_kwargs: Additional training parameters
             
         Returns:
             Dictionary with training and evaluation results
         """
         # Load data
-        data = self.data_loader.load_all_data(
-            train_seasons=train_seasons,
-            val_seasons=val_seasons,
-            test_seasons=test_seasons
-        )
+        if data is None:
+            data = self.data_loader.load_all_data(
+                train_seasons=train_seasons,
+                val_seasons=val_seasons,
+                test_seasons=test_seasons
+            )
         
         # Select appropriate target based on task type
         if model.task_type == "classification":
@@ -199,11 +211,53 @@ class ModelTrainer:
             **train_kwargs
         )
     
+    def train_models_with_data_loader(
+        self,
+        models: List[BaseModel],
+        train_seasons: Optional[List[str]] = None,
+        val_seasons: Optional[List[str]] = None,
+        test_seasons: Optional[List[str]] = None,
+        save_model: bool = True,
+        **train_kwargs
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Train several models (e.g. classifier and regressor) on one data load.
+        
+        Features and both targets come from a single DataLoader pass, so the
+        database is read once no matter how many models are trained.
+        
+        Args:
+            models: Model instances to train
+            train_seasons: Seasons for training
+            val_seasons: Seasons for validation
+            test_seasons: Seasons for testing
+            save_model: Whether to save the trained models
+            **train_kwargs: Additional training parameters
+            
+        Returns:
+            Dictionary mapping model name to its training and evaluation results
+        """
+        data = self.data_loader.load_all_data(
+            train_seasons=train_seasons,
+            val_seasons=val_seasons,
+            test_seasons=test_seasons
+        )
+        
+        return {
+            model.model_name: self.train_with_data_loader(
+                model,
+                save_model=save_model,
+                data=data,
+                **train_kwargs
+            )
+            for model in models
+        }
+    
     def hyperparameter_tuning(
         self,
         model_class: type,
         model_name_prefix: str,
-        param_distributions: Dict[str, List[Any]],
+        param_distributions: Dict[str, Any],
         X_train: pd.DataFrame,
         y_train: pd.Series,
         X_val: Optional[pd.DataFrame] = None,
@@ -211,15 +265,26 @@ class ModelTrainer:
         n_iter: int = 10,
         task_type: str = "classification",
         scoring_metric: Optional[str] = None,
+        search: str = "random",
+        min_resources: int = 20,
+        max_resources: int = 300,
+        factor: int = 3,
+        n_workers: int = 1,
         **base_params
     ) -> Tuple[BaseModel, Dict[str, Any]]:
         """
         Perform random search hyperparameter tuning.
         
+        With search="halving", the sampled configs are instead run through
+        successive halving on n_estimators: every config is trained with
+        min_resources trees, the best 1/factor are kept, their boosters are
+        continued to factor times as many trees, and so on up to max_resources.
+        
         Args:
             model_class: Model class to instantiate
             model_name_prefix: Prefix for model names during tuning
-            param_distributions: Dictionary of parameter distributions for random search
+            param_distributions: Dictionary mapping parameter names to lists of values
+                                 or scipy.stats distributions (anything with rvs())
             X_train: Training features
             y_train: Training labels/targets
             X_val: Optional validation features
@@ -228,12 +293,21 @@ class ModelTrainer:
             task_type: 'classification' or 'regression'
             scoring_metric: Metric to optimize (e.g., 'val_accuracy', 'val_rmse')
                           If None, uses default for task type
+            search: 'random' (train every config fully) or 'halving'
+            min_resources: Trees per config in the first halving rung
+            max_resources: Trees per config in the last halving rung
+            factor: Fraction (1/factor) of configs kept per halving rung
+            n_workers: Number of configs trained concurrently (threads). Pair
+                       with n_jobs=1 in base_params so workers don't oversubscribe
             **base_params: Base parameters to use for all models
             
         Returns:
             Tuple of (best_model, best_params)
         """
-        logger.info(f"Starting hyperparameter tuning: {n_iter} iterations")
+        if search not in ("random", "halving"):
+            raise ValueError(f"Invalid search: {search}. Must be 'random' or 'halving'")
+        
+        logger.info(f"Starting hyperparameter tuning: {n_iter} iterations ({search} search)")
         
         # Determine scoring metric
         if scoring_metric is None:
@@ -259,38 +333,29 @@ class ModelTrainer:
         
         logger.info(f"Testing {len(param_combinations)} parameter combinations...")
         
-        for i, params in enumerate(param_combinations):
-            # Combine base params with sampled params
-            combined_params = {**base_params, **params}
-            
-            # Create model name
-            model_name = f"{model_name_prefix}_tune_{i+1}"
-            
-            try:
-                # Create and train model
-                model = model_class(
-                    model_name=model_name,
-                    task_type=task_type,
-                    **combined_params
-                )
-                
-                # Train model
-                train_results = model.train(
-                    X_train, y_train,
-                    X_val=X_val, y_val=y_val
+        if search == "halving":
+            best_model, best_params, best_results, best_score = self._successive_halving(
+                model_class, model_name_prefix, param_combinations, base_params,
+                X_train, y_train, X_val, y_val, task_type,
+                scoring_metric, higher_is_better,
+                min_resources, max_resources, factor, n_workers
+            )
+        else:
+            # XGBoost releases the GIL while boosting, so threads train configs
+            # concurrently and share X_train instead of copying it per process
+            outcomes = Parallel(n_jobs=n_workers, prefer="threads")(
+                delayed(self._fit_tuning_config)(
+                    model_class, f"{model_name_prefix}_tune_{i+1}", task_type,
+                    {**base_params, **params},
+                    X_train, y_train, X_val, y_val, scoring_metric
                 )
-                
-                # Get score
-                if scoring_metric in train_results:
-                    score = train_results[scoring_metric]
-                else:
-                    # Fallback to first available metric
-                    available_metrics = [k for k in train_results.keys() if 'val_' in k or 'train_' in k]
-                    if available_metrics:
-                        score = train_results[available_metrics[0]]
-                    else:
-                        logger.warning(f"No suitable metric found for iteration {i+1}")
-                        continue
+                for i, params in enumerate(param_combinations)
+            )
+            
+            for i, outcome in enumerate(outcomes):
+                if outcome is None:
+                    continue
+                model, combined_params, train_results, score = outcome
                 
                 # Check if this is the best model
                 is_better = (score > best_score) if higher_is_better else (score < best_score)
@@ -302,10 +367,6 @@ class ModelTrainer:
                     logger.info(f"Iteration {i+1}/{n_iter}: New best {scoring_metric}={score:.4f}")
                 else:
                     logger.debug(f"Iteration {i+1}/{n_iter}: {scoring_metric}={score:.4f} (best: {best_score:.4f})")
-                    
-            except Exception as e:
-                logger.warning(f"Iteration {i+1}/{n_iter} failed: {e}")
-                continue
         
         if best_model is None:
             raise ValueError("No successful model training during hyperparameter tuning")
@@ -325,6 +386,8 @@ class ModelTrainer:
             'val_samples': len(X_val) if X_val is not None else 0,
         }
         self.training_results[best_model.model_name] = best_model_results
+        if self.records_path is not None:
+            self.append_training_record(best_model_results)
         
         logger.info(f"Hyperparameter tuning complete. Best {scoring_metric}: {best_score:.4f}")
         logger.info(f"Best parameters: {best_params}")
@@ -336,6 +399,159 @@ class ModelTrainer:
             'training_results': best_results
         }
     
+    def _extract_score(
+        self,
+        train_results: Dict[str, Any],
+        scoring_metric: str
+    ) -> Optional[float]:
+        """Get the tuning score from training results, falling back to the first metric."""
+        if scoring_metric in train_results:
+            return train_results[scoring_metric]
+        
+        # Fallback to first available metric
+        available_metrics = [k for k in train_results.keys() if 'val_' in k or 'train_' in k]
+        if available_metrics:
+            return train_results[available_metrics[0]]
+        return None
+    
+    def _fit_tuning_config(
+        self,
+        model_class: type,
+        model_name: str,
+        task_type: str,
+        params: Dict[str, Any],
+        X_train: pd.DataFrame,
+        y_train: pd.Series,
+        X_val: Optional[pd.DataFrame],
+        y_val: Optional[pd.Series],
+        scoring_metric: str,
+        **fit_kwargs
+    ) -> Optional[Tuple[BaseModel, Dict[str, Any], Dict[str, Any], float]]:
+        """
+        Train one tuning config.
+        
+        Returns:
+            Tuple of (model, params, train_results, score), or None if the
+            config failed or produced no usable metric
+        """
+        try:
+            model = model_class(
+                model_name=model_name,
+                task_type=task_type,
+                **params
+            )
+            train_results = model.train(
+                X_train, y_train,
+                X_val=X_val, y_val=y_val,
+                **fit_kwargs
+            )
+        except Exception as e:
+            logger.warning(f"Tuning config '{model_name}' failed: {e}")
+            return None
+        
+        score = self._extract_score(train_results, scoring_metric)
+        if score is None:
+            logger.warning(f"No suitable metric found for '{model_name}'")
+            return None
+        
+        return model, params, train_results, score
+    
+    def _successive_halving(
+        self,
+        model_class: type,
+        model_name_prefix: str,
+        param_combinations: List[Dict[str, Any]],
+        base_params: Dict[str, Any],
+        X_train: pd.DataFrame,
+        y_train: pd.Series,
+        X_val: Optional[pd.DataFrame],
+        y_val: Optional[pd.Series],
+        task_type: str,
+        scoring_metric: str,
+        higher_is_better: bool,
+        min_resources: int,
+        max_resources: int,
+        factor: int,
+        n_workers: int = 1
+    ) -> Tuple[Optional[BaseModel], Optional[Dict[str, Any]], Optional[Dict[str, Any]], float]:
+        """
+        Successive halving over n_estimators.
+        
+        XGBoost survivors continue from their previous booster (xgb_model=...)
+        so each rung only trains the additional trees. Continued rounds are
+        seeded per iteration, so the result does not depend on n_workers.
+        
+        Returns:
+            Tuple of (best_model, best_params, best_results, best_score)
+        """
+        candidates = [(i, {**base_params, **params}) for i, params in enumerate(param_combinations)]
+        models: Dict[int, BaseModel] = {}
+        trained_rounds: Dict[int, int] = {}
+        scored: List[Tuple[float, int, Dict[str, Any], Dict[str, Any]]] = []
+        resources = min(min_resources, max_resources)
+        
+        while candidates:
+            logger.info(f"Halving rung: {len(candidates)} configs x {resources} trees")
+            scored = []
+            
+            jobs = []
+            for i, combined_params in candidates:
+                prev_model = models.get(i)
+                new_rounds = resources - trained_rounds.get(i, 0)
+                
+                fit_kwargs = {}
+                rung_params = {}
+                if prev_model is not None and hasattr(prev_model.model, 'get_booster'):
+                    # Continue the existing booster instead of retraining from scratch
+                    fit_kwargs['xgb_model'] = prev_model.model.get_booster()
+                    # XGBoost's RNG is thread-local, so a continued booster would
+                    # sample from whichever worker thread picked it up. Seeding
+                    # from the iteration number keeps results independent of n_workers
+                    rung_params['seed_per_iteration'] = True
+                else:
+                    new_rounds = resources
+                
+                jobs.append(delayed(self._fit_tuning_config)(
+                    model_class, f"{model_name_prefix}_tune_{i+1}", task_type,
+                    {**combined_params, **rung_params, 'n_estimators': new_rounds},
+                    X_train, y_train, X_val, y_val, scoring_metric,
+                    **fit_kwargs
+                ))
+            
+            outcomes = Parallel(n_jobs=n_workers, prefer="threads")(jobs)
+            
+            for (i, combined_params), outcome in zip(candidates, outcomes):
+                if outcome is None:
+                    continue
+                model, _, train_results, score = outcome
+                models[i] = model
+                trained_rounds[i] = resources
+                scored.append((score, i, combined_params, train_results))
+            
+            scored.sort(key=lambda item: item[0], reverse=higher_is_better)
+            if resources >= max_resources or not scored:
+                break
+            
+            n_keep = max(1, int(np.ceil(len(scored) / factor)))
+            candidates = [(i, params) for _, i, params, _ in scored[:n_keep]]
+            resources = min(resources * factor, max_resources)
+        
+        if not scored:
+            return None, None, None, float('-inf') if higher_is_better else float('inf')
+        
+        best_score, best_i, best_params, best_results = scored[0]
+        best_model = models[best_i]
+        
+        # The booster holds all rounds; make the params say so for later refits
+        best_params = {**best_params, 'n_estimators': trained_rounds[best_i]}
+        if hasattr(best_model, 'params'):
+            best_model.params['n_estimators'] = trained_rounds[best_i]
+        if hasattr(best_model.model, 'set_params'):
+            best_model.model.set_params(n_estimators=trained_rounds[best_i])
+        
+        logger.info(f"Halving complete: best {scoring_metric}={best_score:.4f} with {trained_rounds[best_i]} trees")
+        return best_model, best_params, best_results, best_score
+    
     def compare_trained_models(
         self,
         task_type: Optional[str] = None,
@@ -423,6 +639,46 @@ class ModelTrainer:
         
         print_model_comparison(metrics_dict, task_type, metric)
     
+    def default_records_path(self) -> Path:
+        """Get a new timestamped training records path in MODELS_DIR."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return Path(self.settings.MODELS_DIR) / f"training_records_{timestamp}.jsonl"
+    
+    def append_training_record(
+        self,
+        results: Dict[str, Any],
+        filepath: Optional[Path] = None
+    ) -> Path:
+        """
+        Append one trained model's results as a JSON line.
+        
+        Records are streamed as models finish, so a crash mid-run keeps
+        everything trained so far. Load with pd.read_json(path, lines=True).
+        
+        Args:
+            results: Results dictionary for a single model
+            filepath: Optional filepath. If None, uses this trainer's records file.
+            
+        Returns:
+            Path the record was appended to
+        """
+        if filepath is not None:
+            self.records_path = Path(filepath)
+        elif self.records_path is None:
+            self.records_path = self.default_records_path()
+        
+        record = {
+            'timestamp': datetime.now().isoformat(),
+            **self._convert_to_json_serializable(results)
+        }
+        
+        self.records_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.records_path, 'a') as f:
+            f.write(json.dumps(record, default=str) + "\n")
+        
+        logger.debug(f"Training record for {results.get('model_name')} appended to {self.records_path}")
+        return self.records_path
+    
     def save_training_summary(
         self,
         filepath: Optional[Path] = None
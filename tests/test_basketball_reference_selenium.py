@@ -0,0 +1,62 @@
+"""Unit tests for the Selenium Basketball Reference collector."""
+
+import unittest
+from unittest.mock import Mock, patch
+
+from src.data_collectors import basketball_reference_selenium
+from src.data_collectors.basketball_reference_selenium import BasketballReferenceSeleniumCollector
+from src.database.db_manager import DatabaseManager
+
+
+@unittest.skipUnless(basketball_reference_selenium.SELENIUM_AVAILABLE, "Selenium is not installed")
+class TestSeleniumDriverInit(unittest.TestCase):
+    """Test cases for the shared ChromeDriver service."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.db_manager = Mock(spec=DatabaseManager)
+        basketball_reference_selenium._chromedriver_service = None
+        self.addCleanup(setattr, basketball_reference_selenium, '_chromedriver_service', None)
+
+    @patch('src.data_collectors.basketball_reference_selenium.atexit.register')
+    @patch('src.data_collectors.basketball_reference_selenium.webdriver.Remote')
+    @patch('src.data_collectors.basketball_reference_selenium.Service.start')
+    @patch('src.data_collectors.basketball_reference_selenium.DriverFinder.get_driver_path')
+    def test_init_driver_uses_resolved_driver_path(self, mock_driver_path, mock_start, mock_remote, mock_register):
+        """Test the service is started with the resolved path and shared by later collectors."""
+        mock_driver_path.return_value = '/usr/local/bin/chromedriver'
+
+        collector = BasketballReferenceSeleniumCollector(db_manager=self.db_manager)
+        BasketballReferenceSeleniumCollector(db_manager=self.db_manager)
+
+        service = basketball_reference_selenium._chromedriver_service
+        self.assertEqual(service.path, '/usr/local/bin/chromedriver')
+        self.assertEqual(mock_start.call_count, 1)
+        mock_register.assert_called_once_with(service.stop)
+        self.assertEqual(mock_remote.call_count, 2)
+        self.assertEqual(mock_remote.call_args.kwargs['command_executor'], service.service_url)
+        self.assertIs(collector.driver, mock_remote.return_value)
+
+    @patch('src.data_collectors.basketball_reference_selenium.atexit.register')
+    @patch('src.data_collectors.basketball_reference_selenium.webdriver.Remote')
+    @patch('src.data_collectors.basketball_reference_selenium.Service.start')
+    @patch('src.data_collectors.basketball_reference_selenium.DriverFinder.get_driver_path')
+    def test_failed_start_is_not_shared(self, mock_driver_path, mock_start, mock_remote, mock_register):
+        """Test a service that failed to start is retried instead of reused."""
+        mock_driver_path.return_value = '/usr/local/bin/chromedriver'
+        mock_start.side_effect = [basketball_reference_selenium.WebDriverException("boom"), None]
+
+        with self.assertRaises(basketball_reference_selenium.WebDriverException):
+            BasketballReferenceSeleniumCollector(db_manager=self.db_manager)
+        self.assertIsNone(basketball_reference_selenium._chromedriver_service)
+        mock_register.assert_not_called()
+        mock_remote.assert_not_called()
+
+        BasketballReferenceSeleniumCollector(db_manager=self.db_manager)
+        self.assertEqual(mock_start.call_count, 2)
+        self.assertIsNotNone(basketball_reference_selenium._chromedriver_service)
+        mock_remote.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
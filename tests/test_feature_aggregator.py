@@ -21,6 +21,10 @@ class TestFeatureAggregator(unittest.TestCase):
         """Set up test fixtures for the class."""
         cls.db_manager = DatabaseManager()
         cls.aggregator = FeatureAggregator(db_manager=cls.db_manager)
+        
+        # Known game shared by the feature vector tests (fetched once)
+        cls.game_id = '0022401199'
+        cls.game = cls.db_manager.get_game(cls.game_id)
     
     def test_init(self):
         """Test aggregator initialization."""
@@ -33,8 +37,8 @@ class TestFeatureAggregator(unittest.TestCase):
     def test_create_feature_vector_structure(self):
         """Test that feature vector has correct structure."""
         # Use a known game ID
-        game_id = '0022401199'
-        game = self.db_manager.get_game(game_id)
+        game_id = self.game_id
+        game = self.game
         
         if not game:
             self.skipTest(f"Game {game_id} not found in database")
@@ -76,8 +80,8 @@ class TestFeatureAggregator(unittest.TestCase):
     
     def test_feature_vector_has_team_features(self):
         """Test that team features are included."""
-        game_id = '0022401199'
-        game = self.db_manager.get_game(game_id)
+        game_id = self.game_id
+        game = self.game
         
         if not game:
             self.skipTest(f"Game {game_id} not found in database")
@@ -107,8 +111,8 @@ class TestFeatureAggregator(unittest.TestCase):
     
     def test_feature_vector_has_matchup_features(self):
         """Test that matchup features are included."""
-        game_id = '0022401199'
-        game = self.db_manager.get_game(game_id)
+        game_id = self.game_id
+        game = self.game
         
         if not game:
             self.skipTest(f"Game {game_id} not found in database")
@@ -134,8 +138,8 @@ class TestFeatureAggregator(unittest.TestCase):
     
     def test_feature_vector_has_contextual_features(self):
         """Test that contextual features are included."""
-        game_id = '0022401199'
-        game = self.db_manager.get_game(game_id)
+        game_id = self.game_id
+        game = self.game
         
         if not game:
             self.skipTest(f"Game {game_id} not found in database")
@@ -162,8 +166,8 @@ class TestFeatureAggregator(unittest.TestCase):
     
     def test_save_and_retrieve_features(self):
         """Test feature caching functionality."""
-        game_id = '0022401199'
-        game = self.db_manager.get_game(game_id)
+        game_id = self.game_id
+        game = self.game
         
         if not game:
             self.skipTest(f"Game {game_id} not found in database")
@@ -29,7 +29,21 @@ class TestNBAPICollector(unittest.TestCase):
         elapsed = time.time() - start
         # Should wait at least the rate limit delay
         self.assertGreaterEqual(elapsed, self.collector.rate_limit_delay * 0.9)
-    
+
+    @patch('src.data_collectors.nba_api_collector.time.sleep')
+    @patch('src.data_collectors.nba_api_collector.time.monotonic')
+    def test_rate_limit_spaces_concurrent_calls(self, mock_monotonic, mock_sleep):
+        """Test calls arriving together are spaced out by the rate limit delay."""
+        self.collector.rate_limit_delay = 1.0
+
+        # Three callers at the same instant, then one after the queue has drained
+        mock_monotonic.side_effect = [100.0, 100.0, 100.0, 110.0]
+        for _ in range(4):
+            self.collector._rate_limit()
+
+        waits = [c.args[0] for c in mock_sleep.call_args_list]
+        self.assertEqual(waits, [1.0, 2.0, 3.0, 1.0])
+
     @patch('src.data_collectors.nba_api_collector.teams')
     def test_collect_all_teams(self, mock_teams):
         """Test team collection."""
@@ -154,6 +168,58 @@ class TestNBAPICollector(unittest.TestCase):
         
         # Should return None for players with no stats
         self.assertIsNone(result)
+    
+    @patch('src.data_collectors.nba_api_collector.BoxScoreTraditionalV3')
+    @patch('src.data_collectors.nba_api_collector.BoxScoreSummaryV3')
+    def test_boxscore_cache_reuses_finished_games(self, mock_summary, mock_traditional):
+        """Test finished box scores are served from the disk cache."""
+        import tempfile
+        from pathlib import Path
+        
+        mock_summary.__name__ = 'BoxScoreSummaryV3'
+        mock_traditional.__name__ = 'BoxScoreTraditionalV3'
+        mock_summary.return_value.get_dict.return_value = {
+            'boxScoreSummary': {'homeTeamId': 1, 'awayTeamId': 2, 'gameStatus': 3,
+                                'homeTeam': {'score': 110}, 'awayTeam': {'score': 100}}
+        }
+        mock_traditional.return_value.get_dict.return_value = {
+            'boxScoreTraditional': {'homeTeamId': 1, 'awayTeamId': 2}
+        }
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.collector.cache_dir = Path(cache_dir)
+            self.collector.rate_limit_delay = 0
+            
+            for _ in range(2):
+                details = self.collector.get_game_details('0022401199')
+                self.collector.collect_team_stats('0022401199')
+        
+        self.assertEqual(details['home_score'], 110)
+        self.assertEqual(details['game_status'], 'finished')
+        self.assertEqual(mock_summary.call_count, 1)
+        self.assertEqual(mock_traditional.call_count, 1)
+    
+    @patch('src.data_collectors.nba_api_collector.BoxScoreSummaryV3')
+    def test_boxscore_cache_skips_unfinished_games(self, mock_summary):
+        """Test box scores of games still in progress are not cached."""
+        import tempfile
+        from pathlib import Path
+        
+        mock_summary.__name__ = 'BoxScoreSummaryV3'
+        mock_summary.return_value.get_dict.return_value = {
+            'boxScoreSummary': {'homeTeamId': 1, 'awayTeamId': 2, 'gameStatus': 2,
+                                'homeTeam': {'score': 50}, 'awayTeam': {'score': 48}}
+        }
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.collector.cache_dir = Path(cache_dir)
+            self.collector.rate_limit_delay = 0
+            
+            for _ in range(2):
+                details = self.collector.get_game_details('0022401199')
+        
+        self.assertEqual(details['game_status'], 'live')
+        self.assertEqual(mock_summary.call_count, 2)
 
 
 if __name__ == '__main__':